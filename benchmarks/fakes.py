@@ -0,0 +1,232 @@
+import asyncio
+import datetime
+import time
+import typing
+
+import discord
+
+
+# Snowflakes hands out increasing discord ids for the current time
+#  archived messages are ordered and filtered by id, so fake ids have to carry a realistic timestamp
+class Snowflakes:
+    def __init__(self):
+        self.last = 0
+
+    def next(self) -> int:
+        self.last = max(self.last + 1, discord.utils.time_snowflake(datetime.datetime.utcnow()))
+        return self.last
+
+
+# FakeHTTP stands in for discord.py's HTTPClient and the REST calls the fake objects make
+#  every call waits latency seconds, with rate set every route and major parameter gets a bucket of
+#  rate calls per per seconds, an empty bucket counts as a 429 and waits like discord.py does.
+class FakeHTTP:
+    def __init__(self, latency: float = 0.0, rate: typing.Optional[int] = None, per: float = 1.0):
+        self.latency = latency
+        self.rate = rate
+        self.per = per
+        self.buckets: typing.Dict[tuple, typing.Tuple[float, int]] = dict()
+        self.calls = 0
+        self.rate_limited = 0
+        self.waited = 0.0
+
+    # request takes method str, path str and major int (channel or guild id)
+    #  waits for the bucket and the latency
+    async def request(self, method: str, path: str, major: int) -> None:
+        self.calls += 1
+        if self.rate is not None:
+            key = (method, path, major)
+            while True:
+                now = time.monotonic()
+                reset, remaining = self.buckets.get(key, (now + self.per, self.rate))
+                if reset <= now:
+                    reset, remaining = now + self.per, self.rate
+                if remaining:
+                    self.buckets[key] = (reset, remaining - 1)
+                    break
+                self.rate_limited += 1
+                self.waited += reset - now
+                await asyncio.sleep(reset - now)
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def edit_message(self, channel_id: int, message_id: int, **fields) -> None:
+        await self.request("PATCH", "/channels/{channel_id}/messages/{message_id}", channel_id)
+
+    async def delete_message(self, channel_id: int, message_id: int, *, reason: str = None) -> None:
+        await self.request("DELETE", "/channels/{channel_id}/messages/{message_id}", channel_id)
+
+
+# FakeWorld owns every fake guild, channel and user and answers the lookups the bot makes
+class FakeWorld:
+    def __init__(self, http: FakeHTTP):
+        self.http = http
+        self.ids = Snowflakes()
+        self.channels: typing.Dict[int, typing.Any] = dict()
+        self.guilds: typing.Dict[int, 'FakeGuild'] = dict()
+        self.users: typing.Dict[int, 'FakeUser'] = dict()
+        self.bot_user: typing.Optional['FakeUser'] = None
+
+    def get_channel(self, channel_id: int):
+        return self.channels.get(channel_id)
+
+    def get_guild(self, guild_id: int) -> typing.Optional['FakeGuild']:
+        return self.guilds.get(guild_id)
+
+    def get_user(self, user_id: int) -> typing.Optional['FakeUser']:
+        return self.users.get(user_id)
+
+    async def fetch_user(self, user_id: int) -> 'FakeUser':
+        await self.http.request("GET", "/users/{user_id}", user_id)
+        return self.users[user_id]
+
+    async def fetch_channel(self, channel_id: int):
+        await self.http.request("GET", "/channels/{channel_id}", channel_id)
+        return self.channels[channel_id]
+
+    # install takes bot discord.Client
+    #  points the bot's cache lookups and REST client at the world
+    def install(self, bot: discord.Client) -> None:
+        bot.get_channel = self.get_channel
+        bot.get_guild = self.get_guild
+        bot.get_user = self.get_user
+        bot.fetch_user = self.fetch_user
+        bot.fetch_channel = self.fetch_channel
+        bot.http = self.http
+
+
+class FakeRole:
+    def __init__(self, world: FakeWorld, name: str, default: bool = False):
+        self.id = world.ids.next()
+        self.name = name
+        self.mention = f"<@&{self.id}>"
+        self.default = default
+
+    def is_default(self) -> bool:
+        return self.default
+
+
+class FakeMessage:
+    def __init__(self, world: FakeWorld, channel, author, content: str = "", embed: discord.Embed = None):
+        self.world = world
+        self.id = world.ids.next()
+        self.channel = channel
+        self.guild = getattr(channel, 'guild', None)
+        self.author = author
+        self.content = content
+        self.embeds = [embed] if embed is not None else []
+        self.attachments = list()
+        self.created_at = datetime.datetime.utcnow()
+
+    async def edit(self, *, embed: discord.Embed = None, **fields) -> None:
+        await self.world.http.request("PATCH", "/channels/{channel_id}/messages/{message_id}", self.channel.id)
+        if embed is not None:
+            self.embeds = [embed]
+
+    async def delete(self, *, delay: float = None) -> None:
+        await self.world.http.request("DELETE", "/channels/{channel_id}/messages/{message_id}", self.channel.id)
+
+    async def add_reaction(self, emoji) -> None:
+        await self.world.http.request("PUT", "/channels/{channel_id}/messages/{message_id}/reactions", self.channel.id)
+
+
+# FakeChannel is both the DM channel of a user (guild None) and a text channel of a guild
+class FakeChannel:
+    def __init__(self, world: FakeWorld, name: str, guild: 'FakeGuild' = None, category: 'FakeCategory' = None,
+                 topic: str = None):
+        self.world = world
+        self.id = world.ids.next()
+        self.name = name
+        self.guild = guild
+        self.category = category
+        self.topic = topic
+        self.mention = f"<#{self.id}>"
+        self.messages: typing.Dict[int, FakeMessage] = dict()
+        world.channels[self.id] = self
+
+    async def send(self, content: str = None, *, embed: discord.Embed = None, file=None, **fields) -> FakeMessage:
+        await self.world.http.request("POST", "/channels/{channel_id}/messages", self.id)
+        message = FakeMessage(self.world, self, self.world.bot_user, content or "", embed)
+        self.messages[message.id] = message
+        return message
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        await self.world.http.request("GET", "/channels/{channel_id}/messages/{message_id}", self.id)
+        return self.messages[message_id]
+
+    async def delete(self, *, reason: str = None) -> None:
+        await self.world.http.request("DELETE", "/channels/{channel_id}", self.id)
+        self.world.channels.pop(self.id, None)
+
+
+class FakeCategory:
+    def __init__(self, world: FakeWorld, name: str, guild: 'FakeGuild'):
+        self.id = world.ids.next()
+        self.name = name
+        self.guild = guild
+        world.channels[self.id] = self
+
+
+class FakeUser:
+    def __init__(self, world: FakeWorld, name: str, guild: 'FakeGuild' = None, roles: typing.List[FakeRole] = ()):
+        self.world = world
+        self.id = world.ids.next()
+        self.name = name
+        self.discriminator = "0001"
+        self.mention = f"<@{self.id}>"
+        self.avatar_url = f"https://cdn.discordapp.com/embed/avatars/{self.id % 5}.png"
+        self.bot = False
+        self.created_at = datetime.datetime.utcnow() - datetime.timedelta(days=365)
+        self.joined_at = datetime.datetime.utcnow() - datetime.timedelta(days=30)
+        self.guild = guild
+        self.roles = list(roles)
+        self.dm_channel = FakeChannel(world, f"dm-{name}")
+        world.users[self.id] = self
+        if guild is not None:
+            guild.members[self.id] = self
+
+    def __str__(self) -> str:
+        return f"{self.name}#{self.discriminator}"
+
+    async def send(self, content: str = None, *, embed: discord.Embed = None, **fields) -> FakeMessage:
+        return await self.dm_channel.send(content, embed=embed, **fields)
+
+
+class FakeGuild:
+    def __init__(self, world: FakeWorld, name: str):
+        self.world = world
+        self.id = world.ids.next()
+        self.name = name
+        self.unavailable = False
+        self.filesize_limit = 8388608
+        self.members: typing.Dict[int, FakeUser] = dict()
+        self.default_role = FakeRole(world, "@everyone", default=True)
+        world.guilds[self.id] = self
+
+    def get_member(self, user_id: int) -> typing.Optional[FakeUser]:
+        return self.members.get(user_id)
+
+    def get_channel(self, channel_id: int):
+        channel = self.world.channels.get(channel_id)
+        return channel if getattr(channel, 'guild', None) is self else None
+
+    async def create_text_channel(self, name: str, *, category: FakeCategory = None, topic: str = None,
+                                  **fields) -> FakeChannel:
+        await self.world.http.request("POST", "/guilds/{guild_id}/channels", self.id)
+        return FakeChannel(self.world, name, guild=self, category=category, topic=topic)
+
+
+# FakeContext is the commands.Context of a command invoked in channel by author
+class FakeContext:
+    def __init__(self, bot, channel: FakeChannel, author: FakeUser, content: str = ""):
+        self.bot = bot
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.message = FakeMessage(channel.world, channel, author, content)
+        self.prefix = bot.command_prefix
+        self.command = None
+
+    async def send(self, content: str = None, *, embed: discord.Embed = None, **fields) -> FakeMessage:
+        return await self.channel.send(content, embed=embed, **fields)
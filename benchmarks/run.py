@@ -0,0 +1,223 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+import typing
+from configparser import ConfigParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import modmailmain  # noqa: E402
+from utils import category_selector  # noqa: E402
+from benchmarks.fakes import *  # noqa: E402
+
+
+# Result keeps the measurements of one operation
+class Result:
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: typing.List[float] = list()
+        self.wall = 0.0
+        self.queries = 0
+        self.rest = 0
+        self.rate_limited = 0
+
+    # percentile takes q float between 0 and 1
+    #  returns the latency at q in milliseconds
+    def percentile(self, q: float) -> float:
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else 0.0
+
+    def row(self) -> str:
+        ops = len(self.latencies) or 1
+        return f"{self.name:<12}{len(self.latencies):>7}{len(self.latencies) / (self.wall or 1):>10.1f}" \
+               f"{self.percentile(0.5):>10.1f}{self.percentile(0.99):>10.1f}" \
+               f"{self.queries / ops:>10.2f}{self.rest / ops:>9.2f}{self.rate_limited:>7}"
+
+
+# Harness builds the bot against the configured database and a fake discord world
+#  every operation calls the same listener or command callback the gateway would, checks are skipped.
+class Harness:
+    def __init__(self, conf: ConfigParser, args: argparse.Namespace):
+        self.conf = conf
+        self.args = args
+        self.world = FakeWorld(FakeHTTP(latency=args.latency, rate=args.rate, per=args.per))
+        self.bot = None
+        self.guild = FakeGuild(self.world, "benchmark")
+        self.world.bot_user = FakeUser(self.world, "modmail")
+        self.mod_role = FakeRole(self.world, "mods")
+        self.mod = FakeUser(self.world, "moderator", self.guild, [self.guild.default_role, self.mod_role])
+        self.categories = [FakeCategory(self.world, f"bench-{index}", self.guild) for index in range(2)]
+        self.users = [FakeUser(self.world, f"user{index}", self.guild, [self.guild.default_role])
+                      for index in range(args.users)]
+
+    # setup takes no arguments
+    #  connects to the database, builds the bot and registers the fake categories
+    async def setup(self) -> None:
+        conf = self.conf
+        for section, values in {
+            'global': {'main_server_id': str(self.guild.id), 'modmail_commands_channel_id': "0", 'owners': "[]",
+                       'admin_role_id': "0", 'production': "true"},
+            'dm_limits': {'rate': "1000000", 'burst': "1000000", 'coalesce_window': "0"},
+            'metrics': {'port': "0"},
+        }.items():
+            if not conf.has_section(section):
+                conf.add_section(section)
+            for key, value in values.items():
+                conf.set(section, key, value)
+
+        modmailmain.Config.conf = conf
+        if not await modmailmain.Database.initiate_database():
+            sys.exit(1)
+
+        self.bot = modmailmain.Bot(database_conn=modmailmain.Database.db_conn, conf=conf,
+                                   event_loop=asyncio.get_event_loop())
+        self.world.install(self.bot)
+
+        for category in self.categories:
+            await self.bot.db_conn.execute("category_insert", category.id, category.name, self.guild.id,
+                                           f"bench{category.id}")
+        self.bot.categories.invalidate()
+        await self.bot.categories.load(self.bot.db_conn)
+        await self.bot.conversations.load(self.bot.db_conn)
+
+        categories = self.categories
+
+        # the category selector waits for a reaction, the benchmark picks the first category not in use
+        async def start_embed(bot, channel, user, delete_message=False):
+            category = next(c for c in categories if c is not getattr(channel, 'category', None))
+            return category, category.guild
+
+        category_selector.category_selector.start_embed = staticmethod(start_embed)
+
+        # the paginator waits for reactions as well, only the first page is rendered
+        class FirstPage:
+            def __init__(self, ctx, page_count, get_page):
+                self.ctx = ctx
+                self.get_page = get_page
+
+            async def run(self) -> None:
+                await self.ctx.send(embed=await self.get_page(0))
+
+        sys.modules['cogs.modmail'].LazyEmbedPaginator = FirstPage
+
+    # teardown takes no arguments
+    #  stops the task loops, writes the archive queue and closes the pool
+    async def teardown(self) -> None:
+        for cog in list(self.bot.cogs):
+            self.bot.remove_cog(cog)
+        await self.bot.archiver.close()
+        await self.bot.db_conn.pool.close()
+
+    # measure takes name str and jobs list of coroutine functions
+    #  runs the jobs with at most concurrency in flight
+    #  returns the Result, queued archive rows are written before counting the queries
+    async def measure(self, name: str, jobs: typing.List[typing.Callable[[], typing.Awaitable]]) -> Result:
+        result = Result(name)
+        semaphore = asyncio.Semaphore(self.args.concurrency)
+        queries = sum(stat.calls for stat in self.bot.db_conn.stats.values())
+        rest, rate_limited = self.world.http.calls, self.world.http.rate_limited
+
+        async def run(job) -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                await job()
+                result.latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(run(job) for job in jobs))
+        await self.bot.archiver.flush()
+        result.wall = time.perf_counter() - start
+
+        result.queries = sum(stat.calls for stat in self.bot.db_conn.stats.values()) - queries
+        result.rest = self.world.http.calls - rest
+        result.rate_limited = self.world.http.rate_limited - rate_limited
+        return result
+
+    # dm takes user FakeUser and content str
+    #  returns a job that delivers a DM from user to the message listener
+    def dm(self, user: FakeUser, content: str) -> typing.Callable[[], typing.Awaitable]:
+        cog = self.bot.get_cog('messageHandlingTasks')
+        return lambda: cog.dm_message_listener(FakeMessage(self.world, user.dm_channel, user, content))
+
+    # command takes name str, user FakeUser and keyword arguments of the command
+    #  returns a job that invokes the command in the conversation channel of user as the moderator
+    def command(self, name: str, user: FakeUser, **kwargs) -> typing.Callable[[], typing.Awaitable]:
+        cog = self.bot.get_cog('ModmailCog')
+
+        async def job() -> None:
+            channel = self.world.get_channel(self.bot.conversations.get_by_user(user.id)[1])
+            ctx = FakeContext(self.bot, channel, self.mod, f"{self.bot.command_prefix}{name}")
+            await getattr(cog, name).callback(cog, ctx, **kwargs)
+        return job
+
+    # run takes no arguments
+    #  runs every operation and prints the results
+    async def run(self) -> None:
+        args = self.args
+        results = [
+            await self.measure("dm_new", [self.dm(user, "Hello, I need help") for user in self.users]),
+            await self.measure("dm", [self.dm(user, f"Follow up {index}")
+                                      for index in range(args.messages) for user in self.users]),
+            await self.measure("reply", [self.command("reply", user, message=f"Reply {index}")
+                                         for index in range(args.messages) for user in self.users]),
+            await self.measure("forward", [self.command("forward", user) for user in self.users]),
+            await self.measure("close", [self.command("close", user) for user in self.users]),
+            await self.measure("logs", [self.command_logs(user) for user in self.users]),
+        ]
+
+        print(f"\n{'operation':<12}{'ops':>7}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}"
+              f"{'queries':>10}{'rest':>9}{'429s':>7}")
+        for result in results:
+            print(result.row())
+        print(f"\nREST latency {args.latency * 1000:g}ms, "
+              f"rate limit {f'{args.rate}/{args.per:g}s' if args.rate else 'off'}, "
+              f"{self.world.http.waited:.1f}s spent waiting on rate limits")
+
+    # command_logs takes user FakeUser
+    #  returns a job that runs !logs for the user from the moderator's first category
+    def command_logs(self, user: FakeUser) -> typing.Callable[[], typing.Awaitable]:
+        cog = self.bot.get_cog('ModmailCog')
+        channel = FakeChannel(self.world, "logs", guild=self.guild, category=self.categories[0])
+
+        async def job() -> None:
+            ctx = FakeContext(self.bot, channel, self.mod, f"{self.bot.command_prefix}logs {user.id}")
+            await cog.logs.callback(cog, ctx, user.id)
+        return job
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drives the modmail hot paths against a fake discord and a local "
+                                                 "Postgres. Use a throwaway database, the benchmark writes to it.")
+    parser.add_argument('--conf', default='conf.ini', help="conf.ini with the [database_creds] of the database")
+    parser.add_argument('--users', type=int, default=50, help="conversations to open")
+    parser.add_argument('--messages', type=int, default=5, help="DMs and replies per conversation")
+    parser.add_argument('--concurrency', type=int, default=10, help="operations in flight at once")
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds every REST call takes")
+    parser.add_argument('--rate', type=int, default=None, help="REST calls per route and channel per --per seconds")
+    parser.add_argument('--per', type=float, default=5.0, help="seconds of a rate limit bucket")
+    args = parser.parse_args()
+
+    conf = ConfigParser()
+    if not conf.read(args.conf):
+        print(f"Config file, {args.conf}, was not found.")
+        sys.exit(1)
+
+    # the bot loads its extensions from ./cogs and ./tasks
+    os.chdir(ROOT)
+
+    async def bench() -> None:
+        harness = Harness(conf, args)
+        await harness.setup()
+        try:
+            await harness.run()
+        finally:
+            await harness.teardown()
+
+    asyncio.get_event_loop().run_until_complete(bench())
+
+
+if __name__ == '__main__':
+    main()
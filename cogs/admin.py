@@ -36,6 +36,19 @@ class adminCog(commands.Cog):
 
         await ctx.send(embed=common_embed("Reload cogs", f"{ctx.author.mention}, all cogs have been reloaded."))
 
+    # reloadconfig takes no arguments
+    #  re-reads conf.ini and refreshes the cached permission data
+    #  sends confirmation
+    @commands.command()
+    @is_owner()
+    @commands.guild_only()
+    async def reloadconfig(self, ctx) -> None:
+        self.bot.conf.read('conf.ini')
+        self.bot.access.reload_config(self.bot.conf)
+        await self.bot.access.load(self.db_conn)
+
+        await ctx.send(embed=common_embed("Reload config", f"{ctx.author.mention}, the config has been reloaded."))
+
     # loadcog takes cog str
     #  reloads the cog
     #  sends confirmation
@@ -66,7 +79,7 @@ class adminCog(commands.Cog):
     async def query(self, ctx, fetch: str, *, arg: str) -> None:
 
         if fetch == "all":
-            i = await self.db_conn.fetch(arg)
+            i = await self.db_conn.pool.fetch(arg)
 
             description = ""
             for ret in i:
@@ -78,13 +91,13 @@ class adminCog(commands.Cog):
             await ctx.send(description)
 
         elif fetch == "one":
-            i = await self.db_conn.fetchrow(arg)
+            i = await self.db_conn.pool.fetchrow(arg)
             value = str(i[0])
 
             await ctx.send(str(value))
 
         elif fetch == "commit":
-            await self.db_conn.execute(arg)
+            await self.db_conn.pool.execute(arg)
 
             await ctx.send(embed=common_embed("Query", f"`{arg}` Committed the query."))
 
@@ -95,10 +108,41 @@ class adminCog(commands.Cog):
     @is_owner()
     @commands.guild_only()
     async def columns(self, ctx, table) -> None:
-        result = dict(await self.db_conn.fetchrow(f'SELECT * FROM {table} LIMIT 1'))
+        result = dict(await self.db_conn.pool.fetchrow(f'SELECT * FROM {table} LIMIT 1'))
         colnames = str([key for key, value in result.items()])
         await ctx.send(embed=common_embed("Columns", str(colnames)))
 
+    # querystats takes optional parameter n int
+    #  sends the n statements with the most total time spent
+    @commands.command()
+    @is_owner()
+    @commands.guild_only()
+    async def querystats(self, ctx, n: typing.Optional[int] = 15) -> None:
+        stats = sorted(self.db_conn.stats.items(), key=lambda item: item[1].total, reverse=True)[:n]
+
+        description = ""
+        for name, stat in stats:
+            description += f"`{name}` {stat.calls} call(s), " \
+                           f"avg {stat.total / stat.calls * 1000:.2f}ms, max {stat.max * 1000:.2f}ms\n"
+
+        await ctx.send(embed=common_embed("Query stats", description or "No statements have run yet."))
+
+    # poolstats takes no arguments
+    #  sends the database pool utilisation and the time spent waiting for a connection
+    @commands.command()
+    @is_owner()
+    @commands.guild_only()
+    async def poolstats(self, ctx) -> None:
+        waits = self.db_conn.waits
+        average = waits.total / waits.calls * 1000 if waits.calls else 0.0
+
+        await ctx.send(embed=common_embed("Pool stats",
+                                          f"In use: {self.db_conn.in_use}/{self.db_conn.max_size}\n"
+                                          f"Waiting: {self.db_conn.waiting}\n"
+                                          f"Acquired: {waits.calls}\n"
+                                          f"Wait: avg {average:.2f}ms, max {waits.max * 1000:.2f}ms\n"
+                                          f"Reconnects: {self.db_conn.reconnects}"))
+
     # purge takes optional parameter n int
     #  deletes past n messages
     #  sends confirmation
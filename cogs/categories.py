@@ -49,10 +49,7 @@ class CategoriesCog(commands.Cog):
                                               "Looks like you waited too long. Please restart the process."))
             return
 
-        category_result = await self.db_conn.fetchrow("SELECT active \
-                                                       FROM modmail.categories \
-                                                       WHERE \
-                                                           category_id=$1", int(category_id))
+        category_result = await self.db_conn.fetchrow("category_active", int(category_id))
         if category_result:
             if category_result[0]:
                 await ctx.send(embed=common_embed('Link category',
@@ -63,21 +60,16 @@ class CategoriesCog(commands.Cog):
                                              'But not set active, do you wan\'t to set it active?',
                                              'link_category')
                 if confirm:  # If the request is accepted update the database
-                    await self.db_conn.execute("UPDATE modmail.categories \
-                                                SET active=true \
-                                                WHERE \
-                                                    category_id=$1",
-                                               category_id)
+                    await self.db_conn.execute("category_set_active", category_id)
+                    self.bot.access.invalidate()
+                    self.bot.categories.invalidate()
             else:
                 await ctx.send(embed=common_embed("Link category",
                                                   "This category is already in the database. Please set a different "
                                                   "category."))
             return
 
-        emote_result = await self.db_conn.fetchrow("SELECT * \
-                                                    FROM modmail.categories \
-                                                    WHERE \
-                                                        emote_id=$1", reaction.emoji)
+        emote_result = await self.db_conn.fetchrow("category_by_emote", reaction.emoji)
 
         if emote_result:
             await ctx.send(embed=common_embed("Link category",
@@ -89,10 +81,9 @@ class CategoriesCog(commands.Cog):
         await category.set_permissions(self.bot.user, read_messages=True, send_messages=True,
                                        read_message_history=True)
 
-        await self.db_conn.execute("INSERT INTO modmail.categories \
-                                    (category_id, category_name, active, guild_id, emote_id) \
-                                    VALUES($1, $2, TRUE, $3, $4)",
-                                   category_id, category.name, guild_id, reaction.emoji)
+        await self.db_conn.execute("category_insert", category_id, category.name, guild_id, reaction.emoji)
+        self.bot.access.invalidate()
+        self.bot.categories.invalidate()
 
         await ctx.send(embed=common_embed("Link category", "Success! The category is successfully registered."))
 
@@ -110,10 +101,7 @@ class CategoriesCog(commands.Cog):
                                               "Unable to fetch guild. Please check if the ID is correct."))
             return
 
-        category_result = await self.db_conn.fetchrow("SELECT * \
-                                                       FROM modmail.categories \
-                                                       WHERE \
-                                                           category_name=$1", category_name)
+        category_result = await self.db_conn.fetchrow("category_by_name", category_name)
         if category_result:
             await ctx.send(embed=common_embed("Create category",
                                               "This category name is already in the database. Please set a different "
@@ -139,10 +127,7 @@ class CategoriesCog(commands.Cog):
                                               "Looks like you waited too long. Please restart the process."))
             return
 
-        emote_result = await self.db_conn.fetchrow("SELECT * \
-                                                    FROM modmail.categories \
-                                                    WHERE \
-                                                        emote_id=$1", reaction.emoji)
+        emote_result = await self.db_conn.fetchrow("category_by_emote", reaction.emoji)
 
         if emote_result:
             await ctx.send(embed=common_embed("Create category",
@@ -166,10 +151,9 @@ class CategoriesCog(commands.Cog):
                                               "Oof, I'm missing permissions. Please add them and try again."))
             return
 
-        await self.db_conn.execute("INSERT INTO modmail.categories \
-                                    (category_id, category_name, active, guild_id, emote_id) \
-                                    VALUES($1, $2, TRUE, $3, $4)",
-                                   category.id, category_name, guild_id, reaction.emoji)
+        await self.db_conn.execute("category_insert", category.id, category_name, guild_id, reaction.emoji)
+        self.bot.access.invalidate()
+        self.bot.categories.invalidate()
 
         await ctx.send(embed=common_embed("Create category", "Success! The category is successfully registered."))
 
@@ -183,10 +167,7 @@ class CategoriesCog(commands.Cog):
     @is_admin()
     @commands.guild_only()
     async def update_emote(self, ctx, category_id: int) -> None:
-        category_result = await self.db_conn.fetchrow("SELECT category_name, emote_id \
-                                                       FROM modmail.categories \
-                                                       WHERE \
-                                                           category_id=$1", category_id)
+        category_result = await self.db_conn.fetchrow("category_name_emote", category_id)
 
         if not category_result:
             await ctx.send(embed=common_embed("Update emote",
@@ -220,10 +201,7 @@ class CategoriesCog(commands.Cog):
                                               "Looks like you waited too long. Please restart the process."))
             return
 
-        emote_result = await self.db_conn.fetchrow("SELECT * \
-                                                    FROM modmail.categories \
-                                                    WHERE \
-                                                        emote_id=$1", reaction.emoji)
+        emote_result = await self.db_conn.fetchrow("category_by_emote", reaction.emoji)
 
         if emote_result:
             await ctx.send(embed=common_embed("Update emote",
@@ -231,11 +209,8 @@ class CategoriesCog(commands.Cog):
                                               "emoji."))
             return
 
-        await self.db_conn.execute("UPDATE modmail.categories \
-                                    SET emote_id=$1 \
-                                    WHERE \
-                                      category_id=$2",
-                                   reaction.emoji, category_id)
+        await self.db_conn.execute("category_set_emote", reaction.emoji, category_id)
+        self.bot.categories.invalidate()
 
     # category_set_active takes category_id int
     #  makes sure the category is real and is inactive
@@ -245,10 +220,7 @@ class CategoriesCog(commands.Cog):
     @is_admin()
     @commands.guild_only()
     async def category_set_active(self, ctx, category_id: int) -> None:
-        category_result = await self.db_conn.fetchrow("SELECT category_name, active \
-                                                       FROM modmail.categories \
-                                                       WHERE \
-                                                           category_id=$1", category_id)
+        category_result = await self.db_conn.fetchrow("category_name_active", category_id)
 
         if not category_result:
             await ctx.send(embed=common_embed("Category set active",
@@ -268,10 +240,9 @@ class CategoriesCog(commands.Cog):
         if not success:
             return
 
-        await self.db_conn.execute("UPDATE modmail.categories \
-                                    SET active=TRUE \
-                                    WHERE \
-                                      category_id=$1", category_id)
+        await self.db_conn.execute("category_set_active", category_id)
+        self.bot.access.invalidate()
+        self.bot.categories.invalidate()
 
     # category_set_inactive takes category_id int
     #  makes sure the category is real and is active
@@ -281,10 +252,7 @@ class CategoriesCog(commands.Cog):
     @is_admin()
     @commands.guild_only()
     async def category_set_inactive(self, ctx, category_id: int) -> None:
-        category_result = await self.db_conn.fetchrow("SELECT category_name, active \
-                                                       FROM modmail.categories \
-                                                       WHERE \
-                                                           category_id=$1", category_id)
+        category_result = await self.db_conn.fetchrow("category_name_active", category_id)
 
         if not category_result:
             await ctx.send(embed=common_embed("Category set inactive",
@@ -305,10 +273,9 @@ class CategoriesCog(commands.Cog):
         if not success:
             return
 
-        await self.db_conn.execute("UPDATE modmail.categories \
-                                    SET active=FALSE \
-                                    WHERE \
-                                      category_id=$1", category_id)
+        await self.db_conn.execute("category_set_inactive", category_id)
+        self.bot.access.invalidate()
+        self.bot.categories.invalidate()
 
     # categories takes no parameters
     #  gets all active modmail categories
@@ -319,10 +286,7 @@ class CategoriesCog(commands.Cog):
     async def categories(self, ctx) -> None:
         msg = await ctx.send(embed=common_embed("Categories", "Retrieving active categories."))
 
-        results = await self.db_conn.fetch("SELECT category_id, guild_id, emote_id \
-                                            FROM modmail.categories \
-                                            WHERE \
-                                               active=TRUE")
+        results = await self.db_conn.fetch("categories_active")
         embeds = list()
 
         for row in results:
@@ -347,8 +311,7 @@ class CategoriesCog(commands.Cog):
     async def all(self, ctx):
         msg = await ctx.send(embed=common_embed("Categories", "Retrieving all categories."))
 
-        results = await self.db_conn.fetch("SELECT category_id, active, guild_id, emote_id \
-                                            FROM modmail.categories")
+        results = await self.db_conn.fetch("categories_all")
         embeds = list()
 
         for row in results:
@@ -372,10 +335,7 @@ class CategoriesCog(commands.Cog):
     @is_admin()
     @commands.guild_only()
     async def category(self, ctx, category_id: int) -> None:
-        results = await self.db_conn.fetchrow("SELECT * \
-                                               FROM modmail.categories \
-                                               WHERE \
-                                                  category_id=$1", category_id)
+        results = await self.db_conn.fetchrow("category_by_id", category_id)
         if not results:
             await ctx.send(embed=common_embed("Category",
                                               f"Did not find category with category id {category_id}."))
@@ -395,10 +355,7 @@ class CategoriesCog(commands.Cog):
     @is_admin()
     @commands.guild_only()
     async def update_category_name(self, ctx, category_id: int, new_name: str) -> None:
-        category_result = await self.db_conn.fetchrow("SELECT category_name, emote_id \
-                                                       FROM modmail.categories \
-                                                       WHERE \
-                                                           category_id=$1", category_id)
+        category_result = await self.db_conn.fetchrow("category_name_emote", category_id)
 
         if not category_result:
             await ctx.send(embed=common_embed("Update emote",
@@ -412,14 +369,18 @@ class CategoriesCog(commands.Cog):
         if not success:
             return
 
-        category_channel = await self.bot.fetch_channel(category_id)
-        await category_channel.edit(name=new_name,
-                                    reason=f"Command: update_category_name was run by {ctx.message.author.name}")
+        # the database goes first, the channel update event of the rename is checked against it
+        await self.db_conn.execute("category_set_name", new_name, category_id)
+        self.bot.categories.invalidate()
 
-        await self.db_conn.execute("UPDATE modmail.categories \
-                                    SET category_name=$1 \
-                                    WHERE \
-                                      category_id=$2", new_name, category_id)
+        try:
+            category_channel = await self.bot.fetch_channel(category_id)
+            await category_channel.edit(name=new_name,
+                                        reason=f"Command: update_category_name was run by {ctx.message.author.name}")
+        except discord.HTTPException:
+            await self.db_conn.execute("category_set_name", category_result[0], category_id)
+            self.bot.categories.invalidate()
+            raise
 
 
 def setup(bot):
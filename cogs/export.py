@@ -0,0 +1,125 @@
+from utils.checks import *
+from utils.common_embed import *
+from utils.archive_filters import parse_filters
+import datetime
+import discord
+import gzip
+import html
+import json
+import os
+import tempfile
+
+
+class exportCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.db_conn = bot.db_conn
+
+    # write_jsonl takes file, rows async iterator of asyncpg.Record
+    #  writes one JSON object per archived message
+    #  returns the number of messages written
+    @staticmethod
+    async def write_jsonl(file, rows) -> int:
+        count = 0
+        async for row in rows:
+            file.write(json.dumps({
+                'message_id': row[0],
+                'sent_at': discord.utils.snowflake_time(row[0]).isoformat(),
+                'conversation_id': row[1],
+                'user_id': row[2],
+                'category_id': row[3],
+                'category': row[4],
+                'author_id': row[5],
+                'made_by_mod': row[6],
+                'deleted': row[7],
+                'message': row[8],
+                'attachments': json.loads(row[9]),
+            }) + "\n")
+            count += 1
+        return count
+
+    # write_html takes file, rows async iterator of asyncpg.Record
+    #  writes a standalone HTML transcript with one section per conversation
+    #  returns the number of messages written
+    @staticmethod
+    async def write_html(file, rows) -> int:
+        file.write("<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Modmail export</title>"
+                   "<style>body{font-family:sans-serif}.mod{color:#2a7a2a}.deleted{text-decoration:line-through}"
+                   "small{color:#777}</style></head><body>\n")
+
+        count = 0
+        conversation_id = None
+        async for row in rows:
+            if row[1] != conversation_id:
+                if conversation_id is not None:
+                    file.write("</section>\n")
+                conversation_id = row[1]
+                file.write(f"<section><h2>Conversation {row[1]} with user {row[2]} in {html.escape(row[4])}</h2>\n")
+
+            classes = " ".join(name for name, flag in (('mod', row[6]), ('deleted', row[7])) if flag)
+            attachments = "".join(f" <a href=\"{html.escape(attachment['url'])}\">"
+                                  f"{html.escape(attachment['filename'])}</a>"
+                                  for attachment in json.loads(row[9]))
+            file.write(f"<p class=\"{classes}\"><small>{discord.utils.snowflake_time(row[0]):%Y-%m-%d %H:%M:%S} "
+                       f"{row[5]}</small> {html.escape(row[8] or '')}{attachments}</p>\n")
+            count += 1
+
+        if conversation_id is not None:
+            file.write("</section>\n")
+        file.write("</body></html>\n")
+        return count
+
+    # export takes filters str
+    #  exports the archived messages of the matching conversations to a gzip compressed file
+    #  e.g. !export user:@user category:123 after:2021-01-01 before:2021-02-01 format:html
+    #  rows are streamed from a server-side cursor straight into the file
+    #  sends the file on success, error on failure
+    @commands.command()
+    @is_admin()
+    @commands.guild_only()
+    async def export(self, ctx, *, query: str = "") -> None:
+        try:
+            words, filters = parse_filters(query, ('user', 'category', 'after', 'before', 'format'))
+        except ValueError:
+            words, filters = query, dict()
+
+        export_format = filters.get('format', 'jsonl')
+        if words or export_format not in ('jsonl', 'html'):
+            await ctx.send(embed=common_embed("Export", "Invalid filter, use `user:<id>`, `category:<id>`, "
+                                                        "`after:YYYY-MM-DD`, `before:YYYY-MM-DD` and "
+                                                        "`format:jsonl` or `format:html`"))
+            return
+
+        msg = await ctx.send(embed=common_embed("Export", "Exporting messages..."))
+        await self.bot.archiver.flush()
+
+        lower = discord.utils.time_snowflake(filters['after']) if 'after' in filters else 0
+        upper = discord.utils.time_snowflake(filters['before']) if 'before' in filters else 2 ** 63 - 1
+        fd, path = tempfile.mkstemp(suffix=f".{export_format}.gz")
+        os.close(fd)
+        try:
+            with gzip.open(path, 'wt', encoding='utf-8') as file:
+                async with self.db_conn.transaction() as conn:
+                    rows = await conn.cursor("archive_export", filters.get('user'), filters.get('category'),
+                                             lower, upper)
+                    if export_format == 'html':
+                        count = await self.write_html(file, rows)
+                    else:
+                        count = await self.write_jsonl(file, rows)
+
+            size = os.path.getsize(path)
+            if size > ctx.guild.filesize_limit:
+                await msg.edit(embed=common_embed("Export", f"The export of {count} message(s) is {size} bytes, "
+                                                            f"more than the upload limit of this server. "
+                                                            f"Please narrow it down with filters."))
+                return
+
+            name = f"modmail-export-{datetime.datetime.utcnow():%Y%m%d-%H%M%S}.{export_format}.gz"
+            await ctx.send(file=discord.File(path, filename=name))
+            await msg.edit(embed=common_embed("Export", f"Exported {count} message(s)."))
+        finally:
+            os.remove(path)
+
+
+def setup(bot):
+    bot.add_cog(exportCog(bot))
@@ -1,10 +1,12 @@
 import pytz
-import disputils
 from asyncpg import ForeignKeyViolationError
 from natural.date import duration
 from utils.checks import *
 from utils.reply import *
 from utils.category_selector import *
+from utils.lazy_paginator import LazyEmbedPaginator
+from utils import transcript
+from utils.burst import *
 
 
 class ModmailCog(commands.Cog):
@@ -15,6 +17,7 @@ class ModmailCog(commands.Cog):
         self.yellow = 0xE8D90C
         self.green = 0x7CFC00
         self.blue = 0xADD8E6
+        self.teardown_delay = bot.conf.getfloat('teardown', 'close_delay', fallback=10.0)
 
     # This cant be put in the main file because of super etc...
     @commands.Cog.listener()
@@ -37,11 +40,7 @@ class ModmailCog(commands.Cog):
                                               "character count"))
             return
 
-        conv = await self.db_conn.fetchrow("SELECT conversation_id, user_id \
-                                            FROM modmail.conversations \
-                                            WHERE \
-                                                channel_id=$1 AND active=true",
-                                           ctx.channel.id)
+        conv = self.bot.conversations.get_by_channel(ctx.channel.id)
 
         if not conv:
             await ctx.send(embed=common_embed("Modmail Reply",
@@ -67,12 +66,7 @@ class ModmailCog(commands.Cog):
                                               "character count"))
             return
 
-        conv = await self.db_conn.fetchrow("SELECT conversation_id, user_id \
-                                            FROM modmail.conversations \
-                                            WHERE \
-                                               channel_id=$1 AND \
-                                               active=true",
-                                           ctx.channel.id)
+        conv = self.bot.conversations.get_by_channel(ctx.channel.id)
 
         if not conv:
             await ctx.send(embed=common_embed("Modmail Reply",
@@ -103,19 +97,19 @@ class ModmailCog(commands.Cog):
         if category is None:
             return
 
-        category_permissions = await self.bot.db_conn.fetch("SELECT role_id \
-                                                             FROM modmail.permissions \
-                                                             WHERE \
-                                                               active=true AND \
-                                                               category_id=$1", category.id)
+        category_permissions = await self.bot.access.roles_for(self.db_conn, category.id)
 
         try:
-            if len(set(category_permissions) - set([role.id for role in guild.get_member(ctx.author.id).roles])) == 0:
+            # only a category without active permission rows is refused, the roles of the author aren't compared
+            #  authors outside the guild end up in the except below, only owners get past that
+            if guild.get_member(ctx.author.id) is None:
+                raise ValueError(f"{ctx.author.id} is not a member of {guild.id}")
+            if not category_permissions:
                 await ctx.send(embed=common_embed("Create conversation",
                                                   "You do not have permissions in this category."))
                 return
         except Exception as e:
-            if ctx.author.id not in json.loads(self.conf.get('global', 'owners')):
+            if ctx.author.id not in self.bot.access.owners:
                 await ctx.send(embed=common_embed("Create conversation",
                                                   "You do not have permissions in this category."))
                 await ctx.send("Error please ping Matthew {}", e)
@@ -124,10 +118,7 @@ class ModmailCog(commands.Cog):
         channel = await guild.create_text_channel(name=f'{user.name}-{user.discriminator}', category=category)
 
         try:
-            await self.db_conn.execute("INSERT INTO modmail.conversations \
-                                        (creation_date, user_id, active, channel_id, category_id) \
-                                        VALUES (now(), $1, true, $2, $3)",
-                                       user.id, channel.id, category.id)
+            conv_id = await self.bot.conversation_repo.open(user.id, channel.id, category.id)
         except ForeignKeyViolationError:
             await ctx.send(embed=common_embed("Create conversation",
                                               "The category that was provided is not a valid modmail category, "
@@ -135,17 +126,14 @@ class ModmailCog(commands.Cog):
             await channel.delete(reason="Thread Closed")
             return
 
-        past_threads = await self.db_conn.fetch("SELECT * \
-                                                 FROM modmail.conversations \
-                                                 WHERE \
-                                                    user_id=$1 AND \
-                                                    active=false",
-                                                user.id)
+        self.bot.conversations.add(conv_id, user.id, channel.id)
+
+        past_threads = await self.db_conn.fetchval("conversation_past_count", user.id)
         created_ago, joined_ago = datetime.datetime.now() - user.created_at, datetime.datetime.now() - user.joined_at
 
         chnl_embed = common_embed("", f"{user.mention} was created {created_ago.days} days ago, "
                                       f"joined {joined_ago.days} days ago"
-                                      f" with **{'no' if len(past_threads) == 0 else len(past_threads)}** past threads",
+                                      f" with **{'no' if past_threads == 0 else past_threads}** past threads",
                                   color=0x7289da)
         chnl_embed.set_author(name=str(user), icon_url=user.avatar_url)
         roles = " ".join([role.mention for role in user.roles if role.id != main_guild.id])
@@ -162,13 +150,8 @@ class ModmailCog(commands.Cog):
             await channel.send(embed=common_embed("Create conversation",
                                                   "The user has dm's disabled so I can't reach out\n"
                                                   "This thread will get deleted in 15 seconds..."))
-            await asyncio.sleep(15)
-            await self.db_conn.execute("UPDATE modmail.conversations \
-                                        SET closing_date=now(), active=false \
-                                        WHERE \
-                                          channel_id=$1",
-                                       channel.id)
-            await channel.delete(reason="Thread Closed")
+            await self.bot.conversation_repo.close(channel.id, 15.0, "Thread Closed")
+            self.bot.conversations.remove(channel.id)
 
         else:
             await ctx.message.add_reaction('✅')
@@ -182,35 +165,31 @@ class ModmailCog(commands.Cog):
     @has_access()
     @commands.guild_only()
     async def close(self, ctx) -> None:
-        conv = await self.db_conn.fetchrow("SELECT user_id \
-                                            FROM modmail.conversations \
-                                            WHERE \
-                                                channel_id=$1",
-                                           ctx.channel.id)
+        conv = await self.bot.conversation_repo.close(ctx.channel.id, self.teardown_delay, "Thread Closed")
         if not conv:
             await ctx.send(embed=common_embed("Close conversation",
                                               "You're in a invalid channel, please check if you're in a "
                                               "conversation channel"))
             return
 
-        user = await self.bot.fetch_user(user_id=conv[0])
+        self.bot.conversations.remove(ctx.channel.id)
+        self.bot.messages.forget_conversation(conv[0])
+
+        user = await self.bot.users.get(conv[1])
         try:
-            await user.send(embed=common_embed("Conversation closed",
-                                               "This is an automated message informing you that the thread has been closed, "
-                                               "sending another message will open a new thread, so if you don't need any other help please don't reply"))
+            if user is None:
+                await ctx.send(embed=common_embed("Conversation closed",
+                                                  f"Unable to find user {conv[1]}, no message was sent to them"))
+            else:
+                await user.send(embed=common_embed("Conversation closed",
+                                                   "This is an automated message informing you that the thread has been closed, "
+                                                   "sending another message will open a new thread, so if you don't need any other help please don't reply"))
         except discord.Forbidden:
             await ctx.send(embed=common_embed("Conversation closed",
                                               "The user disabled dm's so no message's arrived"))
         finally:
-            await self.db_conn.execute("UPDATE modmail.conversations \
-                                        SET closing_date=now(), active=false \
-                                        WHERE \
-                                            channel_id=$1",
-                                       ctx.channel.id)
-            await ctx.send(embed=common_embed("Conversation closed", "This channel will get deleted in 10 seconds..."))
-            await asyncio.sleep(10)
-
-        await ctx.channel.delete(reason="Thread Closed")
+            await ctx.send(embed=common_embed("Conversation closed",
+                                              f"This channel will get deleted in {self.teardown_delay:g} seconds..."))
 
     # edit takes message str max size of 2048 characters
     #  Checks on what side it is on
@@ -221,78 +200,78 @@ class ModmailCog(commands.Cog):
     async def edit(self, ctx, *, message: str) -> None:
         """Edit the most recent message in thread made by you"""
         if ctx.guild is None:
-            results = await self.db_conn.fetchrow("SELECT messages.message_id, messages.other_side_message_id, \
-                                                          conversations.user_id, conversations.channel_id, \
-                                                          messages.message \
-                                                   FROM modmail.messages \
-                                                   INNER JOIN modmail.conversations \
-                                                   ON messages.conversation_id = conversations.conversation_id \
-                                                   WHERE conversations.user_id=$1 AND messages.made_by_mod = false AND messages.deleted = false \
-                                                   ORDER BY messages.created_at DESC \
-                                                   LIMIT 1", ctx.author.id)
+            conv = self.bot.conversations.get_by_user(ctx.author.id)
+            link = conv and self.bot.messages.last(conv[0], made_by_mod=False)
+            if link:
+                results = (link.message_id, link.other_side_id, link.user_id, link.channel_id, link.content,
+                           link.conversation_id)
+            else:
+                await self.bot.archiver.flush()
+                results = await self.db_conn.fetchrow("message_last_by_user", ctx.author.id)
             if not results:
                 await ctx.send(embed=common_embed("Edit message", "You have not sent any messages in this thread yet"))
                 return
 
-            mod_chnl = await self.bot.fetch_channel(results[3])
-
-            mod_msg = await mod_chnl.fetch_message(results[1])
-
             usr_embed = common_embed("Successfully edited the message", message, color=self.yellow)
             usr_embed.add_field(name="Original Message:", value=results[4])
             usr_embed.set_author(name=ctx.author, icon_url=ctx.author.avatar_url)
             usr_embed.set_footer(text=f"Message ID: {results[0]} (edited)")
 
-            thread_embed = common_embed("", message, color=self.green)
-            thread_embed.add_field(name="Edited, original message:", value=results[4])
-            thread_embed.set_author(name=ctx.author, icon_url=ctx.author.avatar_url)
-            thread_embed.set_footer(text=f"Message ID: {results[0]} (edited)")
+            # a burst shares one thread embed, it is rebuilt with the edited message in place
+            parts = await burst_parts(self.bot, link or None, results[5], results[1])
+            if len(parts) > 1:
+                parts = [(message_id, message if message_id == results[0] else text, deleted)
+                         for message_id, text, deleted in parts]
+                thread_embed = burst_thread_embed(ctx.author, parts, self.green)
+                thread_embed.add_field(name=f"Edited {results[0]}, original message:", value=results[4])
+            else:
+                thread_embed = common_embed("", message, color=self.green)
+                thread_embed.add_field(name="Edited, original message:", value=results[4])
+                thread_embed.set_author(name=ctx.author, icon_url=ctx.author.avatar_url)
+                thread_embed.set_footer(text=f"Message ID: {results[0]} (edited)")
 
             await ctx.send(embed=usr_embed)
-            await mod_msg.edit(embed=thread_embed)
+            await self.bot.http.edit_message(results[3], results[1], embed=thread_embed.to_dict())
 
         else:
-            results = await self.db_conn.fetchrow("SELECT messages.message_id, messages.other_side_message_id, \
-                                                          conversations.user_id \
-                                                   FROM modmail.messages \
-                                                   INNER JOIN modmail.conversations \
-                                                   ON messages.conversation_id = conversations.conversation_id \
-                                                   WHERE \
-                                                      conversations.channel_id = $1 AND \
-                                                      messages.made_by_mod = true AND \
-                                                      deleted = false AND \
-                                                      messages.author_id = $2 \
-                                                   ORDER BY messages.created_at DESC \
-                                                   LIMIT 1",
-                                                  ctx.channel.id, ctx.author.id)
-            if not results:
-                await ctx.send(embed=common_embed("Edit message", "There's no message made in this thread yet"))
-                return
+            conv = self.bot.conversations.get_by_channel(ctx.channel.id)
+            link = conv and self.bot.messages.last(conv[0], made_by_mod=True, author_id=ctx.author.id)
+            if link:
+                results = (link.message_id, link.other_side_id, link.user_id)
+
+                link.dm_embed.description = message
+                link.thread_embed.description = message
 
-            usr = await self.bot.fetch_user(results[2])
+                await self.bot.http.edit_message(link.dm_channel_id, link.other_side_id, embed=link.dm_embed.to_dict())
+                await self.bot.http.edit_message(ctx.channel.id, link.message_id, embed=link.thread_embed.to_dict())
+
+            else:
+                await self.bot.archiver.flush()
+                results = await self.db_conn.fetchrow("message_last_mod_by_author", ctx.channel.id, ctx.author.id)
+                if not results:
+                    await ctx.send(embed=common_embed("Edit message", "There's no message made in this thread yet"))
+                    return
 
-            mod_msg = await ctx.channel.fetch_message(results[0])
-            usr_msg = await usr.dm_channel.fetch_message(results[1])
+                usr = await self.bot.users.get(results[2])
 
-            mod_new_embed = mod_msg.embeds[0]
-            mod_new_embed.description = message
+                mod_msg = await ctx.channel.fetch_message(results[0])
+                mod_new_embed = mod_msg.embeds[0]
+                mod_new_embed.description = message
 
-            usr_new_embed = usr_msg.embeds[0]
-            usr_new_embed.description = message
+                # the user no longer exists, only the thread side can be edited
+                if usr is not None:
+                    usr_msg = await usr.dm_channel.fetch_message(results[1])
+                    usr_new_embed = usr_msg.embeds[0]
+                    usr_new_embed.description = message
+                    await usr_msg.edit(embed=usr_new_embed)
 
-            await usr_msg.edit(embed=usr_new_embed)
-            await mod_msg.edit(embed=mod_new_embed)
+                await mod_msg.edit(embed=mod_new_embed)
 
-        await self.db_conn.execute("UPDATE modmail.messages \
-                                    SET message=$1 \
-                                    WHERE \
-                                        message_id=$2",
-                                   message, results[0])
-        await self.db_conn.execute("UPDATE modmail.all_messages_attachments \
-                                    SET message=$1 \
-                                    WHERE \
-                                        message_id=$2",
-                                   message, results[0])
+        await self.bot.conversation_repo.set_message_text(results[0], message)
+
+        link = self.bot.messages.get(results[0])
+        if link is not None:
+            link.content = message
 
         await ctx.message.add_reaction('✅')
 
@@ -305,60 +284,97 @@ class ModmailCog(commands.Cog):
     @has_access()
     @commands.guild_only()
     async def delete(self, ctx, message: typing.Optional[int]) -> None:
+        conv = self.bot.conversations.get_by_channel(ctx.channel.id)
         if message is None:
-            results = await self.db_conn.fetchrow("SELECT messages.message_id, messages.other_side_message_id, \
-                                                          conversations.user_id \
-                                                   FROM modmail.messages \
-                                                   INNER JOIN modmail.conversations \
-                                                   ON messages.conversation_id = conversations.conversation_id \
-                                                   WHERE \
-                                                        conversations.channel_id = $1 AND \
-                                                        messages.made_by_mod = true AND \
-                                                        deleted = false \
-                                                   ORDER BY messages.created_at DESC \
-                                                   LIMIT 1", ctx.channel.id)
-            if not results:
-                await ctx.send(
-                    embed=common_embed("Delete message", "There's no message made by mods in this thread yet"))
-                return
+            link = conv and self.bot.messages.last(conv[0], made_by_mod=True)
+        else:
+            link = self.bot.messages.get(message)
+
+        if link and link.made_by_mod and not link.deleted and link.channel_id == ctx.channel.id:
+            results = (link.message_id, link.other_side_id, link.user_id)
 
-            mod_msg: discord.Message = await ctx.channel.fetch_message(results[0])
+            await self.bot.http.delete_message(ctx.channel.id, link.message_id)
+            await self.bot.http.delete_message(link.dm_channel_id, link.other_side_id)
 
         else:
+            await self.bot.archiver.flush()
+            if message is None:
+                results = await self.db_conn.fetchrow("message_last_mod", ctx.channel.id)
+                if not results:
+                    await ctx.send(
+                        embed=common_embed("Delete message", "There's no message made by mods in this thread yet"))
+                    return
 
-            mod_msg: discord.Message = await ctx.channel.fetch_message(message)
-            results = await self.db_conn.fetchrow("SELECT messages.message_id, messages.other_side_message_id, \
-                                                          conversations.user_id \
-                                                   FROM modmail.messages \
-                                                   INNER JOIN modmail.conversations \
-                                                   ON messages.conversation_id = conversations.conversation_id \
-                                                   WHERE \
-                                                        messages.message_id = $1 AND \
-                                                        messages.made_by_mod = true AND \
-                                                        deleted = false \
-                                                   ORDER BY messages.created_at DESC \
-                                                   LIMIT 1", message)
-            if not results:
-                await ctx.send(embed=common_embed("Delete message",
-                                                  "Unable to locate a message with that ID, please check the ID and try again"))
-                return
+                mod_msg: discord.Message = await ctx.channel.fetch_message(results[0])
 
-        usr = await self.bot.fetch_user(results[2])
-        usr_msg: discord.Message = await usr.dm_channel.fetch_message(results[1])
+            else:
+
+                mod_msg: discord.Message = await ctx.channel.fetch_message(message)
+                results = await self.db_conn.fetchrow("message_mod_by_id", message)
+                if not results:
+                    await ctx.send(embed=common_embed("Delete message",
+                                                      "Unable to locate a message with that ID, please check the ID and try again"))
+                    return
+
+            usr = await self.bot.users.get(results[2])
+
+            await mod_msg.delete()
+            # the user no longer exists, only the thread side can be deleted
+            if usr is not None:
+                usr_msg: discord.Message = await usr.dm_channel.fetch_message(results[1])
+                await usr_msg.delete()
 
-        await mod_msg.delete()
-        await usr_msg.delete()
-        await self.db_conn.execute("UPDATE modmail.messages \
-                                    SET deleted=true \
-                                    WHERE \
-                                        message_id=$1", results[0])
-        await self.db_conn.execute("UPDATE modmail.all_messages_attachments \
-                                    SET deleted=true \
-                                    WHERE \
-                                        message_id=$1", results[0])
+        await self.bot.conversation_repo.set_message_deleted(results[0])
+
+        link = self.bot.messages.get(results[0])
+        if link is not None:
+            link.deleted = True
 
         await ctx.message.add_reaction('✅')
 
+    # forward_messages takes ctx commands.Context, channel discord.TextChannel and conversation_id int
+    #  Replays every message of the conversation into channel in order, reporting progress in ctx
+    #  Remaps the old message ids to the new ones and moves the conversation in one transaction
+    #  Returns nothing on success, error on failure
+    async def forward_messages(self, ctx, channel: discord.TextChannel, conversation_id: int) -> None:
+        await self.bot.archiver.flush()
+        messages = await self.db_conn.fetch("archive_by_conversation", conversation_id)
+
+        relayed_messages = {row[0] for row in await self.db_conn.fetch("message_ids_by_conversation", conversation_id)}
+
+        authors = await self.bot.users.get_many([row[2] for row in messages])
+        progress = await ctx.send(embed=common_embed("Forward conversation",
+                                                     f"Forwarding {len(messages)} message(s)..."))
+
+        old_ids, new_ids = list(), list()
+        for index, row in enumerate(messages, 1):
+            author = authors[row[2]]
+
+            if row[3] in relayed_messages:
+                thread_embed = common_embed("", row[0], color=self.green if row[1] else self.yellow)
+            else:
+                thread_embed = common_embed("", "**Internal Message:**\n" + row[0], color=self.blue)
+
+            if author is not None:
+                thread_embed.set_author(name=str(author), icon_url=author.avatar_url)
+            else:
+                thread_embed.set_author(name=str(row[2]))
+            thread_embed.set_footer(text="Forwarded message")
+
+            msg = await channel.send(embed=thread_embed)
+            old_ids.append(row[3])
+            new_ids.append(msg.id)
+
+            if index % 25 == 0:
+                await progress.edit(embed=common_embed("Forward conversation",
+                                                       f"Forwarded {index}/{len(messages)} message(s)..."))
+
+        await self.bot.conversation_repo.forward(conversation_id, ctx.channel.id, channel.id, old_ids, new_ids,
+                                                 self.teardown_delay, "Thread Forwarded")
+
+        await progress.edit(embed=common_embed("Forward conversation",
+                                               f"Forwarded {len(messages)}/{len(messages)} message(s)."))
+
     # forward takes no arguments
     #  Sends category selector embed
     #  Forwards the conversation to the selected category
@@ -376,81 +392,35 @@ class ModmailCog(commands.Cog):
             await ctx.send(
                 embed=common_embed("Forward conversation", f"This conversation is already in category {category.name}"))
 
-        usr_db = await self.db_conn.fetchrow("SELECT user_id, conversation_id \
-                                              FROM modmail.conversations \
-                                              WHERE \
-                                                channel_id=$1", ctx.channel.id)
-        user = await self.bot.fetch_user(usr_db[0])
-
-        channel = await guild.create_text_channel(name=f"{user.name}-{user.discriminator}", category=category)
-
-        past_threads = await self.db_conn.fetch("SELECT conversation_id \
-                                                 FROM modmail.conversations \
-                                                 WHERE \
-                                                    user_id=$1 AND \
-                                                    active=false",
-                                                user.id)
+        usr_db = await self.db_conn.fetchrow("conversation_by_channel", ctx.channel.id)
+        user = await self.bot.users.get(usr_db[0])
 
-        created_ago = datetime.datetime.now() - user.created_at
+        channel, past_threads = await asyncio.gather(
+            guild.create_text_channel(name=f"{user.name}-{user.discriminator}" if user else f"{usr_db[0]}",
+                                      category=category),
+            self.db_conn.fetchval("conversation_past_count", usr_db[0]))
 
-        await channel.send(embed=common_embed("", f"{user.mention} was created {created_ago.days} days ago"
-                                                  f" with **{'no' if len(past_threads) == 0 else len(past_threads)}** "
-                                                  f"past threads"))
+        if user is None:
+            await channel.send(embed=common_embed("", f"User {usr_db[0]} no longer exists and won't be notified, "
+                                                      f"**{'no' if past_threads == 0 else past_threads}** "
+                                                      f"past threads"))
+        else:
+            created_ago = datetime.datetime.now() - user.created_at
+            await channel.send(embed=common_embed("", f"{user.mention} was created {created_ago.days} days ago"
+                                                      f" with **{'no' if past_threads == 0 else past_threads}** "
+                                                      f"past threads"))
         await channel.send(embed=common_embed("Forwarded conversation",
                                               f"Conversation forwarded by {ctx.author.mention} from "
                                               f"{ctx.channel.category.name}"))
-        messages = await self.db_conn.fetch("SELECT message, made_by_mod, author_id, message_id \
-                                             FROM modmail.all_messages_attachments \
-                                             WHERE \
-                                                conversation_id=$1 AND \
-                                                deleted=false",
-                                            usr_db[1])
-
-        internal_messages = await self.db_conn.fetch("SELECT * \
-                                                      FROM modmail.messages \
-                                                      WHERE \
-                                                        conversation_id=$1 AND \
-                                                        deleted=false",
-                                                     usr_db[1])
-
-        for row in messages:
-            author = await self.bot.fetch_user(row[2])
-
-            if row[3] in internal_messages:
-                thread_embed = common_embed("", row[0], color=self.green if row[1] else self.yellow)
-            else:
-                thread_embed = common_embed("", "**Internal Message:**\n" + row[0], color=self.blue)
-
-            thread_embed.set_author(name=str(author), icon_url=author.avatar_url)
-            thread_embed.set_footer(text="Forwarded message")
+        await self.forward_messages(ctx, channel, usr_db[1])
+        self.bot.conversations.move(ctx.channel.id, channel.id)
+        self.bot.messages.forget_conversation(usr_db[1])
 
-            msg = await channel.send(embed=thread_embed)
-
-            await self.db_conn.execute("UPDATE modmail.all_messages_attachments \
-                                        SET message_id=$1 \
-                                        WHERE \
-                                            message_id=$2",
-                                       msg.id, row[3])
-
-            if row[3] in internal_messages:
-                await self.db_conn.execute("UPDATE modmail.messages \
-                                            SET message_id=$1 \
-                                            WHERE \
-                                                message_id=$2",
-                                           msg.id, row[3])
-
-        await self.db_conn.execute("UPDATE modmail.conversations \
-                                    SET channel_id = $1 \
-                                    WHERE \
-                                        conversation_id=$2",
-                                   channel.id, usr_db[1])
-
-        await user.send(embed=common_embed("Conversation forward", f"You were forwarded to {channel.category.name}"))
+        if user is not None:
+            await user.send(embed=common_embed("Conversation forward", f"You were forwarded to {channel.category.name}"))
         await ctx.send(embed=common_embed("Conversation forward",
-                                          "The conversation was successfully forwarded. This channel will get deleted "
-                                          "in 10 seconds"))
-        await asyncio.sleep(10)
-        await ctx.channel.delete()
+                                          f"The conversation was successfully forwarded. This channel will get deleted "
+                                          f"in {self.teardown_delay:g} seconds"))
 
     # Logs takes optional user discord.Member, int
     #  displays the discord user's past modmails in pages
@@ -460,73 +430,65 @@ class ModmailCog(commands.Cog):
     @commands.guild_only()
     async def logs(self, ctx: commands.Context, user: typing.Optional[typing.Union[discord.Member, int]]) -> None:
         if user is None:
-            result = await self.db_conn.fetchrow("SELECT user_id \
-                                                  FROM modmail.conversations \
-                                                  WHERE \
-                                                     channel_id = $1",
-                                                 ctx.channel.id)
+            result = await self.db_conn.fetchrow("conversation_user_by_channel", ctx.channel.id)
             if not result:
                 await ctx.send(
                     embed=common_embed(title="Not Found",
                                        description="Unable to locate modmail thread, please specify the id"))
                 return
 
-            user = await self.bot.fetch_user(result[0])
+            user = result[0]
 
-        else:
-            if isinstance(user, int):
-                user = await self.bot.fetch_user(user)
+        # users that no longer exist are shown by their raw id
+        user_id = user if isinstance(user, int) else user.id
+        if isinstance(user, int):
+            user = await self.bot.users.get(user_id) or user_id
 
-            if not user:
-                await ctx.send(embed=common_embed("Create conversation",
-                                                  "Unable to find that user, please check the id and try again"))
-                return
+        await self.bot.archiver.flush()
+        conversations = await self.db_conn.fetch("logs_conversations", user_id)
+        if not conversations:
+            await ctx.send(embed=common_embed('Logs', f'No prior logs found for {user}'))
+            return
 
-        embeds = list()
-
-        conversations = await self.db_conn.fetch("SELECT conversations.conversation_id, conversations.created_at,\
-                                                         conversations.closing_date, categories.category_name, \
-                                                         categories.category_id \
-                                                  FROM modmail.conversations \
-                                                  INNER JOIN modmail.categories \
-                                                  ON conversations.category_id = categories.category_id \
-                                                  WHERE \
-                                                    conversations.active=false AND \
-                                                    conversations.user_id=$1 \
-                                                  ORDER BY created_at DESC", user.id)
-        if conversations:
-            async with ctx.typing():
-                for row in conversations:
-                    embed = common_embed("", f"ID: {row[0]}")
-                    embed.set_author(name=f"Total Results Found ({len(conversations)}) - {user}",
-                                     icon_url=user.avatar_url)
-                    embed.add_field(name="Created", value=duration(row[1], now=datetime.datetime.now(pytz.utc)))
-                    embed.add_field(name="Closed", value=duration(row[1], now=datetime.datetime.now(pytz.utc)))
-                    embed.add_field(name="Category", value=f"{row[3].capitalize()} ({row[4]})")
-
-                    messages = await self.db_conn.fetch("SELECT message, author_id, deleted, made_by_mod \
-                                                         FROM modmail.messages \
-                                                         WHERE \
-                                                            conversation_id=$1 \
-                                                         ORDER BY created_at", row[0])
-                    embed_messages = list()
-
-                    for index, message in enumerate(messages, 1):
-                        if message[2]:
-                            embed_messages.append(
-                                f'[{index}] - ~~{message[0]}~~ ~ <@{message[1]}> {"(mod)" if message[3] else ""}')
-                        else:
-                            embed_messages.append(
-                                f'[{index}] - {message[0]} ~ <@{message[1]}> {"(mod)" if message[3] else ""}')
-
-                    embed.add_field(name="Messages:",
-                                    value="\n".join(embed_messages if embed_messages else ["No messages"]),
-                                    inline=False)
-                    embeds.append(embed)
-
-            await disputils.BotEmbedPaginator(ctx, embeds).run()
+        async def get_page(index: int) -> discord.Embed:
+            row = conversations[index]
+            embed = common_embed("", f"ID: {row[0]}")
+            embed.set_author(name=f"Total Results Found ({len(conversations)}) - {user}",
+                             icon_url=getattr(user, 'avatar_url', discord.Embed.Empty))
+            embed.add_field(name="Created", value=duration(row[1], now=datetime.datetime.now(pytz.utc)))
+            embed.add_field(name="Closed", value=duration(row[2], now=datetime.datetime.now(pytz.utc))
+                            if row[2] else "Unknown")
+            embed.add_field(name="Category", value=f"{row[3].capitalize()} ({row[4]})")
+            embed.add_field(name="Messages:", value=await self.render_log_messages(row[0]), inline=False)
+            return embed
+
+        await LazyEmbedPaginator(ctx, len(conversations), get_page).run()
+
+    # render_log_messages takes conversation_id int
+    #  reads the transcript stored at close, conversations closed before transcripts existed are read from messages
+    #  stops once the embed field is full
+    #  returns the numbered message list
+    async def render_log_messages(self, conversation_id: int) -> str:
+        blob = await self.db_conn.fetchval("conversation_transcript", conversation_id)
+        if blob is not None:
+            messages = transcript.decode(blob)
         else:
-            await ctx.send(embed=common_embed('Logs', f'No prior logs found for {user}'))
+            messages = await self.db_conn.fetch("logs_messages", conversation_id)
+        if not messages:
+            return "No messages"
+
+        lines = list()
+        length = 0
+        for index, message in enumerate(messages, 1):
+            text = f"~~{message[0]}~~" if message[2] else message[0]
+            line = f'[{index}] - {text} ~ <@{message[1]}> {"(mod)" if message[3] else ""}'
+            if index > 50 or length + len(line) + 1 > 1000:
+                lines.append("...")
+                break
+            lines.append(line)
+            length += len(line) + 1
+
+        return "\n".join(lines)
 
 
 def setup(bot):
@@ -43,46 +43,34 @@ class MutedCog(commands.Cog):
     @commands.guild_only()
     async def mute(self, ctx, user: typing.Union[discord.Member, str], end_time: typing.Optional[str] = None) -> None:
         if isinstance(user, str):
-            try:
-                user = await self.bot.fetch_user(int(user))
-            except (discord.ext.commands.CommandInvokeError, ValueError):
+            user = await self.bot.users.get(int(user)) if user.isdigit() else None
+            if user is None:
                 await ctx.send(embed=common_embed("Mute", "Unable to locate user, please check if the id is correct"))
                 return
 
-        if await is_muted(user.id, self.db_conn):
+        if is_muted(user.id, self.bot.mutes):
             await ctx.send(embed=common_embed("Mute", 'User already muted'))
             return
 
         msg = await ctx.send(embed=common_embed("Mute", f"Muting user {user.name}..."))
-        db_user = await self.db_conn.fetch("SELECT * \
-                                            FROM modmail.muted \
-                                            WHERE \
-                                                user_id = $1", user.id)
+        db_user = await self.db_conn.fetch("muted_by_user", user.id)
 
         if end_time:
             time_class = Time()
             time = time_class.add_text_to_time(end_time, datetime.datetime.now(pytz.utc))
             if db_user:
-                await self.db_conn.execute("UPDATE modmail.muted \
-                                            SET active = true, muted_by = $1, muted_until = $2 \
-                                            WHERE \
-                                               user_id = $3",
-                                           ctx.author.id, time, user.id)
+                await self.db_conn.execute("muted_update_until", ctx.author.id, time, user.id)
             else:
-                await self.db_conn.execute("INSERT INTO modmail.muted (user_id, muted_by, muted_until, active) \
-                                            VALUES ($1, $2, $3, true)",
-                                           user.id, ctx.author.id, time)
+                await self.db_conn.execute("muted_insert_until", user.id, ctx.author.id, time)
+            self.bot.unmutes.schedule(user.id, time)
+            self.bot.mutes.add(user.id, time)
         else:
             if db_user:
-                await self.db_conn.execute("UPDATE modmail.muted \
-                                            SET active = true, muted_by = $1 \
-                                            WHERE \
-                                               user_id = $2",
-                                           ctx.author.id, user.id)
+                await self.db_conn.execute("muted_update", ctx.author.id, user.id)
             else:
-                await self.db_conn.execute("INSERT INTO modmail.muted (user_id, muted_by, active) \
-                                            VALUES ($1, $2, true)",
-                                           user.id, ctx.author.id)
+                await self.db_conn.execute("muted_insert", user.id, ctx.author.id)
+            self.bot.unmutes.cancel(user.id)
+            self.bot.mutes.add(user.id)
         await msg.edit(embed=common_embed("Mute", f"Muted user {user}({user.id})"))
         await user.send(embed=common_embed("Muted", f"Due to misuse of our modmail bot, you were muted "
                                                     f"for {end_time}. Any messages you send here will not be "
@@ -96,22 +84,19 @@ class MutedCog(commands.Cog):
     @commands.guild_only()
     async def unmute(self, ctx, user: typing.Union[discord.Member, str]) -> None:
         if isinstance(user, str):
-            try:
-                user = await self.bot.fetch_user(int(user))
-            except (discord.ext.commands.CommandInvokeError, ValueError):
+            user = await self.bot.users.get(int(user)) if user.isdigit() else None
+            if user is None:
                 await ctx.send(embed=common_embed("Unmute", "Unable to locate user, please check if the id is correct"))
                 return
 
-        if not await is_muted(user.id, self.db_conn):
+        if not is_muted(user.id, self.bot.mutes):
             await ctx.send(embed=common_embed("Unmute", 'User is not muted'))
             return
         else:
             msg = await ctx.send(embed=common_embed("Unmute", f"Unmuting user {user}..."))
-            await self.db_conn.execute("UPDATE modmail.muted \
-                                        SET active = false \
-                                        WHERE \
-                                           user_id = $1",
-                                       user.id)
+            await self.db_conn.execute("muted_set_inactive", user.id)
+            self.bot.unmutes.cancel(user.id)
+            self.bot.mutes.remove(user.id)
             await msg.edit(embed=common_embed("Unmute", f'Unmuted user {user.id}'))
 
     # Muted takes no parameters
@@ -123,16 +108,13 @@ class MutedCog(commands.Cog):
     async def muted(self, ctx) -> None:
         msg = await ctx.send(embed=common_embed("Muted", "Getting all active users..."))
 
-        results = await self.db_conn.fetch("SELECT user_id, muted_by, muted_at, muted_until \
-                                            FROM modmail.muted \
-                                            WHERE \
-                                               active = true")
+        results = await self.db_conn.fetch("muted_active")
         paginator = discord.ext.commands.Paginator()
+        users = await self.bot.users.get_many([row[0] for row in results] + [row[1] for row in results])
 
         for row in results:
-            user = await self.bot.fetch_user(row[0])
-            muted_by = await self.bot.fetch_user(row[1])
-            paginator.add_line(f"{user}({user.id})\n\n"
+            user, muted_by = users[row[0]] or "", users[row[1]] or ""
+            paginator.add_line(f"{user}({row[0]})\n\n"
                                f"Muted by: {muted_by}({row[1]})\n"
                                f"Muted at: {row[2].strftime('%d/%m/%Y, %H:%M')}\n"
                                f"Muted until: {row[3].strftime('%d/%m/%Y, %H:%M')}\n"
@@ -151,14 +133,13 @@ class MutedCog(commands.Cog):
     async def all(self, ctx):
         msg = await ctx.send(embed=common_embed("Muted all", "Getting all users..."))
 
-        results = await self.db_conn.fetch("SELECT user_id, muted_by, muted_at, muted_until, active \
-                                            FROM modmail.muted")
+        results = await self.db_conn.fetch("muted_all")
         paginator = commands.Paginator()
+        users = await self.bot.users.get_many([row[0] for row in results] + [row[1] for row in results])
 
         for row in results:
-            user = await self.bot.fetch_user(row[0])
-            muted_by = await self.bot.fetch_user(row[1])
-            paginator.add_line(f"{user}({user.id})\n\n"
+            user, muted_by = users[row[0]] or "", users[row[1]] or ""
+            paginator.add_line(f"{user}({row[0]})\n\n"
                                f"Muted: {'✓' if bool(row[4]) else '✗'}\n"
                                f"Muted by: {muted_by}({row[1]})\n"
                                f"Muted at: {row[2].strftime('%d/%m/%Y, %H:%M')}\n"
@@ -177,25 +158,21 @@ class MutedCog(commands.Cog):
     @commands.guild_only()
     async def is_muted(self, ctx, user: typing.Union[discord.Member, str]) -> None:
         if isinstance(user, str):
-            try:
-                user = await self.bot.fetch_user(int(user))
-            except (commands.CommandInvokeError, ValueError):
+            user = await self.bot.users.get(int(user)) if user.isdigit() else None
+            if user is None:
                 await ctx.send(embed=common_embed("Is muted",
                                                   "Unable to locate user, please check if the id is correct"))
                 return
 
-        result = await self.db_conn.fetchrow("SELECT active, muted_by, muted_at, muted_until \
-                                              FROM modmail.muted \
-                                              WHERE \
-                                                user_id = $1", user.id)
+        result = await self.db_conn.fetchrow("muted_status", user.id)
 
         if result:
-            muted_by = await self.bot.fetch_user(result[1])
+            muted_by = await self.bot.users.get(result[1]) or ""
             await ctx.send(
                 embed=discord.Embed(
                     color=discord.Color.red(),
                     description=f"```{user}({user.id})\n\n"
-                                f"Muted: {'✓' if is_muted else '✗'}\n"
+                                f"Muted: {'✓' if result[0] else '✗'}\n"
                                 f"Muted by: {muted_by}({result[1]})\n"
                                 f"Muted at: {result[2].strftime('%d/%m/%Y, %H:%M')}\n"
                                 f"Muted until: {result[3].strftime('%d/%m/%Y, %H:%M')}\n```"))
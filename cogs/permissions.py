@@ -24,11 +24,7 @@ class PermissionsCog(commands.Cog):
         if isinstance(role, discord.Role):
             role = role.id
 
-        results_cat = await self.db_conn.fetchrow("SELECT * \
-                                                   FROM modmail.categories \
-                                                   WHERE \
-                                                      active=TRUE AND \
-                                                      category_id=$1", category_id)
+        results_cat = await self.db_conn.fetchrow("category_active_by_id", category_id)
         if not results_cat:
             await ctx.send(embed=common_embed("Set permissions",
                                               f"Did not find active category with category id {category_id}."))
@@ -39,11 +35,7 @@ class PermissionsCog(commands.Cog):
 
             return
 
-        results = await self.db_conn.fetchrow("SELECT * \
-                                               FROM modmail.permissions \
-                                               WHERE \
-                                                  category_id=$1 AND \
-                                                  role_id=$2 ", category_id, role)
+        results = await self.db_conn.fetchrow("permission_by_role", category_id, role)
         if results:
             category = await self.bot.fetch_channel(results[0])
             if results[3]:
@@ -61,10 +53,8 @@ class PermissionsCog(commands.Cog):
                 if not success:
                     return
 
-                await self.db_conn.execute("UPDATE modmail.permissions \
-                                            SET active=TRUE \
-                                            WHERE \
-                                              category_id=$1", category_id)
+                await self.db_conn.execute("permission_set_active", category_id)
+                self.bot.access.invalidate()
 
         guild = await self.bot.fetch_guild(results_cat[3])
         role = discord.utils.get(guild.roles, id=role)
@@ -78,9 +68,8 @@ class PermissionsCog(commands.Cog):
         if not success:
             return
 
-        await self.db_conn.execute("INSERT INTO modmail.permissions \
-                                    (category_id, role_name, role_id, active) \
-                                    VALUES($1, $2, $3, TRUE)", category_id, role.name, role.id)
+        await self.db_conn.execute("permission_insert", category_id, role.name, role.id)
+        self.bot.access.invalidate()
 
         ch = self.bot.get_channel(category_id)
         await ch.set_permissions(role, read_messages=True, send_messages=True, read_message_history=True)
@@ -94,10 +83,7 @@ class PermissionsCog(commands.Cog):
     async def permissions(self, ctx) -> None:
         msg = await ctx.send(embed=common_embed("Permissions", "Retrieving active permissions."))
 
-        results = await self.db_conn.fetch("SELECT * \
-                                            FROM modmail.permissions \
-                                            WHERE \
-                                               active=TRUE")
+        results = await self.db_conn.fetch("permissions_active")
         embeds = list()
 
         for row in results:
@@ -124,8 +110,7 @@ class PermissionsCog(commands.Cog):
     async def all(self, ctx) -> None:
         msg = await ctx.send(embed=common_embed("Permissions", "Retrieving all permissions."))
 
-        results = await self.db_conn.fetch("SELECT * \
-                                            FROM modmail.permissions")
+        results = await self.db_conn.fetch("permissions_all")
         embeds = list()
 
         for row in results:
@@ -148,10 +133,7 @@ class PermissionsCog(commands.Cog):
     @is_admin()
     @commands.guild_only()
     async def category_permissions(self, ctx, category_id: int) -> None:
-        category_result = await self.db_conn.fetchrow("SELECT * \
-                                                       FROM modmail.permissions \
-                                                       WHERE \
-                                                           category_id=$1", category_id)
+        category_result = await self.db_conn.fetchrow("permissions_by_category", category_id)
 
         if not category_result:
             await ctx.send(embed=common_embed("Category permissions",
@@ -161,11 +143,7 @@ class PermissionsCog(commands.Cog):
 
         msg = await ctx.send(embed=common_embed("Category permissions", "Retrieving active permissions for category."))
 
-        results = await self.db_conn.fetch("SELECT * \
-                                            FROM modmail.permissions \
-                                            WHERE \
-                                               active=TRUE AND \
-                                               category_id=$1", category_id)
+        results = await self.db_conn.fetch("permissions_active_by_category", category_id)
         embeds = list()
 
         for row in results:
@@ -193,11 +171,7 @@ class PermissionsCog(commands.Cog):
         if isinstance(role, discord.Role):
             role = role.id
 
-        results_perm = await self.db_conn.fetchrow("SELECT * \
-                                                    FROM modmail.permissions \
-                                                    WHERE \
-                                                       category_id=$1 AND \
-                                                       role_id=$2", category_id, role)
+        results_perm = await self.db_conn.fetchrow("permission_by_role", category_id, role)
         if not results_perm:
             await ctx.send(embed=common_embed("Activate permissions",
                                               f"Did not find active permissions for category with category id "
@@ -226,10 +200,8 @@ class PermissionsCog(commands.Cog):
         if not success:
             return
 
-        await self.db_conn.execute("UPDATE modmail.permissions \
-                                    SET active=TRUE \
-                                    WHERE \
-                                      category_id=$1", category_id)
+        await self.db_conn.execute("permission_set_active", category_id)
+        self.bot.access.invalidate()
 
         ch = self.bot.get_channel(category_id)
         await ch.set_permissions(role, read_messages=True, send_messages=True, read_message_history=True)
@@ -241,11 +213,7 @@ class PermissionsCog(commands.Cog):
     @is_admin()
     @commands.guild_only()
     async def deactivate_permission(self, ctx, category_id: int, role: typing.Union[discord.Role, int]) -> None:
-        results_perm = await self.db_conn.fetchrow("SELECT * \
-                                                    FROM modmail.permissions \
-                                                    WHERE \
-                                                       category_id=$1 AND \
-                                                       role_id=$2", category_id, role)
+        results_perm = await self.db_conn.fetchrow("permission_by_role", category_id, role)
         if not results_perm:
             await ctx.send(embed=common_embed("Deactivate permissions",
                                               "Did not find active permissions for category with category id "
@@ -274,10 +242,8 @@ class PermissionsCog(commands.Cog):
         if not success:
             return
 
-        await self.db_conn.execute("UPDATE modmail.permissions \
-                                    SET active=FALSE \
-                                    WHERE \
-                                      category_id=$1", category_id)
+        await self.db_conn.execute("permission_set_inactive", category_id)
+        self.bot.access.invalidate()
 
         ch = self.bot.get_channel(category_id)
         await ch.set_permissions(role, read_messages=False, send_messages=False, read_message_history=False)
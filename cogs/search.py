@@ -0,0 +1,76 @@
+from utils.checks import *
+from utils.common_embed import *
+from utils.lazy_paginator import LazyEmbedPaginator
+from utils.archive_filters import parse_filters
+import discord
+import typing
+
+
+class searchCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.db_conn = bot.db_conn
+        self.per_page = 10
+        # discord rejects embeds with more than 6000 characters in total, the paginator adds the page footer
+        self.embed_limit = 6000 - 100
+
+    # search takes query str
+    #  searches every archived message by words, optionally filtered by author, category and date (UTC)
+    #  e.g. !search ban appeal author:@user category:123 after:2021-01-01 before:2021-02-01
+    #  sends the matches newest first in pages on success, error on failure
+    @commands.command()
+    @is_admin()
+    @commands.guild_only()
+    async def search(self, ctx, *, query: str) -> None:
+        try:
+            words, filters = parse_filters(query, ('author', 'category', 'after', 'before'))
+        except ValueError:
+            await ctx.send(embed=common_embed("Search", "Invalid filter, use `author:<id>`, `category:<id>`, "
+                                                        "`after:YYYY-MM-DD` and `before:YYYY-MM-DD`"))
+            return
+
+        if not words:
+            await ctx.send(embed=common_embed("Search", "Please enter at least one word to search for"))
+            return
+
+        await self.bot.archiver.flush()
+        author, category = filters.get('author'), filters.get('category')
+        lower = discord.utils.time_snowflake(filters['after']) if 'after' in filters else 0
+        # cursors[i] is the exclusive upper message id of page i, None once the results ran out
+        cursors = [discord.utils.time_snowflake(filters['before']) if 'before' in filters else 2 ** 63 - 1]
+
+        async def get_page(index: int) -> typing.Optional[discord.Embed]:
+            if index >= len(cursors) or cursors[index] is None:
+                return None
+
+            rows = await self.db_conn.fetch("archive_search", words, author, category, lower, cursors[index],
+                                            self.per_page + 1)
+            if not rows and index > 0:
+                return None
+
+            more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+
+            users = await self.bot.users.get_many([row[1] for row in rows])
+            embed = common_embed("Search", f"Results for `{words[:200]}`" if rows else
+                                 f"Nothing matches `{words[:200]}`")
+            # fields are added until the next one would go over the embed limit, the rest starts the next page
+            shown = 0
+            for row in rows:
+                sent = discord.utils.snowflake_time(row[0]).strftime('%d/%m/%Y, %H:%M')
+                name = f"{users[row[1]] or row[1]}{' (mod)' if row[3] else ''} - {sent}"
+                value = f"{row[6][:900]}\nConversation {row[2]} with <@{row[4]}> in {row[5]}"
+                if len(embed) + len(name) + len(value) > self.embed_limit:
+                    break
+                embed.add_field(name=name, value=value, inline=False)
+                shown += 1
+
+            if index + 1 == len(cursors):
+                cursors.append(rows[shown - 1][0] if more or shown < len(rows) else None)
+            return embed
+
+        await LazyEmbedPaginator(ctx, None, get_page).run()
+
+
+def setup(bot):
+    bot.add_cog(searchCog(bot))
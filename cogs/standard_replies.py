@@ -15,55 +15,39 @@ class standardRepliesCog(commands.Cog):
     @has_access()
     @commands.guild_only()
     async def standard_reply(self, ctx, reply_id: int) -> None:
-        reply_db = await self.db_conn.fetchrow("SELECT standard_reply \
-                                                FROM modmail.standardreplies \
-                                                WHERE \
-                                                    reply_id=$1 AND \
-                                                    active=TRUE",
-                                               reply_id)
-        conversation = await self.db_conn.fetchrow("SELECT conversation_id, user_id \
-                                                    FROM modmail.conversations \
-                                                    WHERE \
-                                                        channel_id = $1", ctx.channel.id)
-
-        if not reply_db:
+        reply_db = await self.bot.standard_replies.get(self.db_conn, reply_id)
+        conversation = self.bot.conversations.get_by_channel(ctx.channel.id)
+
+        if not reply_db or not reply_db.active:
             await ctx.send(embed=common_embed("Standard reply",
                                               f"I could not find a reply with reply ID {reply_id}. Please start over."))
             return
 
         check = await confirmation(self.bot, ctx, "Standard reply",
-                                   f"Are you sure you want to reply with `{reply_db[0]}`?", "standard_reply")
+                                   f"Are you sure you want to reply with `{reply_db.text}`?", "standard_reply")
         if not check:
             return
 
-        await reply(self.bot, ctx, self.db_conn, conversation[1], reply_db[0], conversation[0])
+        await reply(self.bot, ctx, self.db_conn, conversation[1], reply_db.text, conversation[0])
 
     @standard_reply.command(name='anonymous', aliases=['anon'])
     @has_access()
     @commands.guild_only()
     async def standard_reply_anonymous(self, ctx, reply_id: int) -> None:
-        reply_db = await self.db_conn.fetchrow("SELECT standard_reply \
-                                                FROM modmail.standardreplies \
-                                                WHERE \
-                                                    reply_id=$1 AND \
-                                                    active=TRUE",
-                                               reply_id)
-        conversation = await self.db_conn.fetchrow("SELECT conversation_id, user_id \
-                                                    FROM modmail.conversations \
-                                                    WHERE \
-                                                        channel_id = $1", ctx.channel.id)
-
-        if not reply_db:
+        reply_db = await self.bot.standard_replies.get(self.db_conn, reply_id)
+        conversation = self.bot.conversations.get_by_channel(ctx.channel.id)
+
+        if not reply_db or not reply_db.active:
             await ctx.send(embed=common_embed("Standard reply",
                                               f"I could not find a reply with reply ID {reply_id}. Please start over."))
             return
 
         check = await confirmation(self.bot, ctx, "Standard reply",
-                                   f"Are you sure you want to reply with `{reply_db[0]}`?", "standard_reply")
+                                   f"Are you sure you want to reply with `{reply_db.text}`?", "standard_reply")
         if not check:
             return
 
-        await reply(self.bot, ctx, self.db_conn, conversation[1], reply_db[0], conversation[0], anon=True)
+        await reply(self.bot, ctx, self.db_conn, conversation[1], reply_db.text, conversation[0], anon=True)
 
     # Standard_reply takes standard_reply_id int.
     #   Retrieves standard reply info from database.
@@ -72,19 +56,16 @@ class standardRepliesCog(commands.Cog):
     @has_access()
     @commands.guild_only()
     async def show_standard_reply(self, ctx, standard_reply_id: int) -> None:
-        result = await self.db_conn.fetchrow("SELECT standard_reply, active, description, made_by_id, reply_id \
-                                              FROM modmail.standardreplies \
-                                              WHERE \
-                                                reply_id = $1", standard_reply_id)
+        result = await self.bot.standard_replies.get(self.db_conn, standard_reply_id)
 
         try:
-            made_by = await self.bot.fetch_user(result[3])
+            made_by = await self.bot.users.get(result.made_by_id) or result.made_by_id
             embed = common_embed("Standard Reply",
-                                 f"ID: {result[4]}\n\n"
-                                 f"Active: {'✓' if result[1] else '✗'}\n"
+                                 f"ID: {result.reply_id}\n\n"
+                                 f"Active: {'✓' if result.active else '✗'}\n"
                                  f"Made By: {made_by}\n"
-                                 f"Reply: \"{result[0]}\"\n"
-                                 f"Description: \"{result[2]}\"\n")
+                                 f"Reply: \"{result.text}\"\n"
+                                 f"Description: \"{result.description}\"\n")
         finally:
             await ctx.send(embed=embed)
 
@@ -109,10 +90,9 @@ class standardRepliesCog(commands.Cog):
                                       f"Description \"{description.content}\"",
                                       "create_standard_reply")
             if conf:
-                reply_id = await self.db_conn.fetchval("INSERT INTO modmail.standardreplies \
-                                            (standard_reply, made_by_id, active, description) \
-                                            VALUES ($1, $2, true, $3) RETURNING reply_id",
-                                                 reply.content, ctx.author.id, description.content)
+                reply_id = await self.db_conn.fetchval("standard_reply_insert",
+                                                       reply.content, ctx.author.id, description.content)
+                self.bot.standard_replies.invalidate()
 
         except asyncio.TimeoutError:
             await ctx.send(embed=common_embed("Standard Reply",
@@ -129,15 +109,12 @@ class standardRepliesCog(commands.Cog):
     @is_admin()
     @commands.guild_only()
     async def standard_reply_set_inactive(self, ctx, standard_reply_id: int) -> None:
-        check = await self.db_conn.fetchrow("SELECT active \
-                                             FROM modmail.standardreplies \
-                                             WHERE \
-                                                reply_id = $1", standard_reply_id)
+        check = await self.bot.standard_replies.get(self.db_conn, standard_reply_id)
         if check is None:
             await ctx.send(embed=common_embed("Standard Reply",
                                               "Unable to fetch standard reply, please check if your id is correct"))
             return
-        elif not check[0]:
+        elif not check.active:
             await ctx.send(embed=common_embed("Standard Reply", "The standard reply is already inactive"))
             return
 
@@ -148,9 +125,8 @@ class standardRepliesCog(commands.Cog):
             return
 
         try:
-            await self.db_conn.execute("UPDATE modmail.standardreplies \
-                                        SET active=false \
-                                        WHERE reply_id = $1", standard_reply_id)
+            await self.db_conn.execute("standard_reply_set_inactive", standard_reply_id)
+            self.bot.standard_replies.invalidate()
 
         finally:
             await ctx.send(embed=common_embed("Standard Reply",
@@ -164,15 +140,12 @@ class standardRepliesCog(commands.Cog):
     @is_admin()
     @commands.guild_only()
     async def standard_reply_set_active(self, ctx, standard_reply_id: int) -> None:
-        check = await self.db_conn.fetchrow("SELECT active \
-                                             FROM modmail.standardreplies \
-                                             WHERE \
-                                                reply_id = $1", standard_reply_id)
+        check = await self.bot.standard_replies.get(self.db_conn, standard_reply_id)
         if check is None:
             await ctx.send(embed=common_embed("Standard Reply",
                                               "Unable to fetch standard reply, please check if your id is correct"))
             return
-        elif check[0]:
+        elif check.active:
             await ctx.send(embed=common_embed("Standard Reply", "The standard reply is already active"))
             return
 
@@ -183,10 +156,8 @@ class standardRepliesCog(commands.Cog):
             return
 
         try:
-            await self.db_conn.execute("UPDATE modmail.standardreplies \
-                                        SET active=true \
-                                        WHERE \
-                                            reply_id = $1", standard_reply_id)
+            await self.db_conn.execute("standard_reply_set_active", standard_reply_id)
+            self.bot.standard_replies.invalidate()
 
         finally:
             await ctx.send(embed=common_embed("Standard Reply",
@@ -199,20 +170,17 @@ class standardRepliesCog(commands.Cog):
     @has_access()
     @commands.guild_only()
     async def standard_replies(self, ctx) -> None:
-        result = await self.db_conn.fetch("SELECT standardreplies.standard_reply, standardreplies.active, \
-                                                  standardreplies.description, standardreplies.made_by_id, \
-                                                  standardreplies.reply_id \
-                                           FROM modmail.standardreplies \
-                                           WHERE standardreplies.active=true")
+        result = await self.bot.standard_replies.all(self.db_conn, active_only=True)
         embeds = list()
         try:
+            users = await self.bot.users.get_many([row.made_by_id for row in result])
 
             for row in result:
-                made_by = await self.bot.fetch_user(row[3])
-                embeds.append(common_embed(f"ID: {row[4]}\n\n",
+                made_by = users[row.made_by_id] or row.made_by_id
+                embeds.append(common_embed(f"ID: {row.reply_id}\n\n",
                                            f"Made By: {made_by}\n"
-                                           f"Reply: \"{row[0]}\"\n"
-                                           f"Description: \"{row[2]}\"\n"))
+                                           f"Reply: \"{row.text}\"\n"
+                                           f"Description: \"{row.description}\"\n"))
         finally:
             await disputils.BotEmbedPaginator(ctx, embeds).run()
 
@@ -223,32 +191,47 @@ class standardRepliesCog(commands.Cog):
     @has_access()
     @commands.guild_only()
     async def standard_replies_all(self, ctx) -> None:
-        result = await self.db_conn.fetch("SELECT standardreplies.standard_reply, standardreplies.active, \
-                                                  standardreplies.description, standardreplies.made_by_id, \
-                                                  standardreplies.reply_id \
-                                           FROM modmail.standardreplies")
+        result = await self.bot.standard_replies.all(self.db_conn, active_only=False)
         embeds = list()
         try:
+            users = await self.bot.users.get_many([row.made_by_id for row in result])
 
             for row in result:
-                made_by = await self.bot.fetch_user(row[3])
-                embeds.append(common_embed(f"ID: {row[4]}\n\n",
-                                           f"Active: {'✓' if row[1] else '✗'}\n"
+                made_by = users[row.made_by_id] or row.made_by_id
+                embeds.append(common_embed(f"ID: {row.reply_id}\n\n",
+                                           f"Active: {'✓' if row.active else '✗'}\n"
                                            f"Made By: {made_by}\n"
-                                           f"Reply: \"{row[0]}\"\n"
-                                           f"Description: \"{row[2]}\"\n"))
+                                           f"Reply: \"{row.text}\"\n"
+                                           f"Description: \"{row.description}\"\n"))
         finally:
             await disputils.BotEmbedPaginator(ctx, embeds).run()
 
+    # standard_replies search takes query str
+    #   Looks the active standard replies up by words of their reply or description, typos included.
+    #   returns the best matches on success, error on failure.
+    @standard_replies.command(name='search', aliases=['find'])
+    @has_access()
+    @commands.guild_only()
+    async def standard_replies_search(self, ctx, *, query: str) -> None:
+        result = await self.bot.standard_replies.search(self.db_conn, query)
+        if not result:
+            await ctx.send(embed=common_embed("Standard reply search", f"No standard reply matches `{query}`."))
+            return
+
+        description = ""
+        for row in result:
+            text = row.text if len(row.text) <= 80 else row.text[:77] + "..."
+            about = row.description if len(row.description or "") <= 80 else row.description[:77] + "..."
+            description += f"**{row.reply_id}**: {about}\n> {text}\n"
+
+        await ctx.send(embed=common_embed("Standard reply search", description))
+
     @commands.command()
     @is_admin()
     @commands.guild_only()
     async def edit_standard_reply(self, ctx, standard_reply_id: int):
         try:
-            check = await self.db_conn.fetchrow("SELECT reply_id \
-                                                 FROM modmail.standardreplies \
-                                                 WHERE \
-                                                    reply_id=$1", standard_reply_id)
+            check = await self.bot.standard_replies.get(self.db_conn, standard_reply_id)
             if not check:
                 await ctx.send(embed=common_embed("Standard Reply",
                                                   f"The standard reply with that id doesn't exist, "
@@ -268,10 +251,9 @@ class standardRepliesCog(commands.Cog):
                                       f"Description '{description.content}'",
                                       "edit_standard_reply")
             if conf and check:
-                await self.db_conn.execute("UPDATE modmail.standardreplies \
-                                            SET standard_reply=$1, description=$2 \
-                                            WHERE \
-                                                reply_id=$3", reply.content, description.content, standard_reply_id)
+                await self.db_conn.execute("standard_reply_update",
+                                           reply.content, description.content, standard_reply_id)
+                self.bot.standard_replies.invalidate()
 
         except asyncio.TimeoutError:
             await ctx.send(embed=common_embed("Standard Reply",
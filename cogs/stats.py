@@ -0,0 +1,151 @@
+from utils.checks import *
+from utils.common_embed import *
+import asyncio
+import time
+
+
+class statsCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.db_conn = bot.db_conn
+        self.metrics = bot.metrics
+        self.host = bot.conf.get('metrics', 'host', fallback='127.0.0.1')
+        self.port = bot.conf.getint('metrics', 'port', fallback=9108)
+        self.server = None
+        if self.port:
+            self.server_task = bot.loop.create_task(self.start_server())
+
+    def cog_unload(self):
+        if self.server is not None:
+            self.server.close()
+        elif self.port:
+            self.server_task.cancel()
+
+    # start_server takes no arguments
+    #  serves the metrics on http://host:port/metrics
+    async def start_server(self) -> None:
+        try:
+            self.server = await asyncio.start_server(self.handle_request, self.host, self.port)
+        except OSError as e:
+            print(f"Unable to serve metrics on {self.host}:{self.port}", e)
+
+    # handle_request takes reader asyncio.StreamReader and writer asyncio.StreamWriter
+    #  answers GET /metrics with the Prometheus text format and everything else with 404
+    async def handle_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            while await asyncio.wait_for(reader.readline(), timeout=5.0) not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request.split()
+            if len(parts) >= 2 and parts[0] == b"GET" and parts[1].split(b"?")[0] == b"/metrics":
+                status, body = "200 OK", self.exposition().encode()
+            else:
+                status, body = "404 Not Found", b"Not found\n"
+
+            writer.write(f"HTTP/1.1 {status}\r\n"
+                         f"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                         f"Content-Length: {len(body)}\r\n"
+                         f"Connection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    # exposition takes no arguments
+    #  returns the bot metrics followed by the query and pool statistics of the database connection
+    def exposition(self) -> str:
+        lines = ["# TYPE modmail_query_seconds summary"]
+        for name, stat in sorted(self.db_conn.stats.items()):
+            lines.append(f"modmail_query_seconds_sum{{statement=\"{name}\"}} {stat.total:.6f}")
+            lines.append(f"modmail_query_seconds_count{{statement=\"{name}\"}} {stat.calls}")
+
+        lines += ["# TYPE modmail_pool_wait_seconds summary",
+                  f"modmail_pool_wait_seconds_sum {self.db_conn.waits.total:.6f}",
+                  f"modmail_pool_wait_seconds_count {self.db_conn.waits.calls}",
+                  "# TYPE modmail_pool_in_use gauge",
+                  f"modmail_pool_in_use {self.db_conn.in_use}",
+                  "# TYPE modmail_pool_waiting gauge",
+                  f"modmail_pool_waiting {self.db_conn.waiting}",
+                  "# TYPE modmail_pool_reconnects_total counter",
+                  f"modmail_pool_reconnects_total {self.db_conn.reconnects}",
+                  "# TYPE modmail_gateway_latency_seconds gauge",
+                  f"modmail_gateway_latency_seconds {self.bot.latency:.6f}"]
+        return self.metrics.render() + "\n".join(lines) + "\n"
+
+    # Listens for invoked commands
+    #  remembers when the command started
+    @commands.Cog.listener()
+    async def on_command(self, ctx: commands.Context) -> None:
+        ctx.started_at = time.perf_counter()
+
+    # Listens for completed commands
+    #  records the execution time of the command
+    @commands.Cog.listener()
+    async def on_command_completion(self, ctx: commands.Context) -> None:
+        self.record_command(ctx, "ok")
+
+    # Listens for failed commands
+    #  records the execution time of the command and the error
+    @commands.Cog.listener()
+    async def on_command_error(self, ctx: commands.Context, error) -> None:
+        self.record_command(ctx, type(getattr(error, 'original', error)).__name__)
+
+    # record_command takes ctx commands.Context and status str
+    #  observes the time since on_command, commands that failed before being invoked are only counted
+    def record_command(self, ctx: commands.Context, status: str) -> None:
+        name = ctx.command.qualified_name if ctx.command is not None else "unknown"
+        started_at = getattr(ctx, 'started_at', None)
+        if started_at is None:
+            self.metrics.inc('modmail_command_rejected_total', command=name, status=status)
+        else:
+            self.metrics.observe('modmail_command_seconds', time.perf_counter() - started_at, command=name,
+                                 status=status)
+
+    # stats takes no arguments
+    #  sends the relay latency, REST, database and slowest command statistics
+    @commands.command()
+    @is_owner()
+    @commands.guild_only()
+    async def stats(self, ctx) -> None:
+        embed = common_embed("Stats", f"Gateway latency: {self.bot.latency * 1000:.0f}ms")
+
+        relay = ""
+        for path in ("bootstrap", "relay", "reply"):
+            histogram = self.metrics.histogram('modmail_relay_seconds', path=path)
+            if histogram is not None:
+                relay += f"{path}: {histogram.count} message(s), p50 <= {histogram.quantile(0.5):g}s, " \
+                         f"p99 <= {histogram.quantile(0.99):g}s\n"
+        embed.add_field(name="Relay latency", value=relay or "Nothing relayed yet", inline=False)
+
+        rest = [histogram for (name, _), histogram in self.metrics.histograms.items()
+                if name == 'modmail_rest_seconds']
+        rest_calls, rest_time = sum(h.count for h in rest), sum(h.sum for h in rest)
+        embed.add_field(name="Discord REST",
+                        value=f"{rest_calls} call(s), {rest_time:.1f}s total\n"
+                              f"429s: {self.metrics.total('modmail_rest_429_total'):g}, "
+                              f"exhausted buckets: {self.metrics.total('modmail_rest_bucket_exhausted_total'):g}",
+                        inline=False)
+
+        query_calls = sum(stat.calls for stat in self.db_conn.stats.values())
+        query_time = sum(stat.total for stat in self.db_conn.stats.values())
+        embed.add_field(name="Database",
+                        value=f"{query_calls} quer{'y' if query_calls == 1 else 'ies'}, {query_time:.1f}s total\n"
+                              f"Pool wait: {self.db_conn.waits.total:.1f}s, "
+                              f"in use {self.db_conn.in_use}/{self.db_conn.max_size}",
+                        inline=False)
+
+        commands_time = sorted(((labels, histogram) for (name, labels), histogram in self.metrics.histograms.items()
+                                if name == 'modmail_command_seconds'), key=lambda item: item[1].sum, reverse=True)
+        embed.add_field(name="Commands",
+                        value="\n".join(f"`{dict(labels)['command']}` ({dict(labels)['status']}) {histogram.count}x, "
+                                        f"avg {histogram.sum / histogram.count * 1000:.0f}ms"
+                                        for labels, histogram in commands_time[:10]) or "No commands run yet",
+                        inline=False)
+
+        await ctx.send(embed=embed)
+
+
+def setup(bot):
+    bot.add_cog(statsCog(bot))
@@ -4,9 +4,25 @@ import discord
 from discord.ext import commands
 import asyncpg
 import asyncio
+import functools
 import sys
 import os
 
+from utils.conversation_cache import ConversationCache
+from utils.conversation_repository import ConversationRepository
+from utils.message_archiver import MessageArchiver
+from utils.attachment_store import AttachmentStore
+from utils.user_resolver import UserResolver
+from utils.checks import AccessControl
+from utils.unmute_scheduler import UnmuteScheduler
+from utils.mute_cache import MuteCache
+from utils.message_map import MessageMap
+from utils.category_catalogue import CategoryCatalogue
+from utils.standard_reply_store import StandardReplyStore
+from utils.metrics import Metrics
+from utils.migrations import run_migrations
+from utils.queries import Queries, ModmailConnection, init_connection
+
 
 class Bot(commands.Bot):
     def __init__(self, database_conn, conf, event_loop):
@@ -14,6 +30,31 @@ class Bot(commands.Bot):
                          case_insensitive=True, intents=discord.Intents.default())
         self.db_conn = database_conn
         self.conf = conf
+        self.metrics = Metrics()
+        self.metrics.instrument_http(self.http)
+        self.conversations = ConversationCache()
+        self.access = AccessControl(conf)
+        self.categories = CategoryCatalogue()
+        self.standard_replies = StandardReplyStore()
+        self.unmutes = UnmuteScheduler()
+        self.mutes = MuteCache()
+        self.messages = MessageMap(max_size=conf.getint('message_cache', 'max_size', fallback=5000),
+                                   per_conversation=conf.getint('message_cache', 'per_conversation', fallback=50))
+        self.archiver = MessageArchiver(database_conn,
+                                        batch_size=conf.getint('archiver', 'batch_size', fallback=100),
+                                        flush_timeout=conf.getfloat('archiver', 'flush_timeout', fallback=5.0),
+                                        spill_path=conf.get('archiver', 'spill_path',
+                                                            fallback='archiver_spill.jsonl'),
+                                        dead_letter_path=conf.get('archiver', 'dead_letter_path',
+                                                                  fallback='archiver_dead_letter.jsonl'))
+        self.conversation_repo = ConversationRepository(database_conn, self.archiver)
+        self.attachments = AttachmentStore(root=conf.get('attachments', 'path', fallback='attachments'),
+                                           max_concurrent=conf.getint('attachments', 'max_concurrent_downloads',
+                                                                      fallback=4))
+        self.users = UserResolver(self,
+                                  ttl=conf.getfloat('user_cache', 'ttl', fallback=600.0),
+                                  max_size=conf.getint('user_cache', 'max_size', fallback=5000),
+                                  max_concurrent=conf.getint('user_cache', 'max_concurrent_fetches', fallback=5))
 
         for cog in os.listdir('./cogs'):
             if cog.endswith('.py') and not cog.startswith('_'):
@@ -37,6 +78,26 @@ class Bot(commands.Bot):
     async def on_ready():
         print('We have logged in!')
 
+    # Loads the in-memory caches before connecting to the gateway
+    #  so listeners never run against an empty cache
+    async def start(self, *args, **kwargs):
+        await self.conversations.load(self.db_conn)
+        await self.access.load(self.db_conn)
+        await self.categories.load(self.db_conn)
+        await self.standard_replies.load(self.db_conn)
+        await self.unmutes.load(self.db_conn)
+        await self.mutes.load(self.db_conn)
+        await super().start(*args, **kwargs)
+
+    # Relays the pending DM bursts, waits for attachment downloads and writes the archive queue before disconnecting
+    async def close(self):
+        message_handling = self.get_cog('messageHandlingTasks')
+        if message_handling is not None:
+            await message_handling.drain()
+        await self.attachments.close()
+        await self.archiver.close()
+        await super().close()
+
     def run(self):
         super().run(Config.conf.get('global', 'discord_id'))
 
@@ -47,11 +108,34 @@ class Database:
     @staticmethod
     async def initiate_database():
         try:
-            Database.db_conn = await asyncpg.create_pool(user=Config.conf.get('database_creds', 'username'),
-                                                         password=Config.conf.get('database_creds', 'password'),
-                                                         host=Config.conf.get('database_creds', 'host'),
-                                                         port=Config.conf.get('database_creds', 'port'),
-                                                         database=Config.conf.get('database_creds', 'database'))
+            creds = dict(user=Config.conf.get('database_creds', 'username'),
+                         password=Config.conf.get('database_creds', 'password'),
+                         host=Config.conf.get('database_creds', 'host'),
+                         port=Config.conf.get('database_creds', 'port'),
+                         database=Config.conf.get('database_creds', 'database'))
+
+            # migrations run before the pool exists, pooled connections prepare statements against the final schema
+            conn = await asyncpg.connect(**creds)
+            try:
+                await run_migrations(conn)
+            finally:
+                await conn.close()
+
+            conf = Config.conf
+            max_size = conf.getint('database_creds', 'pool_max_size', fallback=10)
+            create_pool = functools.partial(
+                asyncpg.create_pool, **creds, connection_class=ModmailConnection, init=init_connection,
+                min_size=min(conf.getint('database_creds', 'pool_min_size', fallback=10), max_size),
+                max_size=max_size,
+                statement_cache_size=conf.getint('database_creds', 'statement_cache_size', fallback=100),
+                command_timeout=conf.getfloat('database_creds', 'command_timeout', fallback=None),
+                max_queries=conf.getint('database_creds', 'max_queries', fallback=50000),
+                max_inactive_connection_lifetime=conf.getfloat('database_creds', 'max_inactive_connection_lifetime',
+                                                               fallback=300.0))
+
+            Database.db_conn = Queries(await create_pool(), create_pool, max_size=max_size,
+                                       acquire_timeout=conf.getfloat('database_creds', 'acquire_timeout',
+                                                                     fallback=None))
             return True
 
         except Exception as e:
@@ -0,0 +1,23 @@
+from discord.ext import tasks, commands
+
+
+class archiverTasks(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.archiver = bot.archiver
+        self.flush_archiver.change_interval(seconds=bot.conf.getfloat('archiver', 'flush_interval', fallback=2.0))
+        self.flush_archiver.start()
+
+    def cog_unload(self):
+        self.flush_archiver.cancel()
+
+    # Writes the queued archive rows to the database
+    #  Runs every flush_interval seconds, batches that fill up earlier are flushed by the archiver itself
+    #  Sends nothing on success, spills rows to disk on failure
+    @tasks.loop(seconds=2.0)
+    async def flush_archiver(self) -> None:
+        await self.archiver.flush()
+
+
+def setup(bot):
+    bot.add_cog(archiverTasks(bot))
@@ -0,0 +1,83 @@
+import asyncio
+import discord
+from discord.ext import tasks, commands
+
+
+class channelTeardownTasks(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.db_conn = bot.db_conn
+        self.batch_size = bot.conf.getint('teardown', 'batch_size', fallback=5)
+        self.delete_interval = bot.conf.getfloat('teardown', 'delete_interval', fallback=1.0)
+        self.max_attempts = bot.conf.getint('teardown', 'max_attempts', fallback=5)
+        self.teardown_channels.change_interval(seconds=bot.conf.getfloat('teardown', 'interval', fallback=5.0))
+        self.teardown_channels.start()
+
+    def cog_unload(self):
+        self.teardown_channels.cancel()
+
+    # teardown takes row (channel_id, reason, attempts) of modmail.channel_teardown
+    #  deletes the channel and its queue entry, only a channel discord reports as not found counts as deleted
+    #  channels missing from the cache, e.g. while their guild is unavailable, are fetched
+    #  failed deletes are retried with exponential backoff until max_attempts is reached
+    async def teardown(self, row) -> None:
+        try:
+            channel = self.bot.get_channel(row[0]) or await self.bot.fetch_channel(row[0])
+            await channel.delete(reason=row[1])
+        except discord.NotFound:
+            pass
+        except (discord.HTTPException, discord.InvalidData) as e:
+            if row[2] + 1 < self.max_attempts:
+                print(f"Failed to delete channel {row[0]}, retrying", e)
+                await self.db_conn.execute("teardown_retry", row[0], 30.0 * 2 ** row[2])
+                return
+            print(f"Giving up on deleting channel {row[0]}", e)
+
+        await self.db_conn.execute("teardown_done", row[0])
+
+    # reconcile takes no arguments
+    #  queues the channels in modmail categories that belong to a closed conversation but were never deleted,
+    #  e.g. because the bot stopped between closing and deleting
+    #  reports active conversations whose channel doesn't exist anymore
+    async def reconcile(self) -> None:
+        await self.bot.categories.ensure_loaded(self.db_conn)
+
+        channel_ids = list()
+        for category_id, _ in self.bot.categories.by_emote.values():
+            category = self.bot.get_channel(category_id)
+            if category is not None:
+                channel_ids.extend(channel.id for channel in category.text_channels)
+
+        orphans = await self.db_conn.fetch("teardown_orphans", channel_ids)
+        for row in orphans:
+            await self.db_conn.execute("teardown_enqueue", row[0], 0.0, "Orphaned thread")
+        if orphans:
+            print(f"Queued {len(orphans)} orphaned conversation channel(s) for deletion")
+
+        for channel_id, conv in self.bot.conversations.by_channel.items():
+            if self.bot.get_channel(channel_id) is None:
+                print(f"Conversation {conv[0]} is active but its channel {channel_id} doesn't exist")
+
+    # Deletes the channels queued by close, forward and reconcile
+    #  Runs every interval seconds, deletes at most batch_size channels per run, delete_interval seconds apart
+    #  so a burst of closes doesn't run into the rate limit
+    #  Sends nothing on success, retries failed deletes later
+    @tasks.loop(seconds=5.0)
+    async def teardown_channels(self) -> None:
+        for row in await self.db_conn.fetch("teardown_due", self.batch_size):
+            await self.teardown(row)
+            await asyncio.sleep(self.delete_interval)
+
+    # Waits for the bot to be ready and reconciles the channels before starting the loop
+    #  a failed reconcile is printed, the loop starts regardless
+    @teardown_channels.before_loop
+    async def before_teardown_channels(self) -> None:
+        await self.bot.wait_until_ready()
+        try:
+            await self.reconcile()
+        except Exception as e:
+            print("Failed to reconcile the conversation channels, starting the teardown loop anyway", e)
+
+
+def setup(bot):
+    bot.add_cog(channelTeardownTasks(bot))
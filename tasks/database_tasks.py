@@ -0,0 +1,36 @@
+from discord.ext import tasks, commands
+
+
+class databaseTasks(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.db_conn = bot.db_conn
+        self.timeout = bot.conf.getfloat('database_creds', 'health_check_timeout', fallback=5.0)
+        self.saturated = False
+        self.health_check.change_interval(seconds=bot.conf.getfloat('database_creds', 'health_check_interval',
+                                                                    fallback=30.0))
+        self.health_check.start()
+
+    def cog_unload(self):
+        self.health_check.cancel()
+
+    # Probes the database pool
+    #  Runs every health_check_interval seconds, recreates the pool when the probe fails
+    #  Prints when the pool is saturated so a backlog of waiting queries doesn't go unnoticed
+    @tasks.loop(seconds=30.0)
+    async def health_check(self) -> None:
+        saturated = self.db_conn.waiting > 0 and self.db_conn.in_use >= self.db_conn.max_size
+        if saturated and not self.saturated:
+            print(f"Database pool saturated, {self.db_conn.in_use} connection(s) in use "
+                  f"and {self.db_conn.waiting} waiting")
+        self.saturated = saturated
+
+        if saturated or await self.db_conn.ping(self.timeout):
+            return
+
+        if await self.db_conn.reconnect():
+            print("Recreated the database pool")
+
+
+def setup(bot):
+    bot.add_cog(databaseTasks(bot))
@@ -1,6 +1,10 @@
 from utils.category_selector import *
+from utils.rate_limiter import RateLimiter
+from utils.message_map import MessageLink
+from utils.burst import *
 from discord.ext import commands
 from utils.common_embed import *
+import time
 
 
 class messageHandlingTasks(commands.Cog):
@@ -10,6 +14,16 @@ class messageHandlingTasks(commands.Cog):
         self.yellow = 0xE8D90C
         self.green = 0x7CFC00
         self.red = 0xe50000
+        self.limiter = RateLimiter(rate=bot.conf.getfloat('dm_limits', 'rate', fallback=1.0),
+                                   burst=bot.conf.getint('dm_limits', 'burst', fallback=5))
+        self.coalesce_window = bot.conf.getfloat('dm_limits', 'coalesce_window', fallback=2.0)
+        self.max_pending = bot.conf.getint('dm_limits', 'max_pending', fallback=20)
+        self.teardown_delay = bot.conf.getfloat('teardown', 'close_delay', fallback=10.0)
+        self.pending = dict()
+        self.flush_tasks = dict()
+        self.draining = asyncio.Event()
+        self.windows = dict()
+        self.warned = set()
 
     # Listens for user private messages
     #  if not in a conversation creates conversation => asks for desired category with emotes
@@ -21,184 +35,304 @@ class messageHandlingTasks(commands.Cog):
             return
 
         if message.guild is not None:
-            active_channels = await self.db_conn.fetch("SELECT channel_id \
-                                                        FROM modmail.conversations \
-                                                        WHERE \
-                                                           active=true")
-
-            active_channel_list = [channel[0] for channel in active_channels]
-
-            if message.channel.id in active_channel_list:
-                conv_id = await self.db_conn.fetchrow("SELECT conversation_id \
-                                                       FROM modmail.conversations \
-                                                       WHERE \
-                                                           channel_id=$1 AND \
-                                                           active=true",
-                                                      message.channel.id)
-
-                try:
-                    await self.db_conn.execute("INSERT INTO modmail.all_messages_attachments \
-                                                (message_id, message, author_id, conversation_id, made_by_mod) \
-                                                VALUES ($1, $2, $3, $4, false)",
-                                               message.id, message.content, message.author.id, conv_id[0])
-
-                    if message.attachments:
-                        attachment_object = await message.attachments[0].read()
-                        await self.db_conn.execute("UPDATE modmail.all_messages_attachments \
-                                                    SET attachment=$1 \
-                                                    WHERE \
-                                                        message_id=$2", attachment_object, message.id)
-                except:
-                    return
+            conv = self.bot.conversations.get_by_channel(message.channel.id)
+
+            if conv is not None:
+                self.bot.archiver.add('archive_internal_insert', message.id, message.content, message.author.id,
+                                      conv[0], False)
+
+                self.bot.attachments.store_later(self.bot.archiver, message.id, message.attachments)
 
             return
 
-        check_muted = await self.db_conn.fetchrow("SELECT active \
-                                                   FROM modmail.muted \
-                                                   WHERE \
-                                                        user_id=$1 AND \
-                                                        active=true", message.author.id)
-        if check_muted:
+        if self.bot.mutes.is_muted(message.author.id):
             return
 
-        conv = await self.db_conn.fetchrow("SELECT conversation_id, channel_id \
-                                            FROM modmail.conversations \
-                                            WHERE \
-                                                user_id=$1 AND \
-                                                active=true",
-                                           message.author.id)
+        conv = self.bot.conversations.get_by_user(message.author.id)
         if not conv:
+            if self.limiter.take(message.author.id):
+                await self.warn_rate_limited(message)
+                return
+
             category, guild = await category_selector.start_embed(self.bot, message.channel, message.author) or (
                 None, None)
 
             if category is None:
                 return
 
-            channel = await guild.create_text_channel(f"{message.author.name}-{message.author.discriminator}",
-                                                      category=category)
-            await channel.edit(topic=f"{message.author.id}")
-
-            past_threads = await self.db_conn.fetch("SELECT * \
-                                                     FROM modmail.conversations \
-                                                     WHERE \
-                                                        user_id=$1 AND \
-                                                        active=false",
-                                                    message.author.id)
-            check = False
-            if int(guild.id) == int(self.bot.conf.get('global', 'main_server_id')):
-                check = True
-
-            if check:
-                try:
-                    user = guild.get_member(message.author.id)
-                    created_ago = datetime.datetime.now() - user.created_at
-                    joined_ago = datetime.datetime.now() - user.joined_at
-                    chnl_embed_msg = f"{user.mention} was created {created_ago.days} days ago, " \
-                                     f"joined {joined_ago.days} days ago"
-                except AttributeError:
-                    check = False
-
-            if not check:
-                user = message.author
-                created_ago = datetime.datetime.now() - user.created_at
-                chnl_embed_msg = f"{user.mention} was created {created_ago.days} days ago, "
-
-            chnl_embed_msg += f" with **{'no' if len(past_threads) == 0 else len(past_threads)}** past threads"
-
-            chnl_embed = common_embed(f"{message.author.id}", chnl_embed_msg, color=0x7289da)
-            chnl_embed.set_author(name=str(user), icon_url=user.avatar_url)
-
-            if check:
-                roles = " ".join([role.mention for role in user.roles if not role.is_default()])
+            await self.bootstrap_conversation(message, category, guild)
+
+        else:
+            await self.queue_message(message)
+
+    # timed takes timings dict, step str and coro coroutine
+    #  awaits the coroutine and records how long it took under step
+    #  returns the result of the coroutine
+    @staticmethod
+    async def timed(timings: typing.Dict[str, float], step: str, coro: typing.Awaitable) -> typing.Any:
+        start = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            timings[step] = time.perf_counter() - start
+
+    # bootstrap_conversation takes message discord.Message, category discord.CategoryChannel and guild discord.Guild
+    #  opens the conversation of the user's first message: creates the channel with its topic while counting the past
+    #  threads, then inserts the conversation while the header and the first message are sent to the thread and
+    #  the confirmation to the user
+    #  when a step fails the conversation is closed again and the channel queued for deletion, then the error is raised
+    #  prints the time every step took
+    async def bootstrap_conversation(self, message: discord.Message, category: discord.CategoryChannel,
+                                     guild: discord.Guild) -> None:
+        timings = dict()
+        start = time.perf_counter()
+
+        channel, past_threads = await asyncio.gather(
+            self.timed(timings, "channel", guild.create_text_channel(
+                f"{message.author.name}-{message.author.discriminator}", category=category,
+                topic=f"{message.author.id}")),
+            self.timed(timings, "past_threads", self.db_conn.fetchval("conversation_past_count", message.author.id)))
+
+        user = message.author
+        check = int(guild.id) == int(self.bot.conf.get('global', 'main_server_id'))
+        if check:
+            member = guild.get_member(message.author.id)
+            if member is not None and member.joined_at is not None:
+                user = member
             else:
-                roles = ""
-            chnl_embed.add_field(name="Roles", value=roles if roles else "No Roles")
-            await channel.send(embed=chnl_embed)
+                check = False
 
-            thread_embed = common_embed("", message.content, color=self.yellow)
-            thread_embed.set_author(name=message.author, icon_url=message.author.avatar_url)
+        created_ago = datetime.datetime.now() - user.created_at
+        chnl_embed_msg = f"{user.mention} was created {created_ago.days} days ago, "
+        if check:
+            joined_ago = datetime.datetime.now() - user.joined_at
+            chnl_embed_msg += f"joined {joined_ago.days} days ago"
+        chnl_embed_msg += f" with **{'no' if past_threads == 0 else past_threads}** past threads"
 
-            for attachment in message.attachments:
-                thread_embed.add_field(name=f"File upload ({len(message.attachments)})",
-                                       value=f"[{attachment.filename}]({attachment.url})")
+        chnl_embed = common_embed(f"{message.author.id}", chnl_embed_msg, color=0x7289da)
+        chnl_embed.set_author(name=str(user), icon_url=user.avatar_url)
 
-            thread_embed.set_footer(text=f"Message ID: {message.id}")
-            thread_msg = await channel.send(embed=thread_embed)
+        roles = " ".join([role.mention for role in user.roles if not role.is_default()]) if check else ""
+        chnl_embed.add_field(name="Roles", value=roles if roles else "No Roles")
 
-            await self.db_conn.execute("INSERT INTO modmail.conversations \
-                                        (creation_date, user_id, active, channel_id, category_id) \
-                                        VALUES (now(), $1, true, $2, $3)",
-                                       message.author.id, channel.id, category.id)
+        thread_embed = common_embed("", message.content, color=self.yellow)
+        thread_embed.set_author(name=message.author, icon_url=message.author.avatar_url)
 
-            conv_id = await self.db_conn.fetchrow("SELECT conversation_id \
-                                                   FROM modmail.conversations \
-                                                   WHERE \
-                                                        channel_id=$1", channel.id)
+        usr_embed = common_embed("Message sent",
+                                 f"> {message.content} \n\n *if this isn't correct you can change it with "
+                                 f"{self.bot.command_prefix}edit*",
+                                 color=self.green)
+        usr_embed.set_author(name=message.author, icon_url=message.author.avatar_url)
 
-            await self.db_conn.execute("INSERT INTO modmail.messages \
-                                        (message_id, message, author_id, conversation_id, other_side_message_id, \
-                                         made_by_mod) \
-                                        VALUES ($1, $2, $3, $4, $5, false)",
-                                       message.id, message.content, message.author.id, conv_id[0], thread_msg.id)
+        for embed in (thread_embed, usr_embed):
+            for attachment in message.attachments:
+                embed.add_field(name=f"File upload ({len(message.attachments)})",
+                                value=f"[{attachment.filename}]({attachment.url})")
+            embed.set_footer(text=f"Message ID: {message.id}")
 
-            await self.db_conn.execute("INSERT INTO modmail.all_messages_attachments \
-                                        (message_id, message, author_id, conversation_id, made_by_mod, internal) \
-                                        VALUES ($1, $2, $3, $4, false, true)",
-                                       message.id, message.content, message.author.id, conv_id[0])
+        # the header has to land before the first message, so those two are sent in order
+        async def send_thread() -> discord.Message:
+            await channel.send(embed=chnl_embed)
+            return await channel.send(embed=thread_embed)
+
+        results = await asyncio.gather(
+            self.timed(timings, "insert", self.bot.conversation_repo.open(message.author.id, channel.id,
+                                                                          category.id)),
+            self.timed(timings, "thread", send_thread()),
+            self.timed(timings, "confirmation", message.channel.send(embed=usr_embed)),
+            return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            await self.abort_bootstrap(channel, isinstance(results[0], BaseException))
+            raise errors[0]
+
+        conv_id, thread_msg, usr_msg = results
+        self.bot.conversations.add(conv_id, message.author.id, channel.id)
+        self.bot.metrics.observe('modmail_relay_seconds',
+                                 (datetime.datetime.utcnow() - message.created_at).total_seconds(), path="bootstrap")
+
+        self.bot.archiver.add('message_insert', message.id, message.content, message.author.id, conv_id,
+                              thread_msg.id, False)
+        self.bot.archiver.add('archive_relayed_insert', message.id, message.content, message.author.id, conv_id,
+                              False)
+        self.bot.attachments.store_later(self.bot.archiver, message.id, message.attachments)
+        self.bot.messages.add(MessageLink(message.id, thread_msg.id, conv_id, channel.id, message.channel.id,
+                                          message.author.id, message.author.id, False, message.content,
+                                          confirmation_id=usr_msg.id))
+
+        for step, seconds in timings.items():
+            self.bot.metrics.observe('modmail_bootstrap_seconds', seconds, step=step)
+        print(f"Opened conversation {conv_id} in {time.perf_counter() - start:.3f}s (" +
+              ", ".join(f"{step} {seconds:.3f}s" for step, seconds in timings.items()) + ")")
+
+    # abort_bootstrap takes channel discord.TextChannel and insert_failed bool
+    #  closes the conversation row of a failed bootstrap so the next DM opens a new one
+    #  the channel is queued for deletion, failures are printed
+    async def abort_bootstrap(self, channel: discord.TextChannel, insert_failed: bool) -> None:
+        try:
+            if insert_failed:
+                await self.db_conn.execute("teardown_enqueue", channel.id, self.teardown_delay, "Bootstrap failed")
+            else:
+                await self.bot.conversation_repo.close(channel.id, self.teardown_delay, "Bootstrap failed")
+        except Exception as e:
+            print(f"Failed to clean up the conversation of channel {channel.id}", e)
+
+    # queue_message takes message discord.Message
+    #  relays the message right away when the user has a token left and isn't inside a coalescing window
+    #  otherwise adds it to the user's pending burst, which is relayed as one embed once the window closes
+    async def queue_message(self, message: discord.Message) -> None:
+        user_id = message.author.id
+        pending = self.pending.get(user_id)
+        if pending is not None:
+            if len(pending) >= self.max_pending:
+                await self.warn_rate_limited(message)
+            else:
+                pending.append(message)
+            return
 
-            usr_embed = common_embed("Message sent",
-                                     f"> {message.content} \n\n *if this isn't correct you can change it with "
-                                     f"{self.bot.command_prefix}edit*",
-                                     color=self.green)
-            usr_embed.set_author(name=message.author, icon_url=message.author.avatar_url)
+        now = time.monotonic()
+        delay = self.windows.get(user_id, now) - now
+        if delay <= 0:
+            delay = self.limiter.take(user_id)
+            if not delay:
+                self.open_window(user_id, now)
+                await self.relay_messages(self.bot.conversations.get_by_user(user_id), [message])
+                return
 
-            for attachment in message.attachments:
-                usr_embed.add_field(name=f"File upload ({len(message.attachments)})",
-                                    value=f"[{attachment.filename}]({attachment.url})")
+        self.pending[user_id] = [message]
+        self.flush_tasks[user_id] = asyncio.ensure_future(self.flush_pending(user_id, delay))
+
+    # open_window takes user_id int and now float (time.monotonic())
+    #  starts the coalescing window of the user and forgets the windows that have closed
+    def open_window(self, user_id: int, now: float) -> None:
+        self.windows[user_id] = now + self.coalesce_window
+        self.warned.discard(user_id)
+        if len(self.windows) > self.limiter.max_users:
+            self.windows = {key: until for key, until in self.windows.items() if until > now}
+
+    # flush_pending takes user_id int and delay float (seconds)
+    #  waits for the window to close and for a token, then relays the pending burst
+    #  the wait is cut short when the bot shuts down
+    #  tells the user when the burst can't be delivered
+    async def flush_pending(self, user_id: int, delay: float) -> None:
+        try:
+            await self.wait_or_drain(delay)
+            while not self.draining.is_set():
+                delay = self.limiter.take(user_id)
+                if not delay:
+                    break
+                await self.wait_or_drain(delay)
+
+            messages = self.pending.pop(user_id)
+            self.open_window(user_id, time.monotonic())
+        finally:
+            self.flush_tasks.pop(user_id, None)
+
+        conv = self.bot.conversations.get_by_user(user_id)
+        if conv is None:
+            print(f"Undelivered {len(messages)} message(s) of {user_id}, the conversation was closed")
+            await self.notify_undelivered(messages, "Your conversation was closed before these messages were "
+                                                    "delivered, send them again to open a new conversation")
+            return
 
-            usr_embed.set_footer(text=f"Message ID: {message.id}")
-            await message.channel.send(embed=usr_embed)
+        try:
+            await self.relay_messages(conv, messages)
+        except Exception as e:
+            print(f"Failed to relay {len(messages)} message(s) of {user_id}", e)
+            await self.notify_undelivered(messages, "Something went wrong while delivering these messages, "
+                                                    "please send them again")
+
+    # wait_or_drain takes delay float (seconds)
+    #  sleeps for delay seconds or until drain is called
+    async def wait_or_drain(self, delay: float) -> None:
+        try:
+            await asyncio.wait_for(self.draining.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    # drain takes no arguments
+    #  relays every pending burst right away and waits for them, used when the bot shuts down
+    async def drain(self) -> None:
+        self.draining.set()
+        await asyncio.gather(*self.flush_tasks.values(), return_exceptions=True)
+
+    # notify_undelivered takes messages list of discord.Message and reason str
+    #  tells the user which messages weren't delivered and why
+    async def notify_undelivered(self, messages: typing.List[discord.Message], reason: str) -> None:
+        quoted = "\n".join(f"> {message.content}" for message in messages)
+        embed = common_embed("Messages not delivered", f"{reason}\n\n{quoted}"[:2048], color=self.red)
+        try:
+            await messages[0].channel.send(embed=embed)
+        except discord.HTTPException as e:
+            print(f"Failed to tell {messages[0].author.id} about undelivered messages", e)
+
+    # relay_messages takes conv tuple (conversation_id, channel_id) and messages list of discord.Message
+    #  sends the messages to the conversation and confirms them to the user, merged into as few embeds as fit
+    async def relay_messages(self, conv: typing.Tuple[int, int], messages: typing.List[discord.Message]) -> None:
+        channel = self.bot.get_channel(conv[1]) or await self.bot.fetch_channel(conv[1])
+        author = messages[0].author
+
+        batches = [[]]
+        for message in messages:
+            batch = batches[-1]
+            if batch and (sum(len(msg.content) + 1 for msg in batch) + len(message.content) > 1800 or
+                          sum(len(msg.attachments) for msg in batch) + len(message.attachments) > 20):
+                batches.append([message])
+            else:
+                batch.append(message)
 
-        else:
-            channel = await self.bot.fetch_channel(conv[1])
+        for batch in batches:
+            content = "\n".join(msg.content for msg in batch)
+            attachments = [attachment for msg in batch for attachment in msg.attachments]
+            footer = f"Message ID{'s' if len(batch) > 1 else ''}: {', '.join(str(msg.id) for msg in batch)}"
 
-            thread_embed = common_embed("", message.content, color=self.yellow)
-            thread_embed.set_author(name=message.author, icon_url=message.author.avatar_url)
+            thread_embed = common_embed("", content, color=self.yellow)
+            thread_embed.set_author(name=author, icon_url=author.avatar_url)
 
-            for attachment in message.attachments:
-                thread_embed.add_field(name=f"File upload ({len(message.attachments)})",
+            for attachment in attachments:
+                thread_embed.add_field(name=f"File upload ({len(attachments)})",
                                        value=f"[{attachment.filename}]({attachment.url})")
-            thread_embed.set_footer(text=f"Message ID: {message.id}")
+            thread_embed.set_footer(text=footer)
             thread_msg = await channel.send(embed=thread_embed)
 
             usr_embed = common_embed("Message sent",
-                                     f"> {message.content}\n\n *if this isn't correct you can change it with "
+                                     f"> {content}\n\n *if this isn't correct you can change it with "
                                      f"{self.bot.command_prefix}edit*",
                                      color=self.green)
-            usr_embed.set_author(name=message.author, icon_url=message.author.avatar_url)
-            for attachment in message.attachments:
-                usr_embed.add_field(name=f"File upload ({len(message.attachments)})",
+            usr_embed.set_author(name=author, icon_url=author.avatar_url)
+            for attachment in attachments:
+                usr_embed.add_field(name=f"File upload ({len(attachments)})",
                                     value=f"[{attachment.filename}]({attachment.url})")
-            usr_embed.set_footer(text=f"Message ID: {message.id}")
-            await message.channel.send(embed=usr_embed)
-
-            await self.db_conn.execute("INSERT INTO modmail.messages \
-                                        (message_id, message, author_id, conversation_id, other_side_message_id, \
-                                         made_by_mod) \
-                                        VALUES ($1, $2, $3, $4, $5, false)",
-                                       message.id, message.content, message.author.id, conv[0], thread_msg.id)
-
-            await self.db_conn.execute("INSERT INTO modmail.all_messages_attachments \
-                                        (message_id, message, author_id, conversation_id, made_by_mod, internal) \
-                                        VALUES ($1, $2, $3, $4, false, true)",
-                                       message.id, message.content, message.author.id, conv[0])
-
-        if message.attachments:
-            attachment_object = await message.attachments[0].read()
-            await self.db_conn.execute("UPDATE modmail.all_messages_attachments \
-                                        SET attachment=$1 \
-                                        WHERE \
-                                            message_id=$2", attachment_object, message.id)
+            usr_embed.set_footer(text=footer)
+            usr_msg = await batch[0].channel.send(embed=usr_embed)
+
+            links = list()
+            for msg in batch:
+                self.bot.metrics.observe('modmail_relay_seconds',
+                                         (datetime.datetime.utcnow() - msg.created_at).total_seconds(), path="relay")
+                self.bot.archiver.add('message_insert', msg.id, msg.content, msg.author.id, conv[0],
+                                      thread_msg.id, False)
+                self.bot.archiver.add('archive_relayed_insert', msg.id, msg.content, msg.author.id, conv[0],
+                                      False)
+                self.bot.attachments.store_later(self.bot.archiver, msg.id, msg.attachments)
+                links.append(MessageLink(msg.id, thread_msg.id, conv[0], conv[1], msg.channel.id, msg.author.id,
+                                         msg.author.id, False, msg.content, confirmation_id=usr_msg.id))
+            for link in links:
+                link.batch = links
+                self.bot.messages.add(link)
+
+    # warn_rate_limited takes message discord.Message
+    #  tells the user once per window that their messages are coming in too fast
+    async def warn_rate_limited(self, message: discord.Message) -> None:
+        self.bot.metrics.inc('modmail_dm_rate_limited_total')
+        if message.author.id in self.warned:
+            return
+
+        self.warned.add(message.author.id)
+        await message.channel.send(embed=common_embed("Slow down",
+                                                      "You are sending messages too fast, "
+                                                      "this message was not delivered. Please wait a moment.",
+                                                      color=self.red))
 
     # Listens for deleted messages
     #   If user deletes message => edits message in conversation to show it was deleted
@@ -207,47 +341,51 @@ class messageHandlingTasks(commands.Cog):
     @commands.Cog.listener(name="on_message_delete")
     async def dm_delete_listener(self, message: discord.Message) -> None:
         if message.guild is None:
-            conv = await self.db_conn.fetchrow("SELECT conversation_id, channel_id, message_id \
-                                                FROM modmail.conversations \
-                                                WHERE \
-                                                    user_id=$1 AND \
-                                                    active=true",
-                                               message.author.id)
+            conv = self.bot.conversations.get_by_user(message.author.id)
             if conv:
-                db_msg = await self.db_conn.fetchrow("SELECT other_side_message_id, message \
-                                                      FROM modmail.messages \
-                                                      WHERE \
-                                                        message_id=$1 AND \
-                                                        conversation_id=$2",
-                                                     message.id, conv[0])
-
-                thread_channel = await self.bot.fetch_channel(conv[1])
-                thread_msg = await thread_channel.fetch_message(db_msg[0])
+                link = self.bot.messages.get(message.id)
+                if link is not None:
+                    thread_msg_id, content, confirmation_id = link.other_side_id, link.content, link.confirmation_id
+                    link.deleted = True
+                else:
+                    await self.bot.archiver.flush()
+                    db_msg = await self.db_conn.fetchrow("message_other_side", message.id, conv[0])
+                    if not db_msg:
+                        return
+                    thread_msg_id, content, confirmation_id = db_msg[0], db_msg[1], None
+
+                # a burst shares the thread embed and confirmation, those are rebuilt around the deleted message
+                parts = await burst_parts(self.bot, link, conv[0], thread_msg_id)
+                if len(parts) > 1:
+                    parts = [(message_id, text, deleted or message_id == message.id)
+                             for message_id, text, deleted in parts]
+                    color = self.red if all(deleted for _, _, deleted in parts) else self.yellow
+                    await self.bot.http.edit_message(
+                        conv[1], thread_msg_id, embed=burst_thread_embed(message.author, parts, color).to_dict())
+                    if confirmation_id is not None:
+                        usr_embed = burst_confirmation_embed(message.author, parts, self.bot.command_prefix, color)
+                        await self.bot.http.edit_message(message.channel.id, confirmation_id,
+                                                         embed=usr_embed.to_dict())
+                    await self.bot.conversation_repo.set_message_deleted(message.id)
+                    return
 
-                thread_embed = common_embed("", db_msg[1], color=self.red)
+                thread_embed = common_embed("", content, color=self.red)
                 thread_embed.set_author(name=message.author, icon_url=message.author.avatar_url)
                 thread_embed.set_footer(text=f"Message ID: {message.id} (deleted)")
 
-                await thread_msg.edit(embed=thread_embed)
+                await self.bot.http.edit_message(conv[1], thread_msg_id, embed=thread_embed.to_dict())
 
-                usr_msg = await message.author.dm_channel.fetch_message(conv[2])
-                usr_embed = common_embed("Message deleted",
-                                         f"> {message.content}",
-                                         color=self.red)
+                if confirmation_id is not None:
+                    usr_embed = common_embed("Message deleted",
+                                             f"> {content}",
+                                             color=self.red)
 
-                usr_embed.set_author(name=message.author, icon_url=message.author.avatar_url)
-                usr_embed.set_footer(text=f"Message ID: {message.id}")
+                    usr_embed.set_author(name=message.author, icon_url=message.author.avatar_url)
+                    usr_embed.set_footer(text=f"Message ID: {message.id}")
 
-                await usr_msg.edit(embed=usr_embed)
-                await self.db_conn.execute("UPDATE modmail.messages \
-                                            SET deleted=true \
-                                            WHERE \
-                                                message_id=$1", message.id)
+                    await self.bot.http.edit_message(message.channel.id, confirmation_id, embed=usr_embed.to_dict())
 
-                await self.db_conn.execute("UPDATE modmail.all_messages_attachments \
-                                            SET deleted=true \
-                                            WHERE \
-                                                message_id=$1", message.id)
+                await self.bot.conversation_repo.set_message_deleted(message.id)
 
 
 def setup(bot):
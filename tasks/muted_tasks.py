@@ -1,5 +1,4 @@
-import datetime
-import pytz
+import asyncio
 from discord.ext import tasks, commands
 
 
@@ -8,25 +7,24 @@ class Muted_tasks(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db_conn = bot.db_conn
+        self.unmutes = bot.unmutes
         self.check_muted.start()
 
-    # Checks for users to unmute
-    #  Runs every 30 minutes
-    #  Sends nothing on success, raises error on failure
-    @tasks.loop(minutes=30.0)
+    def cog_unload(self):
+        self.check_muted.cancel()
+
+    # Unmutes users whose mute has run out
+    #  Sleeps until the earliest deadline of bot.unmutes, then expires every due mute in one statement
+    #  Sends nothing on success, retries after a few seconds on failure
+    @tasks.loop(seconds=0)
     async def check_muted(self) -> None:
-        muted = await self.db_conn.fetch("SELECT user_id, muted_until \
-                                          FROM modmail.muted \
-                                          WHERE \
-                                            active = true")
-        for row in muted:
-            now = datetime.datetime.now(pytz.utc)
-            if row[1] < now:
-                await self.db_conn.execute("UPDATE modmail.muted \
-                                            SET active = false \
-                                            WHERE \
-                                                user_id = $1",
-                                           int(row[0]))
+        await self.unmutes.wait()
+        try:
+            for user_id in await self.unmutes.expire(self.db_conn):
+                self.bot.mutes.remove(user_id)
+        except Exception as e:
+            print("Failed to expire mutes", e)
+            await asyncio.sleep(5)
 
     # Waits for the bot to be ready before starting the loop
     @check_muted.before_loop
@@ -1,7 +1,5 @@
-import json
 from discord.ext import tasks, commands
 from utils.common_embed import *
-import asyncio
 
 
 class verifyCategoriesTasks(commands.Cog):
@@ -10,62 +8,89 @@ class verifyCategoriesTasks(commands.Cog):
         self.db_conn = bot.db_conn
         self.conf = bot.conf
         self.chnl_id = int(bot.conf.get('global', 'modmail_commands_channel_id'))
+        self.verify_categories.change_interval(seconds=bot.conf.getfloat('categories', 'reconcile_interval',
+                                                                         fallback=3600.0))
         self.verify_categories.start()
 
-    # set_category_inactive takes row
-    #  sets category from row to inactive
+    def cog_unload(self):
+        self.verify_categories.cancel()
+
+    # set_category_inactive takes category_id int
+    #  sets the category to inactive
     #  returns bool
-    async def set_category_inactive(self, row) -> bool:
+    async def set_category_inactive(self, category_id: int) -> bool:
         try:
-            await self.db_conn.execute("UPDATE modmail.categories \
-                                        SET active=FALSE \
-                                        WHERE \
-                                           category_id=$1", row[0])
+            await self.db_conn.execute("category_set_inactive", category_id)
+            self.bot.access.invalidate()
+            self.bot.categories.invalidate()
             return True
 
-        except asyncio.exceptions:
+        except Exception as e:
+            print(f"Failed to set category {category_id} inactive", e)
             return False
 
-    # Checks for invalid categories.
-    #  Runs every 30 minutes.
+    # report_unsynced takes category_id int, category_name str and problem str
+    #  sets the category inactive and notifies the owners and admins in the modmail commands channel
+    async def report_unsynced(self, category_id: int, category_name: str, problem: str) -> None:
+        unsync_msg = f"Category ID: `{category_id}` is not correctly synced.\n\n **{problem}\n\n** "
+        if await self.set_category_inactive(category_id):
+            unsync_msg += f"I set category with category ID: {category_id} to inactive. Please fix this issue " \
+                          f"and set the category to active. "
+
+        chnl = self.bot.get_channel(self.chnl_id)
+        embed = common_embed("Categories not correctly synced!", unsync_msg)
+        embed.set_image(url="https://i.imgur.com/b8y71CJ.gif")
+        await chnl.send(embed=embed)
+        await chnl.send(" ".join([f"<@{owner}>" for owner in self.bot.access.owners]) +
+                        f" <@&{self.bot.access.admin_role_id}>")
+
+    # check_category takes category_id int, category_name str (from the database) and category discord.CategoryChannel
+    #  reports the category if it is gone or renamed
+    async def check_category(self, category_id: int, category_name: str, category) -> None:
+        if category is None:
+            await self.report_unsynced(category_id, category_name,
+                                       f"Category '{category_name}' does not exist or isn't accessible by the bot.")
+        elif category.name.lower() != category_name.lower():
+            await self.report_unsynced(category_id, category_name,
+                                       f"Category is named '{category_name}' in database but is actually called "
+                                       f"'{category.name}'")
+
+    # Listens for deleted channels
+    #  reports active modmail categories as soon as they are deleted
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel) -> None:
+        if isinstance(channel, discord.CategoryChannel):
+            await self.bot.categories.ensure_loaded(self.db_conn)
+            if channel.id in self.bot.categories.by_id:
+                await self.check_category(channel.id, self.bot.categories.by_id[channel.id][0], None)
+
+    # Listens for updated channels
+    #  reports active modmail categories as soon as they are renamed
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after) -> None:
+        if isinstance(after, discord.CategoryChannel) and before.name != after.name:
+            await self.bot.categories.ensure_loaded(self.db_conn)
+            if after.id in self.bot.categories.by_id:
+                await self.check_category(after.id, self.bot.categories.by_id[after.id][0], after)
+
+    # Checks for invalid categories missed by the events, e.g. while the bot was offline.
+    #  Runs every reconcile_interval seconds (hourly by default), only reads the gateway cache.
     #  Sends nothing on success, raises error on failure
-    @tasks.loop(minutes=2.0)
+    @tasks.loop(hours=1.0)
     async def verify_categories(self) -> None:
-        results = await self.db_conn.fetch("SELECT category_id, category_name, guild_id \
-                                            FROM modmail.categories \
-                                            WHERE \
-                                                active=true")
-
-        owners = [await self.bot.fetch_user(owner) for owner in json.loads(self.conf.get('global', 'owners'))]
-        for row in results:
-            guild = await self.bot.fetch_guild(row[2])
-            admin_role = guild.get_role(self.conf.get('global', 'admin_role_id'))
-            chnl = self.bot.get_channel(self.chnl_id)
-            category = self.bot.get_channel(row[0])
-            if category is None:
-                unsync_msg = f"Category ID: `{row[0]}` is not correctly synced.\n\n **Category '{row[1]}' does " \
-                             f"not exist or isn't accessible by the bot.\n\n** "
-                set_inactive = await self.set_category_inactive(row=row)
-                if set_inactive:
-                    unsync_msg += f"I set category with category ID: {row[0]} to inactive. Please fix this issue " \
-                                  f"and set the category to active. "
-
-            elif category.name.lower() != row[1].lower():
-                unsync_msg = f"Category ID: `{row[0]}` is not correctly synced.\n\n **Category is named '{row[1]}'" \
-                             f" in database but is actually called '{category.name}'\n\n** "
-
-                set_inactive = await self.set_category_inactive(row=row)
-
-                if set_inactive:
-                    unsync_msg += f"I set category with category ID: {row[0]} to inactive. Please fix this issue " \
-                                  f"and set the category to active. "
-            else:
+        await self.bot.categories.ensure_loaded(self.db_conn)
+
+        by_guild = dict()
+        for category_id, (category_name, guild_id) in self.bot.categories.by_id.items():
+            by_guild.setdefault(guild_id, list()).append((category_id, category_name))
+
+        for guild_id, categories in by_guild.items():
+            guild = self.bot.get_guild(guild_id)
+            if guild is None or guild.unavailable:
                 continue
 
-            embed = common_embed("Categories not correctly synced!", unsync_msg)
-            embed.set_image(url="https://i.imgur.com/b8y71CJ.gif")
-            await chnl.send(embed=embed)
-            await chnl.send(" ".join([owner.mention for owner in owners]) + admin_role.mention)
+            for category_id, category_name in categories:
+                await self.check_category(category_id, category_name, guild.get_channel(category_id))
 
     # Waits before bot is ready to start the loop
     @verify_categories.before_loop
@@ -0,0 +1,44 @@
+import datetime
+import re
+import typing
+
+
+# snowflake takes value str (an id or a mention)
+#  returns the id as int, raises ValueError when there is none
+def snowflake(value: str) -> int:
+    return int(re.sub(r"\D", "", value))
+
+
+# date takes value str formatted YYYY-MM-DD
+#  returns the naive UTC datetime of midnight that day, raises ValueError on another format
+def date(value: str) -> datetime.datetime:
+    return datetime.datetime.strptime(value, '%Y-%m-%d')
+
+
+# How every key:value filter of the archive commands is parsed
+FILTERS = {
+    'author': snowflake,
+    'user': snowflake,
+    'category': snowflake,
+    'after': date,
+    'before': date,
+    'format': str.lower,
+}
+
+
+# parse_filters takes query str and allowed iterable of str (keys of FILTERS)
+#  splits the key:value filters off the words of the query
+#  returns (words str, dict of filter => parsed value), raises ValueError on a malformed filter
+def parse_filters(query: str, allowed: typing.Iterable[str]) -> typing.Tuple[str, typing.Dict[str, typing.Any]]:
+    allowed = set(allowed)
+    words = list()
+    filters = dict()
+    for token in query.split():
+        key, _, value = token.partition(':')
+        key = key.lower()
+        if key in allowed and value:
+            filters[key] = FILTERS[key](value)
+        else:
+            words.append(token)
+
+    return " ".join(words), filters
@@ -0,0 +1,92 @@
+import asyncio
+import hashlib
+import os
+import typing
+import uuid
+
+import aiohttp
+import discord
+
+
+# AttachmentStore keeps uploaded files on the local filesystem, addressed by their sha256
+#  downloads are streamed in chunks straight to disk and hashed on the way, identical files are stored once.
+#  At most max_concurrent downloads run at the same time, the rest wait for a free slot.
+class AttachmentStore:
+    def __init__(self, root: str = 'attachments', max_concurrent: int = 4, chunk_size: int = 64 * 1024):
+        self.root = root
+        self.chunk_size = chunk_size
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.session: typing.Optional[aiohttp.ClientSession] = None
+        self.pending: typing.Set[asyncio.Future] = set()
+
+    # path takes sha256 str
+    #  returns the location of the stored file, fanned out over two directory levels
+    def path(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    # download takes url str
+    #  streams the file into the store
+    #  returns (sha256, size) on success, raises aiohttp.ClientError on failure
+    async def download(self, url: str) -> typing.Tuple[str, int]:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession()
+
+        tmp_dir = os.path.join(self.root, 'tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        tmp_path = os.path.join(tmp_dir, uuid.uuid4().hex)
+
+        digest, size = hashlib.sha256(), 0
+        try:
+            async with self.semaphore, self.session.get(url) as resp:
+                resp.raise_for_status()
+                with open(tmp_path, 'wb') as file:
+                    async for chunk in resp.content.iter_chunked(self.chunk_size):
+                        digest.update(chunk)
+                        file.write(chunk)
+                        size += len(chunk)
+
+            sha256 = digest.hexdigest()
+            path = self.path(sha256)
+            if os.path.exists(path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return sha256, size
+
+    # store takes archiver MessageArchiver, message_id int and attachments list of discord.Attachment
+    #  downloads every attachment of the message concurrently
+    #  queues one modmail.message_attachments row per stored file
+    async def store(self, archiver, message_id: int, attachments: typing.List[discord.Attachment]) -> None:
+        results = await asyncio.gather(*[self.download(attachment.url) for attachment in attachments],
+                                       return_exceptions=True)
+
+        for position, (attachment, result) in enumerate(zip(attachments, results)):
+            if isinstance(result, BaseException):
+                print(f"Failed to store attachment {attachment.url}", result)
+                continue
+
+            sha256, size = result
+            archiver.add('attachment_insert', message_id, position, sha256, attachment.filename, size, attachment.url)
+
+    # store_later takes archiver MessageArchiver, message_id int and attachments list of discord.Attachment
+    #  stores the attachments in the background so the relay doesn't wait on the download
+    #  the task is kept in pending until it finishes, close waits for it
+    def store_later(self, archiver, message_id: int, attachments: typing.List[discord.Attachment]) -> None:
+        if attachments:
+            task = asyncio.ensure_future(self.store(archiver, message_id, list(attachments)))
+            self.pending.add(task)
+            task.add_done_callback(self.pending.discard)
+
+    # close takes no arguments
+    #  waits for the background downloads, their rows are queued before the archiver closes
+    #  closes the download session
+    async def close(self) -> None:
+        await asyncio.gather(*self.pending, return_exceptions=True)
+        if self.session is not None:
+            await self.session.close()
@@ -0,0 +1,45 @@
+import typing
+
+from utils.common_embed import *
+from utils.message_map import MessageLink
+
+# (message_id, content, deleted) of one message of a burst
+Part = typing.Tuple[int, str, bool]
+
+
+# burst_parts takes bot commands.Bot, link MessageLink or None, conversation_id int and thread_msg_id int
+#  returns every user message relayed in the same thread embed, oldest first
+#  the cached burst is used when the link is known, otherwise the messages are read from the database
+async def burst_parts(bot, link: typing.Optional[MessageLink], conversation_id: int,
+                      thread_msg_id: int) -> typing.List[Part]:
+    if link is not None:
+        return [(sibling.message_id, sibling.content, sibling.deleted) for sibling in link.batch]
+
+    await bot.archiver.flush()
+    rows = await bot.db_conn.fetch("messages_by_other_side", thread_msg_id, conversation_id)
+    return [(row[0], row[1], row[2]) for row in rows]
+
+
+# burst_thread_embed takes author discord.User, parts list of Part and color int
+#  rebuilds the thread embed of a burst, deleted messages are struck through
+#  returns discord.Embed
+def burst_thread_embed(author: discord.User, parts: typing.List[Part], color: int) -> discord.Embed:
+    embed = common_embed("", "\n".join(f"~~{content}~~" if deleted else content for _, content, deleted in parts),
+                         color=color)
+    embed.set_author(name=author, icon_url=author.avatar_url)
+    embed.set_footer(text="Message IDs: " + ", ".join(f"{message_id}{' (deleted)' if deleted else ''}"
+                                                      for message_id, _, deleted in parts))
+    return embed
+
+
+# burst_confirmation_embed takes author discord.User, parts list of Part, prefix str and color int
+#  rebuilds the confirmation the user got for a burst, deleted messages are struck through
+#  returns discord.Embed
+def burst_confirmation_embed(author: discord.User, parts: typing.List[Part], prefix: str,
+                             color: int) -> discord.Embed:
+    content = "\n".join(f"~~{content}~~" if deleted else content for _, content, deleted in parts)
+    embed = common_embed("Message sent", f"> {content}\n\n *if this isn't correct you can change it with {prefix}edit*",
+                         color=color)
+    embed.set_author(name=author, icon_url=author.avatar_url)
+    embed.set_footer(text="Message IDs: " + ", ".join(str(message_id) for message_id, _, _ in parts))
+    return embed
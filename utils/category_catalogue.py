@@ -0,0 +1,57 @@
+import datetime
+import typing
+
+import discord
+
+from utils.common_embed import common_embed
+
+
+# CategoryCatalogue keeps the active categories the user can pick from in memory
+#  the selector embed is built once per load, emote => (category_id, guild_id) resolves the reaction
+#  and category_id => (category_name, guild_id) lets the category checks run without queries.
+#  Loaded lazily and invalidated by the code that changes categories.
+class CategoryCatalogue:
+    def __init__(self):
+        self.loaded = False
+        self.emotes: typing.List[str] = list()
+        self.by_emote: typing.Dict[str, typing.Tuple[int, int]] = dict()
+        self.by_id: typing.Dict[int, typing.Tuple[str, int]] = dict()
+        self.embed: typing.Dict = dict()
+
+    # load takes db_conn Queries
+    #  replaces the catalogue with the active categories from the database
+    async def load(self, db_conn) -> None:
+        rows = await db_conn.fetch("categories_selector")
+
+        embed = common_embed("Category Selector", "Please react with the corresponding emote for your desired category")
+        embed.add_field(name="Available categories: ",
+                        value="\n".join([f"{row[0].capitalize()} = {row[1]}" for row in rows]))
+
+        self.emotes = [row[1] for row in rows]
+        self.by_emote = {str(row[1]): (row[2], row[3]) for row in rows}
+        self.by_id = {row[2]: (row[0], row[3]) for row in rows}
+        self.embed = embed.to_dict()
+        self.loaded = True
+
+    # invalidate takes no arguments
+    #  drops the catalogue, the next selector reloads it
+    def invalidate(self) -> None:
+        self.loaded = False
+
+    # ensure_loaded takes db_conn Queries
+    #  loads the catalogue when it was invalidated
+    async def ensure_loaded(self, db_conn) -> None:
+        if not self.loaded:
+            await self.load(db_conn)
+
+    # selector_embed takes no arguments
+    #  returns a fresh copy of the selector embed
+    def selector_embed(self) -> discord.Embed:
+        embed = discord.Embed.from_dict(self.embed)
+        embed.timestamp = datetime.datetime.utcnow()
+        return embed
+
+    # resolve takes emoji str or discord.Emoji
+    #  returns (category_id, guild_id) of the active category with that emote or None
+    def resolve(self, emoji) -> typing.Optional[typing.Tuple[int, int]]:
+        return self.by_emote.get(str(emoji))
@@ -9,39 +9,25 @@ import typing
 class category_selector:
     # Run takes bot commands.Bot, channel discord.Text, user discord.User, delete_message bool default False
     #   Asks the user for the desired category and listens for reaction
-    #   on_reaction => check the database if the reaction is valid and sends error if not
+    #   the emotes are added in the background so the user can react before all of them are shown
+    #   on_reaction => resolves the reaction from bot.categories and sends error if it isn't valid
     #   returns discord.CategoryChannel and discord.Guild on success, None on failure
     @staticmethod
     async def start_embed(bot: commands.Bot, channel: discord.TextChannel, user: discord.User,
                           delete_message: bool = False) -> \
             typing.Optional[typing.Tuple[discord.CategoryChannel, discord.Guild]]:
 
-        try:
-            categories = await bot.db_conn.fetch("SELECT category_name, emote_id \
-                                                  FROM modmail.categories \
-                                                  WHERE \
-                                                    active=true")
-            embed = common_embed("Category Selector",
-                                 "Please react with the corresponding emote for your desired category")
-
-            embed.add_field(name="Available categories: ",
-                            value="\n".join([f"{row[0].capitalize()} = {row[1]}" for row in categories]))
-            msg = await channel.send(embed=embed)
-
-            for row in categories:
-                await msg.add_reaction(row[1])
+        await bot.categories.ensure_loaded(bot.db_conn)
+        msg = await channel.send(embed=bot.categories.selector_embed())
+        reactions = asyncio.ensure_future(category_selector.add_reactions(msg, bot.categories.emotes))
 
+        try:
             reaction, _ = await bot.wait_for("reaction_add",
                                              check=lambda react,
                                                           react_user: react.message.id == msg.id and react_user == user,
                                              timeout=120)
 
-            db_category = await bot.db_conn.fetchrow("SELECT category_id, guild_id \
-                                                      FROM modmail.categories \
-                                                      WHERE \
-                                                        emote_id=$1 AND \
-                                                        active=true",
-                                                     reaction.emoji)
+            db_category = bot.categories.resolve(reaction.emoji)
 
             if not db_category:
                 await msg.edit(embed=common_embed("Invalid Reaction",
@@ -62,3 +48,16 @@ class category_selector:
                 await msg.delete()
 
             return category, guild
+
+        finally:
+            reactions.cancel()
+
+    # add_reactions takes msg discord.Message and emotes list of str
+    #   adds the emotes in order, stops when the selector is answered
+    @staticmethod
+    async def add_reactions(msg: discord.Message, emotes: typing.List[str]) -> None:
+        for emote in emotes:
+            try:
+                await msg.add_reaction(emote)
+            except discord.HTTPException as e:
+                print(f"Failed to add reaction {emote}", e)
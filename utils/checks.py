@@ -1,5 +1,6 @@
 import configparser
 import json
+import typing
 from discord.ext import commands
 
 
@@ -15,32 +16,60 @@ def exc(func):
     return wrapper
 
 
+# AccessControl holds everything the permission checks need in memory
+#  the config values are parsed once, reload_config re-parses them after conf.ini changed
+#  category_roles maps category_id => frozenset of role ids with access, it is loaded lazily
+#  and invalidated by the cogs that change categories or permissions
+class AccessControl:
+    def __init__(self, conf: configparser.ConfigParser):
+        self.category_roles: typing.Optional[typing.Dict[int, typing.FrozenSet[int]]] = None
+        self.reload_config(conf)
+
+    # reload_config takes conf configparser.ConfigParser
+    #  parses the owners, admin role and commands channel
+    def reload_config(self, conf: configparser.ConfigParser) -> None:
+        self.owners = frozenset(json.loads(conf.get('global', 'owners')))
+        self.admin_role_id = int(conf.get('global', 'admin_role_id'))
+        self.commands_channel_id = int(conf.get('global', 'modmail_commands_channel_id'))
+
+    # load takes db_conn asyncpg.pool.Pool
+    #  builds the category_id => role ids map from the active categories and permissions
+    async def load(self, db_conn) -> None:
+        result = await db_conn.fetch("access_category_roles")
+        category_roles = dict()
+        for row in result:
+            category_roles.setdefault(row[0], set()).add(row[1])
+
+        self.category_roles = {category_id: frozenset(roles) for category_id, roles in category_roles.items()}
+
+    # invalidate takes no arguments
+    #  drops the category map, the next check reloads it
+    def invalidate(self) -> None:
+        self.category_roles = None
+
+    # roles_for takes db_conn asyncpg.pool.Pool and category_id int
+    #  returns the role ids that have access to the category
+    async def roles_for(self, db_conn, category_id: int) -> typing.FrozenSet[int]:
+        if self.category_roles is None:
+            await self.load(db_conn)
+        return self.category_roles.get(category_id, frozenset())
+
+
 # owner_check takes context
 #  checks if user in context is an owner
 #  returns boolean
 @exc
 async def owner_check(ctx) -> bool:
-    config = configparser.ConfigParser()
-    config.read('./conf.ini')
-
-    return ctx.author.id in json.loads(config.get('global', 'owners'))
+    return ctx.author.id in ctx.bot.access.owners
 
 
-# access_check takes context and db_conn asyncpg.pool.Pool
+# access_check takes context
 #  checks if user has roles that have access to category
 #  returns boolean
 @exc
 async def access_check(ctx) -> bool:
-    result = await ctx.bot.db_conn.fetch("SELECT permissions.role_id \
-                                          FROM modmail.categories \
-                                          JOIN modmail.permissions ON permissions.category_id=categories.category_id \
-                                          WHERE \
-                                             categories.category_id=$1 AND \
-                                             permissions.active=TRUE AND \
-                                             categories.active=TRUE;", ctx.channel.category.id)
-    if result:
-        return len(set([row['role_id'] for row in result]) & set([role.id for role in ctx.author.roles])) > 0
-    return False
+    roles = await ctx.bot.access.roles_for(ctx.bot.db_conn, ctx.channel.category.id)
+    return not roles.isdisjoint(role.id for role in ctx.author.roles)
 
 
 # admin_check takes context
@@ -48,10 +77,7 @@ async def access_check(ctx) -> bool:
 #  returns boolean
 @exc
 async def admin_check(ctx) -> bool:
-    config = configparser.ConfigParser()
-    config.read('./conf.ini')
-
-    return int(config.get('global', 'admin_role_id')) in [role.id for role in ctx.author.roles]
+    return any(role.id == ctx.bot.access.admin_role_id for role in ctx.author.roles)
 
 
 # bot_commands_ch_check takes context
@@ -59,10 +85,7 @@ async def admin_check(ctx) -> bool:
 #  returns boolean
 @exc
 async def bot_commands_ch_check(ctx) -> bool:
-    config = configparser.ConfigParser()
-    config.read('./conf.ini')
-
-    return int(ctx.channel.id) == int(config.get('global', 'modmail_commands_channel_id'))
+    return ctx.channel.id == ctx.bot.access.commands_channel_id
 
 
 def is_owner():
@@ -0,0 +1,55 @@
+import typing
+
+
+# ConversationCache keeps every active modmail conversation in memory
+#  channel_id => (conversation_id, user_id) and user_id => (conversation_id, channel_id)
+#  loaded once at startup and kept current by the code paths that open, forward and close conversations
+class ConversationCache:
+    def __init__(self):
+        self.by_channel: typing.Dict[int, typing.Tuple[int, int]] = dict()
+        self.by_user: typing.Dict[int, typing.Tuple[int, int]] = dict()
+
+    # load takes db_conn asyncpg.pool.Pool
+    #  replaces the cache with the active conversations from the database
+    #  returns nothing
+    async def load(self, db_conn) -> None:
+        rows = await db_conn.fetch("conversations_active")
+
+        by_channel, by_user = dict(), dict()
+        for row in rows:
+            by_channel[row[2]] = (row[0], row[1])
+            by_user[row[1]] = (row[0], row[2])
+
+        self.by_channel, self.by_user = by_channel, by_user
+
+    # add takes conversation_id int, user_id int and channel_id int
+    #  registers a newly opened conversation
+    def add(self, conversation_id: int, user_id: int, channel_id: int) -> None:
+        self.by_channel[channel_id] = (conversation_id, user_id)
+        self.by_user[user_id] = (conversation_id, channel_id)
+
+    # remove takes channel_id int
+    #  forgets the conversation living in that channel
+    #  returns (conversation_id, user_id) or None if it wasn't cached
+    def remove(self, channel_id: int) -> typing.Optional[typing.Tuple[int, int]]:
+        conv = self.by_channel.pop(channel_id, None)
+        if conv is not None and self.by_user.get(conv[1], (None, None))[1] == channel_id:
+            del self.by_user[conv[1]]
+        return conv
+
+    # move takes old_channel_id int and new_channel_id int
+    #  points a forwarded conversation to its new channel
+    def move(self, old_channel_id: int, new_channel_id: int) -> None:
+        conv = self.remove(old_channel_id)
+        if conv is not None:
+            self.add(conv[0], conv[1], new_channel_id)
+
+    # get_by_channel takes channel_id int
+    #  returns (conversation_id, user_id) of the active conversation or None
+    def get_by_channel(self, channel_id: int) -> typing.Optional[typing.Tuple[int, int]]:
+        return self.by_channel.get(channel_id)
+
+    # get_by_user takes user_id int
+    #  returns (conversation_id, channel_id) of the active conversation or None
+    def get_by_user(self, user_id: int) -> typing.Optional[typing.Tuple[int, int]]:
+        return self.by_user.get(user_id)
@@ -0,0 +1,59 @@
+import typing
+
+from utils import transcript
+
+
+# ConversationRepository groups the writes of every conversation operation
+#  each operation runs in one transaction on one pooled connection, ids come back through RETURNING,
+#  so a failure never leaves a conversation half closed or half forwarded.
+#  Queued archive rows are flushed first, the operations below may update them.
+class ConversationRepository:
+    def __init__(self, db_conn, archiver):
+        self.db_conn = db_conn
+        self.archiver = archiver
+
+    # open takes user_id int, channel_id int and category_id int
+    #  returns the conversation_id of the new conversation
+    async def open(self, user_id: int, channel_id: int, category_id: int) -> int:
+        return await self.db_conn.fetchval("conversation_insert", user_id, channel_id, category_id)
+
+    # close takes channel_id int, delay float (seconds) and reason str
+    #  closes the active conversation of the channel, stores its transcript and queues the channel for deletion
+    #  returns (conversation_id, user_id) or None when the channel has no active conversation
+    async def close(self, channel_id: int, delay: float, reason: str) -> typing.Optional[typing.Tuple[int, int]]:
+        await self.archiver.flush()
+        async with self.db_conn.transaction() as conn:
+            conv = await conn.fetchrow("conversation_close", channel_id)
+            if conv is None:
+                return None
+
+            messages = await conn.fetch("transcript_messages", conv[0])
+            await conn.execute("conversation_set_transcript", transcript.encode(messages), conv[0])
+            await conn.execute("teardown_enqueue", channel_id, delay, reason)
+        return conv[0], conv[1]
+
+    # forward takes conversation_id int, old_channel_id int, new_channel_id int, old_ids and new_ids list of int,
+    #  delay float (seconds) and reason str
+    #  points the archived messages at their copies in the new channel, moves the conversation there
+    #  and queues the old channel for deletion
+    async def forward(self, conversation_id: int, old_channel_id: int, new_channel_id: int,
+                      old_ids: typing.List[int], new_ids: typing.List[int], delay: float, reason: str) -> None:
+        await self.archiver.flush()
+        async with self.db_conn.transaction() as conn:
+            await conn.execute("archive_remap_ids", old_ids, new_ids, conversation_id)
+            await conn.execute("message_remap_ids", old_ids, new_ids, conversation_id)
+            await conn.execute("attachment_remap_ids", old_ids, new_ids)
+            await conn.execute("conversation_set_channel", new_channel_id, conversation_id)
+            await conn.execute("teardown_enqueue", old_channel_id, delay, reason)
+
+    # set_message_text takes message_id int and text str
+    #  updates the relayed message and its archive row with one statement
+    async def set_message_text(self, message_id: int, text: str) -> None:
+        await self.archiver.flush()
+        await self.db_conn.execute("message_set_text", text, message_id)
+
+    # set_message_deleted takes message_id int
+    #  marks the relayed message and its archive row deleted with one statement
+    async def set_message_deleted(self, message_id: int) -> None:
+        await self.archiver.flush()
+        await self.db_conn.execute("message_set_deleted", message_id)
@@ -0,0 +1,97 @@
+import asyncio
+import collections
+import typing
+
+import discord
+from discord.ext import commands
+
+
+# LazyEmbedPaginator shows one embed at a time and lets the author flip through them with reactions
+#  pages are built by get_page(index) only when they are shown, at most cache_size rendered pages are kept
+#  page_count None means the total isn't known (keyset pagination), get_page returns None past the last page then
+#  stops listening after timeout seconds without a reaction
+class LazyEmbedPaginator:
+    first, previous, next, last, stop = '⏮', '◀', '▶', '⏭', '⏹'
+
+    def __init__(self, ctx: commands.Context, page_count: typing.Optional[int],
+                 get_page: typing.Callable[[int], typing.Awaitable[typing.Optional[discord.Embed]]],
+                 cache_size: int = 5, timeout: float = 100.0):
+        self.ctx = ctx
+        self.page_count = page_count
+        self.get_page = get_page
+        self.cache_size = cache_size
+        self.timeout = timeout
+        self.cache: typing.OrderedDict[int, discord.Embed] = collections.OrderedDict()
+        self.index = 0
+
+    # page takes index int
+    #  returns the rendered page, from the cache when it was shown recently, None past the last page
+    async def page(self, index: int) -> typing.Optional[discord.Embed]:
+        if index in self.cache:
+            self.cache.move_to_end(index)
+            return self.cache[index]
+
+        embed = await self.get_page(index)
+        if embed is None:
+            return None
+        embed.set_footer(text=f"Page {index + 1}/{self.page_count}" if self.page_count else f"Page {index + 1}")
+        self.cache[index] = embed
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return embed
+
+    # run takes no arguments
+    #  sends the first page and handles the reactions until stopped or timed out
+    async def run(self) -> None:
+        if self.page_count == 0:
+            return
+
+        embed = await self.page(0)
+        if embed is None:
+            return
+
+        msg = await self.ctx.send(embed=embed)
+        if self.page_count == 1:
+            return
+
+        buttons = (self.first, self.previous, self.next, self.last, self.stop)
+        for emoji in buttons if self.page_count else buttons[:3] + buttons[4:]:
+            await msg.add_reaction(emoji)
+
+        def check(react, user):
+            return react.message.id == msg.id and user == self.ctx.author
+
+        while True:
+            try:
+                reaction, user = await self.ctx.bot.wait_for('reaction_add', check=check, timeout=self.timeout)
+            except asyncio.TimeoutError:
+                break
+
+            emoji = str(reaction.emoji)
+            if emoji == self.stop:
+                break
+            elif emoji == self.first:
+                self.index = 0
+            elif emoji == self.previous:
+                self.index = max(self.index - 1, 0)
+            elif emoji == self.next:
+                self.index = self.index + 1 if self.page_count is None else min(self.index + 1, self.page_count - 1)
+            elif emoji == self.last and self.page_count:
+                self.index = self.page_count - 1
+
+            try:
+                await msg.remove_reaction(reaction.emoji, user)
+            except discord.Forbidden:
+                pass
+
+            embed = await self.page(self.index)
+            if embed is None:
+                self.index -= 1
+                continue
+            await msg.edit(embed=embed)
+
+        self.cache.clear()
+        try:
+            await msg.clear_reactions()
+        except discord.Forbidden:
+            pass
@@ -0,0 +1,167 @@
+import asyncio
+import json
+import os
+import typing
+
+import asyncpg
+
+# Statements of utils.queries the archiver batches.
+#  Flushes run them in this order, one executemany per statement.
+STATEMENTS = ('message_insert', 'archive_internal_insert', 'archive_relayed_insert', 'attachment_insert')
+
+
+# Errors that leave the rows intact, the batch is spilled and retried later
+#  anything else is blamed on the rows and the batch is retried row by row.
+TRANSIENT_ERRORS = (asyncio.TimeoutError, OSError, asyncpg.PostgresConnectionError, asyncpg.InterfaceError)
+
+
+# MessageArchiver is a write-behind queue for the message archive tables
+#  the relay path only appends rows, they are written with executemany once batch_size rows are
+#  queued or when the archiver tasks loop ticks, whichever comes first.
+#  If Postgres is unreachable or doesn't answer within flush_timeout the batch is appended to spill_path
+#  and replayed before the next successful flush, so no row is lost while the database is slow.
+#  The inserts ignore rows that already exist, so replaying a batch that did commit is harmless.
+#  Rows the database keeps rejecting and spill lines that can't be parsed go to dead_letter_path.
+class MessageArchiver:
+    def __init__(self, db_conn, batch_size: int = 100, flush_timeout: float = 5.0,
+                 spill_path: str = 'archiver_spill.jsonl', dead_letter_path: str = 'archiver_dead_letter.jsonl'):
+        self.db_conn = db_conn
+        self.batch_size = batch_size
+        self.flush_timeout = flush_timeout
+        self.spill_path = spill_path
+        self.dead_letter_path = dead_letter_path
+        self.pending: typing.List[typing.Tuple[str, tuple]] = list()
+        self.lock = asyncio.Lock()
+        self.flush_task: typing.Optional[asyncio.Task] = None
+
+    # add takes statement str (one of STATEMENTS) and the statement arguments
+    #  queues the row and schedules a flush once the batch is full
+    def add(self, statement: str, *args) -> None:
+        if statement not in STATEMENTS:
+            raise KeyError(f"Unknown archiver statement {statement}")
+
+        self.pending.append((statement, args))
+        if len(self.pending) >= self.batch_size and (self.flush_task is None or self.flush_task.done()):
+            self.flush_task = asyncio.ensure_future(self.flush())
+
+    # flush takes no arguments
+    #  writes the spilled rows and everything queued so far in one transaction
+    #  spills the queued rows to disk when the database is unreachable, retries row by row when it rejects the batch
+    #  returns True when the database is up to date
+    async def flush(self) -> bool:
+        async with self.lock:
+            rows, self.pending = self.pending, list()
+            try:
+                spilled = self.read_spill()
+                if not rows and not spilled:
+                    return True
+
+                try:
+                    await asyncio.wait_for(self.write(spilled + rows), timeout=self.flush_timeout)
+                except TRANSIENT_ERRORS as e:
+                    print(f"Archiver failed to write {len(rows)} row(s), spilling to {self.spill_path}", e)
+                    self.spill(rows)
+                    return False
+                except Exception as e:
+                    print(f"Archiver batch of {len(spilled) + len(rows)} row(s) was rejected, "
+                          f"writing them one by one", e)
+                    return await self.write_each(spilled + rows)
+
+                if spilled:
+                    os.remove(self.spill_path)
+                return True
+
+            except Exception as e:
+                print(f"Archiver failed to flush, keeping {len(rows)} row(s) queued", e)
+                self.pending[:0] = rows
+                return False
+
+    # write takes rows list
+    #  groups the rows per statement and runs them with executemany in one transaction
+    async def write(self, rows: typing.List[typing.Tuple[str, tuple]]) -> None:
+        grouped = {statement: list() for statement in STATEMENTS}
+        for statement, args in rows:
+            grouped[statement].append(args)
+
+        async with self.db_conn.transaction() as conn:
+            for statement, args in grouped.items():
+                if args:
+                    await conn.executemany(statement, args)
+
+    # write_each takes rows list (the spilled rows included)
+    #  writes the rows one at a time, rows the database rejects go to the dead letter file
+    #  and the rows left once the database becomes unreachable replace the spill file
+    #  returns True when every row was written or dead lettered
+    async def write_each(self, rows: typing.List[typing.Tuple[str, tuple]]) -> bool:
+        rejected, left = list(), list()
+        for index, row in enumerate(rows):
+            try:
+                await asyncio.wait_for(self.write([row]), timeout=self.flush_timeout)
+            except TRANSIENT_ERRORS as e:
+                print(f"Archiver lost the database, spilling {len(rows) - index} row(s)", e)
+                left = rows[index:]
+                break
+            except Exception as e:
+                print(f"Archiver rejected {row[0]} row {row[1][0]}, moving it to {self.dead_letter_path}", e)
+                rejected.append(row)
+
+        self.write_lines(self.dead_letter_path, 'a', rejected)
+        self.write_lines(self.spill_path + ".tmp", 'w', left)
+        os.replace(self.spill_path + ".tmp", self.spill_path)
+        if not left:
+            os.remove(self.spill_path)
+        return not left
+
+    # spill takes rows list
+    #  appends the rows to the spill file and syncs it to disk
+    def spill(self, rows: typing.List[typing.Tuple[str, tuple]]) -> None:
+        self.write_lines(self.spill_path, 'a', rows)
+
+    # write_lines takes path str, mode str and rows list
+    #  writes one JSON line per row and syncs the file to disk
+    @staticmethod
+    def write_lines(path: str, mode: str, rows: typing.List[typing.Tuple[str, tuple]]) -> None:
+        if not rows and mode == 'a':
+            return
+
+        with open(path, mode, encoding='utf-8') as file:
+            for statement, args in rows:
+                file.write(json.dumps({'statement': statement, 'args': list(args)}) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    # read_spill takes no arguments
+    #  returns the rows that previously failed to be written
+    #  lines that don't parse, e.g. torn by a crash during an append, are moved to the dead letter file
+    def read_spill(self) -> typing.List[typing.Tuple[str, tuple]]:
+        if not os.path.exists(self.spill_path):
+            return list()
+
+        rows, broken = list(), list()
+        with open(self.spill_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                    if row['statement'] in STATEMENTS:
+                        rows.append((row['statement'], tuple(row['args'])))
+                except (ValueError, KeyError, TypeError):
+                    broken.append(line if line.endswith("\n") else line + "\n")
+
+        if broken:
+            print(f"Archiver moved {len(broken)} unreadable spill line(s) to {self.dead_letter_path}")
+            with open(self.dead_letter_path, 'a', encoding='utf-8') as file:
+                file.writelines(broken)
+                file.flush()
+                os.fsync(file.fileno())
+            self.write_lines(self.spill_path + ".tmp", 'w', rows)
+            os.replace(self.spill_path + ".tmp", self.spill_path)
+        return rows
+
+    # close takes no arguments
+    #  flushes whatever is left, spilling it if the database is unreachable
+    async def close(self) -> None:
+        if self.flush_task is not None and not self.flush_task.done():
+            await self.flush_task
+        await self.flush()
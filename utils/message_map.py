@@ -0,0 +1,86 @@
+import collections
+import typing
+
+import discord
+
+
+# MessageLink ties a relayed message to its copy on the other side
+#  mod messages: message_id is the thread message, other_side_id the copy in the user's DM channel
+#  user messages: message_id is the user's DM, other_side_id the thread copy and confirmation_id the bot's confirmation
+#  batch holds every link relayed in the same thread embed, bursts of user messages share one
+class MessageLink:
+    __slots__ = ('message_id', 'other_side_id', 'conversation_id', 'channel_id', 'dm_channel_id', 'user_id',
+                 'author_id', 'made_by_mod', 'content', 'thread_embed', 'dm_embed', 'confirmation_id', 'deleted',
+                 'batch')
+
+    def __init__(self, message_id: int, other_side_id: int, conversation_id: int, channel_id: int,
+                 dm_channel_id: int, user_id: int, author_id: int, made_by_mod: bool, content: str,
+                 thread_embed: typing.Optional[discord.Embed] = None, dm_embed: typing.Optional[discord.Embed] = None,
+                 confirmation_id: typing.Optional[int] = None):
+        self.message_id = message_id
+        self.other_side_id = other_side_id
+        self.conversation_id = conversation_id
+        self.channel_id = channel_id
+        self.dm_channel_id = dm_channel_id
+        self.user_id = user_id
+        self.author_id = author_id
+        self.made_by_mod = made_by_mod
+        self.content = content
+        self.thread_embed = thread_embed
+        self.dm_embed = dm_embed
+        self.confirmation_id = confirmation_id
+        self.deleted = False
+        self.batch: typing.List[MessageLink] = [self]
+
+
+# MessageMap remembers the messages relayed since startup so edit and delete can skip the database and REST lookups
+#  at most max_size links are kept overall (least recently used first out) and per_conversation per conversation.
+#  A miss only means the message is older than the cache, callers fall back to the database then.
+class MessageMap:
+    def __init__(self, max_size: int = 5000, per_conversation: int = 50):
+        self.max_size = max_size
+        self.per_conversation = per_conversation
+        self.links: typing.OrderedDict[int, MessageLink] = collections.OrderedDict()
+        self.recent: typing.Dict[int, typing.Deque[int]] = dict()
+
+    # add takes link MessageLink
+    #  remembers a freshly relayed message
+    def add(self, link: MessageLink) -> None:
+        self.links[link.message_id] = link
+        self.links.move_to_end(link.message_id)
+        while len(self.links) > self.max_size:
+            self.links.popitem(last=False)
+
+        recent = self.recent.get(link.conversation_id)
+        if recent is None:
+            recent = self.recent[link.conversation_id] = collections.deque(maxlen=self.per_conversation)
+        recent.append(link.message_id)
+
+    # get takes message_id int
+    #  returns the link of the message or None when it isn't cached
+    def get(self, message_id: int) -> typing.Optional[MessageLink]:
+        link = self.links.get(message_id)
+        if link is not None:
+            self.links.move_to_end(message_id)
+        return link
+
+    # last takes conversation_id int, made_by_mod bool and optional author_id int
+    #  returns the most recent message of that side (and author) that isn't deleted
+    #  returns None when none is cached or a newer message was evicted, the answer isn't known then
+    def last(self, conversation_id: int, made_by_mod: bool,
+             author_id: typing.Optional[int] = None) -> typing.Optional[MessageLink]:
+        for message_id in reversed(self.recent.get(conversation_id, ())):
+            link = self.links.get(message_id)
+            if link is None:
+                return None
+            if link.deleted or link.made_by_mod != made_by_mod:
+                continue
+            if author_id is None or link.author_id == author_id:
+                return self.get(message_id)
+        return None
+
+    # forget_conversation takes conversation_id int
+    #  drops every link of a conversation that was closed or forwarded
+    def forget_conversation(self, conversation_id: int) -> None:
+        for message_id in self.recent.pop(conversation_id, ()):
+            self.links.pop(message_id, None)
@@ -0,0 +1,137 @@
+import bisect
+import time
+import typing
+
+import discord
+
+# Upper bounds (seconds) of the histogram buckets, +Inf is implied
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Key = typing.Tuple[str, typing.Tuple[typing.Tuple[str, str], ...]]
+
+
+# Histogram counts observations per bucket, the buckets aren't cumulative until rendered
+class Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    # observe takes value float (seconds)
+    #  records one observation
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    # quantile takes q float between 0 and 1
+    #  returns the upper bound of the bucket the quantile falls in, inf when it's past the last bucket
+    def quantile(self, q: float) -> float:
+        rank, seen = q * self.count, 0
+        for bound, count in zip(BUCKETS + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+# Metrics is the registry of the bot's counters and histograms, kept on bot.metrics
+#  metrics are identified by name and keyword labels, e.g. metrics.inc('modmail_commands_total', command='reply')
+#  render returns everything in the Prometheus text exposition format.
+class Metrics:
+    def __init__(self):
+        self.counters: typing.Dict[Key, float] = dict()
+        self.histograms: typing.Dict[Key, Histogram] = dict()
+
+    # inc takes name str, optional value float and labels str
+    #  adds value to the counter
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0.0) + value
+
+    # observe takes name str, value float (seconds) and labels str
+    #  records value in the histogram
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(value)
+
+    # histogram takes name str and labels str
+    #  returns the histogram of exactly those labels or None when nothing was observed yet
+    def histogram(self, name: str, **labels: str) -> typing.Optional[Histogram]:
+        return self.histograms.get((name, tuple(sorted(labels.items()))))
+
+    # total takes name str
+    #  returns the counters of name summed over every label set
+    def total(self, name: str) -> float:
+        return sum(value for (key, _), value in self.counters.items() if key == name)
+
+    # render takes no arguments
+    #  returns every metric in the Prometheus text format
+    def render(self) -> str:
+        lines = list()
+        for name in sorted({key[0] for key in self.counters}):
+            lines.append(f"# TYPE {name} counter")
+            for (key, labels), value in sorted(self.counters.items(), key=lambda item: item[0]):
+                if key == name:
+                    lines.append(f"{name}{format_labels(labels)} {value:g}")
+
+        for name in sorted({key[0] for key in self.histograms}):
+            lines.append(f"# TYPE {name} histogram")
+            for (key, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                if key != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(BUCKETS + (float('inf'),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float('inf') else f"{bound:g}"
+                    lines.append(f"{name}_bucket{format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{format_labels(labels)} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    # instrument_http takes http discord.http.HTTPClient
+    #  times every REST call per route and response status
+    #  counts the 429s discord.py gives up on and the buckets a response exhausted, discord.py then holds the
+    #  bucket's lock until the reset, so it is still locked right after the call returns
+    def instrument_http(self, http) -> None:
+        request = http.request
+
+        async def timed_request(route, **kwargs):
+            start = time.perf_counter()
+            status = "ok"
+            try:
+                response = await request(route, **kwargs)
+            except discord.HTTPException as e:
+                status = str(e.status)
+                if e.status == 429:
+                    self.inc('modmail_rest_429_total', method=route.method, route=route.path)
+                raise
+            except Exception as e:
+                status = type(e).__name__
+                raise
+            finally:
+                self.observe('modmail_rest_seconds', time.perf_counter() - start, method=route.method,
+                             route=route.path, status=status)
+
+            lock = getattr(http, '_locks', {}).get(route.bucket)
+            if lock is not None and lock.locked():
+                self.inc('modmail_rest_bucket_exhausted_total', method=route.method, route=route.path)
+            return response
+
+        http.request = timed_request
+
+
+# format_labels takes labels tuple of (name, value)
+#  returns the labels in Prometheus syntax, empty when there are none
+def format_labels(labels: typing.Tuple[typing.Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f"{name}=\"{value}\"" for (name, _), value in zip(labels, escaped)) + "}"
+
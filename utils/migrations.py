@@ -0,0 +1,191 @@
+import asyncpg
+
+# Every schema change is appended here with the next version number, applied migrations are never edited.
+#  Version 1 describes the schema the bot always assumed, so it is a no-op on existing databases.
+MIGRATIONS = [
+    (1, "base schema", """
+        CREATE TABLE IF NOT EXISTS modmail.categories (
+            category_id bigint PRIMARY KEY,
+            category_name text NOT NULL,
+            active boolean NOT NULL DEFAULT true,
+            guild_id bigint NOT NULL,
+            emote_id text NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS modmail.permissions (
+            category_id bigint NOT NULL REFERENCES modmail.categories (category_id),
+            role_name text NOT NULL,
+            role_id bigint NOT NULL,
+            active boolean NOT NULL DEFAULT true,
+            PRIMARY KEY (category_id, role_id)
+        );
+
+        CREATE TABLE IF NOT EXISTS modmail.conversations (
+            conversation_id serial PRIMARY KEY,
+            user_id bigint NOT NULL,
+            channel_id bigint NOT NULL,
+            category_id bigint NOT NULL REFERENCES modmail.categories (category_id),
+            active boolean NOT NULL DEFAULT true,
+            creation_date timestamptz,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            closing_date timestamptz
+        );
+
+        CREATE TABLE IF NOT EXISTS modmail.messages (
+            message_id bigint NOT NULL,
+            message text,
+            author_id bigint NOT NULL,
+            conversation_id integer NOT NULL REFERENCES modmail.conversations (conversation_id),
+            other_side_message_id bigint,
+            made_by_mod boolean NOT NULL DEFAULT false,
+            deleted boolean NOT NULL DEFAULT false,
+            created_at timestamptz NOT NULL DEFAULT now()
+        );
+
+        CREATE TABLE IF NOT EXISTS modmail.all_messages_attachments (
+            message_id bigint NOT NULL,
+            message text,
+            author_id bigint NOT NULL,
+            conversation_id integer NOT NULL REFERENCES modmail.conversations (conversation_id),
+            made_by_mod boolean NOT NULL DEFAULT false,
+            internal boolean NOT NULL DEFAULT false,
+            deleted boolean NOT NULL DEFAULT false,
+            attachment bytea,
+            created_at timestamptz NOT NULL DEFAULT now()
+        );
+
+        CREATE TABLE IF NOT EXISTS modmail.muted (
+            user_id bigint PRIMARY KEY,
+            muted_by bigint NOT NULL,
+            muted_at timestamptz NOT NULL DEFAULT now(),
+            muted_until timestamptz,
+            active boolean NOT NULL DEFAULT true
+        );
+
+        CREATE TABLE IF NOT EXISTS modmail.notes (
+            note_id serial PRIMARY KEY,
+            conversation_id integer REFERENCES modmail.conversations (conversation_id),
+            user_id bigint NOT NULL,
+            made_by_id bigint NOT NULL,
+            note text NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS modmail.standardreplies (
+            reply_id serial PRIMARY KEY,
+            standard_reply text NOT NULL,
+            made_by_id bigint NOT NULL,
+            active boolean NOT NULL DEFAULT true,
+            description text
+        );
+    """),
+    (2, "message attachments", """
+        CREATE TABLE IF NOT EXISTS modmail.message_attachments (
+            message_id bigint NOT NULL,
+            position integer NOT NULL,
+            sha256 text NOT NULL,
+            filename text NOT NULL,
+            size bigint NOT NULL,
+            url text NOT NULL,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (message_id, position)
+        );
+    """),
+    (3, "hot path indexes", """
+        CREATE INDEX IF NOT EXISTS conversations_channel_active_idx
+            ON modmail.conversations (channel_id) WHERE active;
+        CREATE INDEX IF NOT EXISTS conversations_user_active_idx
+            ON modmail.conversations (user_id, active);
+        CREATE INDEX IF NOT EXISTS messages_message_conversation_idx
+            ON modmail.messages (message_id, conversation_id);
+        CREATE INDEX IF NOT EXISTS messages_conversation_created_idx
+            ON modmail.messages (conversation_id, created_at);
+        CREATE INDEX IF NOT EXISTS all_messages_attachments_message_idx
+            ON modmail.all_messages_attachments (message_id);
+        CREATE INDEX IF NOT EXISTS all_messages_attachments_conversation_idx
+            ON modmail.all_messages_attachments (conversation_id, message_id);
+        CREATE INDEX IF NOT EXISTS muted_user_active_idx
+            ON modmail.muted (user_id) WHERE active;
+        CREATE INDEX IF NOT EXISTS muted_until_active_idx
+            ON modmail.muted (muted_until) WHERE active;
+        CREATE INDEX IF NOT EXISTS permissions_category_active_idx
+            ON modmail.permissions (category_id) WHERE active;
+    """),
+    (4, "archive full-text search", """
+        ALTER TABLE modmail.all_messages_attachments
+            ADD COLUMN IF NOT EXISTS search tsvector
+            GENERATED ALWAYS AS (to_tsvector('simple', coalesce(message, ''))) STORED;
+        CREATE INDEX IF NOT EXISTS all_messages_attachments_search_idx
+            ON modmail.all_messages_attachments USING gin (search);
+    """),
+    (5, "conversation transcripts", """
+        ALTER TABLE modmail.conversations
+            ADD COLUMN IF NOT EXISTS transcript bytea;
+    """),
+    (6, "channel teardown queue", """
+        CREATE TABLE IF NOT EXISTS modmail.channel_teardown (
+            channel_id bigint PRIMARY KEY,
+            delete_after timestamptz NOT NULL,
+            reason text NOT NULL,
+            attempts integer NOT NULL DEFAULT 0,
+            created_at timestamptz NOT NULL DEFAULT now()
+        );
+        CREATE INDEX IF NOT EXISTS channel_teardown_delete_after_idx
+            ON modmail.channel_teardown (delete_after);
+    """),
+    (7, "idempotent archive inserts", """
+        CREATE TABLE IF NOT EXISTS modmail.messages_duplicates
+            (LIKE modmail.messages);
+        CREATE TABLE IF NOT EXISTS modmail.all_messages_attachments_duplicates
+            (LIKE modmail.all_messages_attachments);
+        WITH removed AS (
+            DELETE FROM modmail.messages duplicate
+                USING modmail.messages kept
+                WHERE duplicate.message_id = kept.message_id AND duplicate.ctid > kept.ctid
+                RETURNING duplicate.*
+        )
+        INSERT INTO modmail.messages_duplicates SELECT * FROM removed;
+        WITH removed AS (
+            DELETE FROM modmail.all_messages_attachments duplicate
+                USING modmail.all_messages_attachments kept
+                WHERE duplicate.message_id = kept.message_id AND duplicate.ctid > kept.ctid
+                RETURNING duplicate.*
+        )
+        INSERT INTO modmail.all_messages_attachments_duplicates SELECT * FROM removed;
+        CREATE UNIQUE INDEX IF NOT EXISTS messages_message_id_key
+            ON modmail.messages (message_id);
+        CREATE UNIQUE INDEX IF NOT EXISTS all_messages_attachments_message_id_key
+            ON modmail.all_messages_attachments (message_id);
+        CREATE INDEX IF NOT EXISTS messages_conversation_message_idx
+            ON modmail.messages (conversation_id, message_id);
+    """),
+]
+
+
+# run_migrations takes conn asyncpg.Connection
+#  creates the modmail schema and applies every migration newer than the recorded version
+#  all pending migrations run in one transaction under an advisory lock, so concurrent starts are safe
+#  returns the schema version
+async def run_migrations(conn: asyncpg.Connection) -> int:
+    async with conn.transaction():
+        await conn.execute("SELECT pg_advisory_xact_lock(hashtext('modmail.schema_version'))")
+        await conn.execute("CREATE SCHEMA IF NOT EXISTS modmail")
+        await conn.execute("CREATE TABLE IF NOT EXISTS modmail.schema_version ( \
+                                version integer PRIMARY KEY, \
+                                name text NOT NULL, \
+                                applied_at timestamptz NOT NULL DEFAULT now() \
+                            )")
+
+        version = await conn.fetchval("SELECT coalesce(max(version), 0) \
+                                       FROM modmail.schema_version")
+
+        for migration_version, name, sql in MIGRATIONS:
+            if migration_version <= version:
+                continue
+
+            print(f"Applying database migration {migration_version}: {name}")
+            await conn.execute(sql)
+            await conn.execute("INSERT INTO modmail.schema_version (version, name) \
+                                VALUES ($1, $2)", migration_version, name)
+            version = migration_version
+
+    return version
@@ -0,0 +1,37 @@
+import datetime
+import typing
+
+import pytz
+
+
+# MuteCache keeps every active mute in memory, user_id => muted_until (None for permanent mutes)
+#  loaded once at startup and kept current by the mute and unmute commands and the unmute task,
+#  so incoming DMs of muted users are dropped without a database round trip.
+class MuteCache:
+    def __init__(self):
+        self.mutes: typing.Dict[int, typing.Optional[datetime.datetime]] = dict()
+
+    # load takes db_conn Queries
+    #  replaces the cache with the active mutes from the database
+    async def load(self, db_conn) -> None:
+        rows = await db_conn.fetch("muted_active")
+        self.mutes = {row[0]: row[3] for row in rows}
+
+    # add takes user_id int and muted_until datetime.datetime or None
+    #  registers a new or changed mute
+    def add(self, user_id: int, muted_until: typing.Optional[datetime.datetime] = None) -> None:
+        self.mutes[user_id] = muted_until
+
+    # remove takes user_id int
+    #  forgets the mute of the user, if any
+    def remove(self, user_id: int) -> None:
+        self.mutes.pop(user_id, None)
+
+    # is_muted takes user_id int
+    #  returns True if the user is muted, a mute past its deadline counts as expired even before the task ran
+    def is_muted(self, user_id: int) -> bool:
+        if user_id not in self.mutes:
+            return False
+
+        muted_until = self.mutes[user_id]
+        return muted_until is None or muted_until > datetime.datetime.now(pytz.utc)
@@ -0,0 +1,663 @@
+import asyncio
+import contextlib
+import time
+import typing
+
+import asyncpg
+
+# Every statement the cogs and tasks run, invoked by name through Queries.
+#  Keeping one definition per statement keeps the text identical everywhere, the whitespace is
+#  normalised below so the formatting here never defeats the statement cache.
+QUERIES = {
+    # Conversations
+    'conversation_insert': "INSERT INTO modmail.conversations \
+                            (creation_date, user_id, active, channel_id, category_id) \
+                            VALUES (now(), $1, true, $2, $3) \
+                            RETURNING conversation_id",
+    'conversation_close': "UPDATE modmail.conversations \
+                           SET closing_date=now(), active=false \
+                           WHERE \
+                               channel_id=$1 AND \
+                               active=true \
+                           RETURNING conversation_id, user_id",
+    'conversation_user_by_channel': "SELECT user_id \
+                                     FROM modmail.conversations \
+                                     WHERE \
+                                         channel_id=$1",
+    'conversation_set_channel': "UPDATE modmail.conversations \
+                                 SET channel_id = $1 \
+                                 WHERE \
+                                     conversation_id=$2",
+    'conversation_by_channel': "SELECT user_id, conversation_id \
+                                FROM modmail.conversations \
+                                WHERE \
+                                    channel_id=$1",
+    'conversation_past_count': "SELECT count(*) \
+                                FROM modmail.conversations \
+                                WHERE \
+                                    user_id=$1 AND \
+                                    active=false",
+    'conversation_ids_by_channel': "SELECT conversation_id, user_id \
+                                    FROM modmail.conversations \
+                                    WHERE \
+                                        channel_id = $1",
+    'conversations_active': "SELECT conversation_id, user_id, channel_id \
+                             FROM modmail.conversations \
+                             WHERE \
+                                 active=true",
+
+    # Relayed messages and the archive
+    'message_last_by_user': "SELECT messages.message_id, messages.other_side_message_id, \
+                                    conversations.user_id, conversations.channel_id, \
+                                    messages.message, messages.conversation_id \
+                             FROM modmail.messages \
+                             INNER JOIN modmail.conversations \
+                             ON messages.conversation_id = conversations.conversation_id \
+                             WHERE \
+                                 conversations.user_id=$1 AND \
+                                 messages.made_by_mod = false AND \
+                                 messages.deleted = false \
+                             ORDER BY messages.message_id DESC \
+                             LIMIT 1",
+    'message_last_mod_by_author': "SELECT messages.message_id, messages.other_side_message_id, \
+                                          conversations.user_id \
+                                   FROM modmail.messages \
+                                   INNER JOIN modmail.conversations \
+                                   ON messages.conversation_id = conversations.conversation_id \
+                                   WHERE \
+                                       conversations.channel_id = $1 AND \
+                                       messages.made_by_mod = true AND \
+                                       deleted = false AND \
+                                       messages.author_id = $2 \
+                                   ORDER BY messages.message_id DESC \
+                                   LIMIT 1",
+    'message_set_text': "WITH relayed AS ( \
+                             UPDATE modmail.messages \
+                             SET message=$1 \
+                             WHERE \
+                                 message_id=$2) \
+                         UPDATE modmail.all_messages_attachments \
+                         SET message=$1 \
+                         WHERE \
+                             message_id=$2",
+    'message_last_mod': "SELECT messages.message_id, messages.other_side_message_id, \
+                                conversations.user_id \
+                         FROM modmail.messages \
+                         INNER JOIN modmail.conversations \
+                         ON messages.conversation_id = conversations.conversation_id \
+                         WHERE \
+                             conversations.channel_id = $1 AND \
+                             messages.made_by_mod = true AND \
+                             deleted = false \
+                         ORDER BY messages.message_id DESC \
+                         LIMIT 1",
+    'message_mod_by_id': "SELECT messages.message_id, messages.other_side_message_id, \
+                                 conversations.user_id \
+                          FROM modmail.messages \
+                          INNER JOIN modmail.conversations \
+                          ON messages.conversation_id = conversations.conversation_id \
+                          WHERE \
+                              messages.message_id = $1 AND \
+                              messages.made_by_mod = true AND \
+                              deleted = false \
+                          ORDER BY messages.message_id DESC \
+                          LIMIT 1",
+    'message_set_deleted': "WITH relayed AS ( \
+                                UPDATE modmail.messages \
+                                SET deleted=true \
+                                WHERE \
+                                    message_id=$1) \
+                            UPDATE modmail.all_messages_attachments \
+                            SET deleted=true \
+                            WHERE \
+                                message_id=$1",
+    'archive_by_conversation': "SELECT message, made_by_mod, author_id, message_id \
+                                FROM modmail.all_messages_attachments \
+                                WHERE \
+                                    conversation_id=$1 AND \
+                                    deleted=false \
+                                ORDER BY message_id",
+    'archive_search': "SELECT all_messages_attachments.message_id, all_messages_attachments.author_id, \
+                              all_messages_attachments.conversation_id, all_messages_attachments.made_by_mod, \
+                              conversations.user_id, categories.category_name, \
+                              ts_headline('simple', all_messages_attachments.message, query, \
+                                          'MaxWords=25, MinWords=8, StartSel=**, StopSel=**') \
+                       FROM modmail.all_messages_attachments \
+                       INNER JOIN modmail.conversations \
+                       ON all_messages_attachments.conversation_id = conversations.conversation_id \
+                       INNER JOIN modmail.categories \
+                       ON conversations.category_id = categories.category_id, \
+                       websearch_to_tsquery('simple', $1) query \
+                       WHERE \
+                           all_messages_attachments.search @@ query AND \
+                           all_messages_attachments.deleted = false AND \
+                           ($2::bigint IS NULL OR all_messages_attachments.author_id = $2) AND \
+                           ($3::bigint IS NULL OR conversations.category_id = $3) AND \
+                           all_messages_attachments.message_id >= $4 AND \
+                           all_messages_attachments.message_id < $5 \
+                       ORDER BY all_messages_attachments.message_id DESC \
+                       LIMIT $6",
+    'archive_export': "SELECT all_messages_attachments.message_id, all_messages_attachments.conversation_id, \
+                              conversations.user_id, conversations.category_id, categories.category_name, \
+                              all_messages_attachments.author_id, all_messages_attachments.made_by_mod, \
+                              all_messages_attachments.deleted, all_messages_attachments.message, \
+                              (SELECT coalesce(json_agg(json_build_object('filename', filename, 'size', size, \
+                                                                          'sha256', sha256, 'url', url) \
+                                                        ORDER BY position), '[]') \
+                               FROM modmail.message_attachments \
+                               WHERE \
+                                   message_attachments.message_id = all_messages_attachments.message_id) \
+                       FROM modmail.all_messages_attachments \
+                       INNER JOIN modmail.conversations \
+                       ON all_messages_attachments.conversation_id = conversations.conversation_id \
+                       INNER JOIN modmail.categories \
+                       ON conversations.category_id = categories.category_id \
+                       WHERE \
+                           ($1::bigint IS NULL OR conversations.user_id = $1) AND \
+                           ($2::bigint IS NULL OR conversations.category_id = $2) AND \
+                           all_messages_attachments.message_id >= $3 AND \
+                           all_messages_attachments.message_id < $4 \
+                       ORDER BY all_messages_attachments.conversation_id, all_messages_attachments.message_id",
+    'message_ids_by_conversation': "SELECT message_id \
+                                    FROM modmail.messages \
+                                    WHERE \
+                                        conversation_id=$1 AND \
+                                        deleted=false",
+    'archive_remap_ids': "UPDATE modmail.all_messages_attachments \
+                          SET message_id=ids.new_id \
+                          FROM unnest($1::bigint[], $2::bigint[]) AS ids(old_id, new_id) \
+                          WHERE \
+                              all_messages_attachments.message_id=ids.old_id AND \
+                              all_messages_attachments.conversation_id=$3",
+    'message_remap_ids': "UPDATE modmail.messages \
+                          SET message_id=ids.new_id \
+                          FROM unnest($1::bigint[], $2::bigint[]) AS ids(old_id, new_id) \
+                          WHERE \
+                              messages.message_id=ids.old_id AND \
+                              messages.conversation_id=$3",
+    'attachment_remap_ids': "UPDATE modmail.message_attachments \
+                             SET message_id=ids.new_id \
+                             FROM unnest($1::bigint[], $2::bigint[]) AS ids(old_id, new_id) \
+                             WHERE \
+                                 message_attachments.message_id=ids.old_id",
+    'logs_conversations': "SELECT conversations.conversation_id, conversations.created_at, \
+                                  conversations.closing_date, categories.category_name, \
+                                  categories.category_id \
+                           FROM modmail.conversations \
+                           INNER JOIN modmail.categories \
+                           ON conversations.category_id = categories.category_id \
+                           WHERE \
+                               conversations.active=false AND \
+                               conversations.user_id=$1 \
+                           ORDER BY created_at DESC",
+    'logs_messages': "SELECT message, author_id, deleted, made_by_mod \
+                      FROM modmail.messages \
+                      WHERE \
+                          conversation_id=$1 \
+                      ORDER BY message_id \
+                      LIMIT 51",
+    'transcript_messages': "SELECT message, author_id, deleted, made_by_mod, message_id \
+                            FROM modmail.messages \
+                            WHERE \
+                                conversation_id=$1 \
+                            ORDER BY message_id",
+    'conversation_set_transcript': "UPDATE modmail.conversations \
+                                    SET transcript=$1 \
+                                    WHERE \
+                                        conversation_id=$2",
+    'conversation_transcript': "SELECT transcript \
+                                FROM modmail.conversations \
+                                WHERE \
+                                    conversation_id=$1",
+    'message_other_side': "SELECT other_side_message_id, message \
+                           FROM modmail.messages \
+                           WHERE \
+                               message_id=$1 AND \
+                               conversation_id=$2",
+    'messages_by_other_side': "SELECT message_id, message, deleted \
+                               FROM modmail.messages \
+                               WHERE \
+                                   other_side_message_id=$1 AND \
+                                   conversation_id=$2 AND \
+                                   made_by_mod=false \
+                               ORDER BY message_id",
+    'message_insert': "INSERT INTO modmail.messages \
+                       (message_id, message, author_id, conversation_id, other_side_message_id, made_by_mod) \
+                       VALUES ($1, $2, $3, $4, $5, $6) \
+                       ON CONFLICT (message_id) DO NOTHING",
+    'archive_internal_insert': "INSERT INTO modmail.all_messages_attachments \
+                                (message_id, message, author_id, conversation_id, made_by_mod) \
+                                VALUES ($1, $2, $3, $4, $5) \
+                                ON CONFLICT (message_id) DO NOTHING",
+    'archive_relayed_insert': "INSERT INTO modmail.all_messages_attachments \
+                               (message_id, message, author_id, conversation_id, made_by_mod, internal) \
+                               VALUES ($1, $2, $3, $4, $5, true) \
+                               ON CONFLICT (message_id) DO NOTHING",
+    'attachment_insert': "INSERT INTO modmail.message_attachments \
+                          (message_id, position, sha256, filename, size, url) \
+                          VALUES ($1, $2, $3, $4, $5, $6) \
+                          ON CONFLICT DO NOTHING",
+
+    # Categories and permissions
+    'category_active': "SELECT active \
+                        FROM modmail.categories \
+                        WHERE \
+                            category_id=$1",
+    'category_set_active': "UPDATE modmail.categories \
+                            SET active=true \
+                            WHERE \
+                                category_id=$1",
+    'category_by_emote': "SELECT * \
+                          FROM modmail.categories \
+                          WHERE \
+                              emote_id=$1",
+    'category_insert': "INSERT INTO modmail.categories \
+                        (category_id, category_name, active, guild_id, emote_id) \
+                        VALUES($1, $2, TRUE, $3, $4)",
+    'category_by_name': "SELECT * \
+                         FROM modmail.categories \
+                         WHERE \
+                             category_name=$1",
+    'category_name_emote': "SELECT category_name, emote_id \
+                            FROM modmail.categories \
+                            WHERE \
+                                category_id=$1",
+    'category_set_emote': "UPDATE modmail.categories \
+                           SET emote_id=$1 \
+                           WHERE \
+                               category_id=$2",
+    'category_name_active': "SELECT category_name, active \
+                             FROM modmail.categories \
+                             WHERE \
+                                 category_id=$1",
+    'category_set_inactive': "UPDATE modmail.categories \
+                              SET active=FALSE \
+                              WHERE \
+                                  category_id=$1",
+    'categories_active': "SELECT category_id, guild_id, emote_id \
+                          FROM modmail.categories \
+                          WHERE \
+                              active=TRUE",
+    'categories_all': "SELECT category_id, active, guild_id, emote_id \
+                       FROM modmail.categories",
+    'category_by_id': "SELECT * \
+                       FROM modmail.categories \
+                       WHERE \
+                           category_id=$1",
+    'category_set_name': "UPDATE modmail.categories \
+                          SET category_name=$1 \
+                          WHERE \
+                              category_id=$2",
+    'category_active_by_id': "SELECT * \
+                              FROM modmail.categories \
+                              WHERE \
+                                  active=TRUE AND \
+                                  category_id=$1",
+    'permission_by_role': "SELECT * \
+                           FROM modmail.permissions \
+                           WHERE \
+                               category_id=$1 AND \
+                               role_id=$2",
+    'permission_set_active': "UPDATE modmail.permissions \
+                              SET active=TRUE \
+                              WHERE \
+                                  category_id=$1",
+    'permission_insert': "INSERT INTO modmail.permissions \
+                          (category_id, role_name, role_id, active) \
+                          VALUES($1, $2, $3, TRUE)",
+    'permissions_active': "SELECT * \
+                           FROM modmail.permissions \
+                           WHERE \
+                               active=TRUE",
+    'permissions_all': "SELECT * \
+                        FROM modmail.permissions",
+    'permissions_by_category': "SELECT * \
+                                FROM modmail.permissions \
+                                WHERE \
+                                    category_id=$1",
+    'permissions_active_by_category': "SELECT * \
+                                       FROM modmail.permissions \
+                                       WHERE \
+                                           active=TRUE AND \
+                                           category_id=$1",
+    'permission_set_inactive': "UPDATE modmail.permissions \
+                                SET active=FALSE \
+                                WHERE \
+                                    category_id=$1",
+    'categories_selector': "SELECT category_name, emote_id, category_id, guild_id \
+                            FROM modmail.categories \
+                            WHERE \
+                                active=true",
+    'access_category_roles': "SELECT permissions.category_id, permissions.role_id \
+                              FROM modmail.categories \
+                              JOIN modmail.permissions \
+                              ON permissions.category_id=categories.category_id \
+                              WHERE \
+                                  permissions.active=TRUE AND \
+                                  categories.active=TRUE",
+
+    # Mutes
+    'muted_by_user': "SELECT * \
+                      FROM modmail.muted \
+                      WHERE \
+                          user_id = $1",
+    'muted_update_until': "UPDATE modmail.muted \
+                           SET active = true, muted_by = $1, muted_until = $2 \
+                           WHERE \
+                               user_id = $3",
+    'muted_insert_until': "INSERT INTO modmail.muted \
+                           (user_id, muted_by, muted_until, active) \
+                           VALUES ($1, $2, $3, true)",
+    'muted_update': "UPDATE modmail.muted \
+                     SET active = true, muted_by = $1, muted_until = NULL \
+                     WHERE \
+                         user_id = $2",
+    'muted_insert': "INSERT INTO modmail.muted \
+                     (user_id, muted_by, active) \
+                     VALUES ($1, $2, true)",
+    'muted_set_inactive': "UPDATE modmail.muted \
+                           SET active = false \
+                           WHERE \
+                               user_id = $1",
+    'muted_active': "SELECT user_id, muted_by, muted_at, muted_until \
+                     FROM modmail.muted \
+                     WHERE \
+                         active = true",
+    'muted_all': "SELECT user_id, muted_by, muted_at, muted_until, active \
+                  FROM modmail.muted",
+    'muted_status': "SELECT active, muted_by, muted_at, muted_until \
+                     FROM modmail.muted \
+                     WHERE \
+                         user_id = $1",
+    'muted_active_until': "SELECT user_id, muted_until \
+                           FROM modmail.muted \
+                           WHERE \
+                               active = true AND \
+                               muted_until IS NOT NULL",
+    'muted_expire_due': "UPDATE modmail.muted \
+                         SET active = false \
+                         WHERE \
+                             active = true AND \
+                             muted_until <= $1 \
+                         RETURNING user_id",
+
+    # Channel teardown
+    'teardown_enqueue': "INSERT INTO modmail.channel_teardown \
+                         (channel_id, delete_after, reason) \
+                         VALUES ($1, now() + make_interval(secs => $2), $3) \
+                         ON CONFLICT (channel_id) DO NOTHING",
+    'teardown_due': "SELECT channel_id, reason, attempts \
+                     FROM modmail.channel_teardown \
+                     WHERE \
+                         delete_after <= now() \
+                     ORDER BY delete_after \
+                     LIMIT $1",
+    'teardown_done': "DELETE FROM modmail.channel_teardown \
+                      WHERE \
+                          channel_id = $1",
+    'teardown_retry': "UPDATE modmail.channel_teardown \
+                       SET attempts = attempts + 1, delete_after = now() + make_interval(secs => $2) \
+                       WHERE \
+                           channel_id = $1",
+    'teardown_orphans': "SELECT channels.channel_id \
+                         FROM unnest($1::bigint[]) AS channels (channel_id) \
+                         WHERE \
+                             EXISTS (SELECT 1 \
+                                     FROM modmail.conversations \
+                                     WHERE \
+                                         conversations.channel_id = channels.channel_id AND \
+                                         active = false) AND \
+                             NOT EXISTS (SELECT 1 \
+                                         FROM modmail.conversations \
+                                         WHERE \
+                                             conversations.channel_id = channels.channel_id AND \
+                                             active = true) AND \
+                             NOT EXISTS (SELECT 1 \
+                                         FROM modmail.channel_teardown \
+                                         WHERE \
+                                             channel_teardown.channel_id = channels.channel_id)",
+
+    # Notes
+    'note_insert': "INSERT INTO modmail.notes \
+                    (conversation_id, user_id, made_by_id, note) \
+                    VALUES ($1, $2, $3, $4)",
+    'notes_by_user': "SELECT note_id, user_id, made_by_id, note \
+                      FROM modmail.notes \
+                      WHERE \
+                          user_id = $1 \
+                      ORDER BY note_id",
+    'note_author': "SELECT made_by_id \
+                    FROM modmail.notes \
+                    WHERE \
+                        note_id = $1",
+    'note_set_text': "UPDATE modmail.notes \
+                      SET note = $1 \
+                      WHERE \
+                          note_id = $2",
+    'note_by_id': "SELECT note_id, user_id, made_by_id, note \
+                   FROM modmail.notes \
+                   WHERE \
+                       note_id = $1",
+    'note_delete': "DELETE \
+                    FROM modmail.notes \
+                    WHERE \
+                        note_id = $1",
+
+    # Standard replies
+    'standard_reply_insert': "INSERT INTO modmail.standardreplies \
+                              (standard_reply, made_by_id, active, description) \
+                              VALUES ($1, $2, true, $3) \
+                              RETURNING reply_id",
+    'standard_reply_set_inactive': "UPDATE modmail.standardreplies \
+                                    SET active=false \
+                                    WHERE \
+                                        reply_id = $1",
+    'standard_reply_set_active': "UPDATE modmail.standardreplies \
+                                  SET active=true \
+                                  WHERE \
+                                      reply_id = $1",
+    'standard_replies_all': "SELECT standardreplies.standard_reply, standardreplies.active, \
+                                    standardreplies.description, standardreplies.made_by_id, \
+                                    standardreplies.reply_id \
+                             FROM modmail.standardreplies",
+    'standard_reply_update': "UPDATE modmail.standardreplies \
+                              SET standard_reply=$1, description=$2 \
+                              WHERE \
+                                  reply_id=$3",
+}
+QUERIES = {name: " ".join(sql.split()) for name, sql in QUERIES.items()}
+
+
+# QueryStats keeps the timing counters of one statement
+class QueryStats:
+    __slots__ = ('calls', 'total', 'max')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    # add takes elapsed float (seconds)
+    #  records one execution
+    def add(self, elapsed: float) -> None:
+        self.calls += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+
+
+# ModmailConnection is the connection class of the pool
+#  it holds the statements prepared by init_connection, keyed by name
+class ModmailConnection(asyncpg.Connection):
+    statements: typing.Dict[str, asyncpg.prepared_stmt.PreparedStatement]
+
+    # prepare_statements takes no arguments
+    #  prepares every statement of QUERIES on this connection
+    #  a statement that doesn't match the schema is reported and left out, so it only fails when it is used
+    async def prepare_statements(self) -> None:
+        self.statements = dict()
+        for name, sql in QUERIES.items():
+            try:
+                self.statements[name] = await self.prepare(sql)
+            except asyncpg.PostgresError as e:
+                print(f"Failed to prepare statement {name}", e)
+
+
+# init_connection is the pool's init hook, runs once for every new connection
+async def init_connection(conn: ModmailConnection) -> None:
+    await conn.prepare_statements()
+
+
+# QueryConnection runs named statements on one acquired connection, see Queries.acquire
+class QueryConnection:
+    def __init__(self, queries: 'Queries', conn):
+        self.queries = queries
+        self.conn = conn
+
+    # statement takes name str
+    #  returns the prepared statement, preparing it when the connection doesn't have it yet
+    async def statement(self, name: str) -> asyncpg.prepared_stmt.PreparedStatement:
+        statements = getattr(self.conn, 'statements', None)
+        if statements is not None and name in statements:
+            return statements[name]
+        return await self.conn.prepare(QUERIES[name])
+
+    # run takes method str, name str and the statement arguments
+    #  runs the statement and records its timing
+    async def run(self, method: str, name: str, *args):
+        stmt = await self.statement(name)
+        start = time.perf_counter()
+        try:
+            if method == 'execute':
+                await stmt.fetch(*args)
+                return stmt.get_statusmsg()
+            return await getattr(stmt, method)(*args)
+        finally:
+            self.queries.stats.setdefault(name, QueryStats()).add(time.perf_counter() - start)
+
+    async def fetch(self, name: str, *args) -> typing.List[asyncpg.Record]:
+        return await self.run('fetch', name, *args)
+
+    async def fetchrow(self, name: str, *args) -> typing.Optional[asyncpg.Record]:
+        return await self.run('fetchrow', name, *args)
+
+    async def fetchval(self, name: str, *args):
+        return await self.run('fetchval', name, *args)
+
+    async def execute(self, name: str, *args) -> str:
+        return await self.run('execute', name, *args)
+
+    # cursor takes name str, the statement arguments and prefetch int
+    #  returns a server-side cursor over the statement to iterate with async for, only valid inside transaction()
+    #  rows are fetched prefetch at a time, so memory stays flat however many rows there are
+    async def cursor(self, name: str, *args, prefetch: int = 500) -> asyncpg.cursor.CursorFactory:
+        stmt = await self.statement(name)
+        return stmt.cursor(*args, prefetch=prefetch)
+
+    # executemany takes name str and args list of tuples
+    #  runs the statement once per tuple
+    async def executemany(self, name: str, args: typing.Iterable[tuple]) -> None:
+        start = time.perf_counter()
+        try:
+            await self.conn.executemany(QUERIES[name], args)
+        finally:
+            self.queries.stats.setdefault(name, QueryStats()).add(time.perf_counter() - start)
+
+
+# Queries is the database handle the bot hands to cogs and tasks as bot.db_conn
+#  every call takes the name of a statement in QUERIES instead of SQL text
+#  the raw asyncpg pool stays available as .pool for ad-hoc owner queries
+#  create_pool builds a replacement pool when the health probe finds the current one broken
+class Queries:
+    def __init__(self, pool: asyncpg.pool.Pool,
+                 create_pool: typing.Optional[typing.Callable[[], typing.Awaitable[asyncpg.pool.Pool]]] = None,
+                 max_size: int = 10, acquire_timeout: typing.Optional[float] = None):
+        self.pool = pool
+        self.create_pool = create_pool
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.stats: typing.Dict[str, QueryStats] = dict()
+        self.waits = QueryStats()
+        self.in_use = 0
+        self.waiting = 0
+        self.reconnects = 0
+
+    # acquire takes no arguments
+    #  yields a QueryConnection on one pooled connection
+    #  the time spent waiting for a free connection is recorded in waits
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> typing.AsyncIterator[QueryConnection]:
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            conn = await self.pool.acquire(timeout=self.acquire_timeout)
+        finally:
+            self.waiting -= 1
+            self.waits.add(time.perf_counter() - start)
+
+        pool = self.pool
+        self.in_use += 1
+        try:
+            yield QueryConnection(self, conn)
+        finally:
+            self.in_use -= 1
+            await pool.release(conn)
+
+    # transaction takes no arguments
+    #  yields a QueryConnection whose statements all run in one transaction
+    @contextlib.asynccontextmanager
+    async def transaction(self) -> typing.AsyncIterator[QueryConnection]:
+        async with self.acquire() as query_conn:
+            async with query_conn.conn.transaction():
+                yield query_conn
+
+    # ping takes timeout float (seconds)
+    #  returns True when a pooled connection answers a trivial query in time
+    async def ping(self, timeout: float) -> bool:
+        try:
+            async with self.pool.acquire(timeout=timeout) as conn:
+                await conn.fetchval("SELECT 1", timeout=timeout)
+        except Exception as e:
+            print("Database health check failed", e)
+            return False
+        return True
+
+    # reconnect takes no arguments
+    #  swaps in a freshly created pool and closes the old one
+    #  returns True when the new pool could be created
+    async def reconnect(self) -> bool:
+        if self.create_pool is None:
+            return False
+
+        try:
+            pool = await self.create_pool()
+        except Exception as e:
+            print("Failed to recreate the database pool", e)
+            return False
+
+        old_pool, self.pool = self.pool, pool
+        self.reconnects += 1
+        try:
+            await asyncio.wait_for(old_pool.close(), timeout=10)
+        except Exception:
+            old_pool.terminate()
+        return True
+
+    async def fetch(self, name: str, *args) -> typing.List[asyncpg.Record]:
+        async with self.acquire() as conn:
+            return await conn.fetch(name, *args)
+
+    async def fetchrow(self, name: str, *args) -> typing.Optional[asyncpg.Record]:
+        async with self.acquire() as conn:
+            return await conn.fetchrow(name, *args)
+
+    async def fetchval(self, name: str, *args):
+        async with self.acquire() as conn:
+            return await conn.fetchval(name, *args)
+
+    async def execute(self, name: str, *args) -> str:
+        async with self.acquire() as conn:
+            return await conn.execute(name, *args)
+
+    async def executemany(self, name: str, args: typing.Iterable[tuple]) -> None:
+        async with self.acquire() as conn:
+            await conn.executemany(name, args)
@@ -0,0 +1,39 @@
+import time
+import typing
+
+
+# RateLimiter is a token bucket per user
+#  every user can send burst messages at once, after that rate messages per second.
+#  Buckets that have refilled completely are dropped once more than max_users are tracked.
+class RateLimiter:
+    def __init__(self, rate: float = 1.0, burst: int = 5, max_users: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_users = max_users
+        self.buckets: typing.Dict[int, typing.Tuple[float, float]] = dict()
+
+    # tokens takes user_id int and now float (time.monotonic())
+    #  returns the tokens the user has left right now
+    def tokens(self, user_id: int, now: float) -> float:
+        tokens, updated = self.buckets.get(user_id, (self.burst, now))
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+    # take takes user_id int
+    #  takes a token when one is available
+    #  returns 0 when a token was taken, otherwise the seconds until the next one
+    def take(self, user_id: int) -> float:
+        now = time.monotonic()
+        tokens = self.tokens(user_id, now)
+        if tokens < 1:
+            return (1 - tokens) / self.rate
+
+        self.buckets[user_id] = (tokens - 1, now)
+        if len(self.buckets) > self.max_users:
+            self.prune(now)
+        return 0.0
+
+    # prune takes now float (time.monotonic())
+    #  forgets the users whose bucket is full again
+    def prune(self, now: float) -> None:
+        self.buckets = {user_id: bucket for user_id, bucket in self.buckets.items()
+                        if self.tokens(user_id, now) < self.burst}
@@ -1,4 +1,5 @@
 from utils.common_embed import *
+from utils.message_map import MessageLink
 from discord.ext import commands
 import asyncpg
 
@@ -28,6 +29,8 @@ async def reply(bot: commands.Bot, ctx: commands.Context, db_conn: asyncpg.pool.
                                 [f"[{attachment.filename}]({attachment.url})" for attachment in attachments]))
 
     usr_msg = await user.send(embed=usr_embed)
+    bot.metrics.observe('modmail_relay_seconds', (datetime.datetime.utcnow() - ctx.message.created_at).total_seconds(),
+                        path="reply")
 
     thread_embed = common_embed("", message, color=green)
     thread_embed.set_author(name=ctx.author, icon_url=ctx.author.avatar_url)
@@ -38,14 +41,10 @@ async def reply(bot: commands.Bot, ctx: commands.Context, db_conn: asyncpg.pool.
                                    [f"[{attachment.filename}]({attachment.url})" for attachment in attachments]))
     mod_msg = await ctx.send(embed=thread_embed)
 
-    await db_conn.execute("INSERT INTO modmail.messages \
-                           (message_id, message, author_id, conversation_id, other_side_message_id, made_by_mod) \
-                           VALUES ($1, $2, $3, $4, $5, true)",
-                          mod_msg.id, message, ctx.author.id, conv_id, usr_msg.id)
-
-    await db_conn.execute("INSERT INTO modmail.all_messages_attachments \
-                           (message_id, message, author_id, conversation_id, made_by_mod, internal) \
-                           VALUES ($1, $2, $3, $4, true, true)",
-                          mod_msg.id, message, ctx.author.id, conv_id)
+    bot.archiver.add('message_insert', mod_msg.id, message, ctx.author.id, conv_id, usr_msg.id, True)
+    bot.archiver.add('archive_relayed_insert', mod_msg.id, message, ctx.author.id, conv_id, True)
+    bot.attachments.store_later(bot.archiver, mod_msg.id, attachments)
+    bot.messages.add(MessageLink(mod_msg.id, usr_msg.id, conv_id, ctx.channel.id, usr_msg.channel.id, user_id,
+                                 ctx.author.id, True, message, thread_embed=thread_embed, dm_embed=usr_embed))
 
     await ctx.message.delete()
@@ -0,0 +1,86 @@
+import re
+import typing
+
+
+# StandardReply is one row of modmail.standardreplies
+class StandardReply:
+    __slots__ = ('reply_id', 'text', 'active', 'description', 'made_by_id')
+
+    def __init__(self, reply_id: int, text: str, active: bool, description: str, made_by_id: int):
+        self.reply_id = reply_id
+        self.text = text
+        self.active = active
+        self.description = description
+        self.made_by_id = made_by_id
+
+
+# trigrams takes text str
+#  splits the text into lowercase words, padded like pg_trgm does so word starts weigh more
+#  returns the set of trigrams
+def trigrams(text: str) -> typing.Set[str]:
+    result = set()
+    for word in re.findall(r"\w+", text.lower()):
+        word = f"  {word} "
+        result.update(word[i:i + 3] for i in range(len(word) - 2))
+    return result
+
+
+# StandardReplyStore keeps every standard reply in memory with a trigram index over reply and description
+#  loaded at startup, invalidated by the commands that change replies and reloaded on the next use.
+class StandardReplyStore:
+    def __init__(self):
+        self.replies: typing.Optional[typing.Dict[int, StandardReply]] = None
+        self.index: typing.Dict[str, typing.Set[int]] = dict()
+
+    # load takes db_conn Queries
+    #  replaces the store with the standard replies from the database and rebuilds the index
+    async def load(self, db_conn) -> None:
+        rows = await db_conn.fetch("standard_replies_all")
+
+        replies, index = dict(), dict()
+        for row in rows:
+            replies[row[4]] = StandardReply(row[4], row[0], row[1], row[2], row[3])
+            for trigram in trigrams(f"{row[0]} {row[2] or ''}"):
+                index.setdefault(trigram, set()).add(row[4])
+
+        self.replies, self.index = replies, index
+
+    # invalidate takes no arguments
+    #  drops the store, the next lookup reloads it
+    def invalidate(self) -> None:
+        self.replies = None
+
+    # all takes db_conn Queries and active_only bool
+    #  returns the standard replies ordered by id
+    async def all(self, db_conn, active_only: bool = True) -> typing.List[StandardReply]:
+        if self.replies is None:
+            await self.load(db_conn)
+        return [reply for _, reply in sorted(self.replies.items()) if reply.active or not active_only]
+
+    # get takes db_conn Queries and reply_id int
+    #  returns the standard reply or None if it doesn't exist
+    async def get(self, db_conn, reply_id: int) -> typing.Optional[StandardReply]:
+        if self.replies is None:
+            await self.load(db_conn)
+        return self.replies.get(reply_id)
+
+    # search takes db_conn Queries, query str and limit int
+    #  ranks the active replies by the share of the query's trigrams they contain
+    #  returns at most limit replies that contain at least a third of them, best first
+    async def search(self, db_conn, query: str, limit: int = 10) -> typing.List[StandardReply]:
+        if self.replies is None:
+            await self.load(db_conn)
+
+        wanted = trigrams(query)
+        if not wanted:
+            return list()
+
+        hits = dict()
+        for trigram in wanted:
+            for reply_id in self.index.get(trigram, ()):
+                hits[reply_id] = hits.get(reply_id, 0) + 1
+
+        ranked = sorted(((count / len(wanted), reply_id) for reply_id, count in hits.items()
+                         if self.replies[reply_id].active and count / len(wanted) >= 1 / 3),
+                        key=lambda hit: (-hit[0], hit[1]))
+        return [self.replies[reply_id] for _, reply_id in ranked[:limit]]
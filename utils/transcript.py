@@ -0,0 +1,21 @@
+import json
+import typing
+import zlib
+
+
+# A transcript is the list of relayed messages of a closed conversation, stored compressed in
+#  modmail.conversations.transcript. Every entry is [message, author_id, deleted, made_by_mod, message_id],
+#  the same column order as the logs_messages statement, so both render the same way.
+
+
+# encode takes rows iterable of transcript_messages records
+#  returns the zlib compressed JSON transcript
+def encode(rows: typing.Iterable) -> bytes:
+    entries = [[row[0], row[1], row[2], row[3], row[4]] for row in rows]
+    return zlib.compress(json.dumps(entries, separators=(',', ':')).encode('utf-8'), 9)
+
+
+# decode takes blob bytes
+#  returns the transcript entries
+def decode(blob: bytes) -> typing.List[list]:
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
@@ -0,0 +1,76 @@
+import asyncio
+import datetime
+import heapq
+import typing
+
+import pytz
+
+
+# UnmuteScheduler keeps the deadline of every timed mute in a heap
+#  seeded from modmail.muted at startup and kept current by the mute and unmute commands.
+#  Entries replaced by a later schedule or cancel are skipped lazily when they reach the top of the heap.
+class UnmuteScheduler:
+    def __init__(self):
+        self.heap: typing.List[typing.Tuple[float, int]] = list()
+        self.deadlines: typing.Dict[int, float] = dict()
+        self.changed = asyncio.Event()
+
+    # load takes db_conn Queries
+    #  replaces the schedule with the timed mutes that are still active, overdue ones included
+    async def load(self, db_conn) -> None:
+        rows = await db_conn.fetch("muted_active_until")
+
+        self.deadlines = {row[0]: row[1].timestamp() for row in rows}
+        self.heap = [(deadline, user_id) for user_id, deadline in self.deadlines.items()]
+        heapq.heapify(self.heap)
+        self.changed.set()
+
+    # schedule takes user_id int and muted_until datetime.datetime
+    #  (re)schedules the unmute of the user
+    def schedule(self, user_id: int, muted_until: datetime.datetime) -> None:
+        deadline = muted_until.timestamp()
+        self.deadlines[user_id] = deadline
+        heapq.heappush(self.heap, (deadline, user_id))
+        self.changed.set()
+
+    # cancel takes user_id int
+    #  forgets the scheduled unmute of the user, if any
+    def cancel(self, user_id: int) -> None:
+        self.deadlines.pop(user_id, None)
+
+    # next_deadline takes no arguments
+    #  returns the earliest pending deadline as a timestamp or None when nothing is scheduled
+    def next_deadline(self) -> typing.Optional[float]:
+        while self.heap and self.deadlines.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+    # wait takes no arguments
+    #  sleeps until the earliest deadline has passed, waking up early when a sooner one is scheduled
+    async def wait(self) -> None:
+        while True:
+            self.changed.clear()
+            deadline = self.next_deadline()
+            timeout = None if deadline is None else deadline - datetime.datetime.now(pytz.utc).timestamp()
+            if timeout is not None and timeout <= 0:
+                return
+
+            try:
+                await asyncio.wait_for(self.changed.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return
+
+    # expire takes db_conn Queries
+    #  unmutes every user whose deadline has passed with one statement
+    #  returns the user ids that were unmuted
+    async def expire(self, db_conn) -> typing.List[int]:
+        now = datetime.datetime.now(pytz.utc)
+        rows = await db_conn.fetch("muted_expire_due", now)
+
+        now = now.timestamp()
+        while self.heap and self.heap[0][0] <= now:
+            deadline, user_id = heapq.heappop(self.heap)
+            if self.deadlines.get(user_id) == deadline:
+                del self.deadlines[user_id]
+
+        return [row[0] for row in rows]
@@ -0,0 +1,80 @@
+import asyncio
+import collections
+import time
+import typing
+
+import discord
+
+
+# UserResolver turns user ids into discord.User objects without hammering the REST api
+#  the gateway cache (bot.get_user) is checked first, then a TTL/LRU cache of earlier fetches,
+#  the remaining ids are fetched concurrently with at most max_concurrent requests in flight.
+#  Ids that don't exist are cached as None for the TTL as well.
+class UserResolver:
+    def __init__(self, bot: discord.Client, ttl: float = 600.0, max_size: int = 5000, max_concurrent: int = 5):
+        self.bot = bot
+        self.ttl = ttl
+        self.max_size = max_size
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.cache: typing.OrderedDict[int, typing.Tuple[float, typing.Optional[discord.User]]] = \
+            collections.OrderedDict()
+
+    # cached takes user_id int
+    #  returns (found bool, user) from the gateway cache or a fresh enough earlier fetch
+    #  user is None when the id didn't exist, found is False when the id has to be fetched
+    def cached(self, user_id: int) -> typing.Tuple[bool, typing.Optional[discord.User]]:
+        user = self.bot.get_user(user_id)
+        if user is not None:
+            return True, user
+
+        entry = self.cache.get(user_id)
+        if entry is None:
+            return False, None
+        if entry[0] < time.monotonic():
+            del self.cache[user_id]
+            return False, None
+
+        self.cache.move_to_end(user_id)
+        return True, entry[1]
+
+    # fetch takes user_id int
+    #  fetches the user over REST and remembers it, users that don't exist are remembered as None
+    #  returns discord.User or None if the user doesn't exist, raises discord.HTTPException on other failures
+    async def fetch(self, user_id: int) -> typing.Optional[discord.User]:
+        async with self.semaphore:
+            try:
+                user = await self.bot.fetch_user(user_id)
+            except discord.NotFound:
+                user = None
+
+        self.cache[user_id] = (time.monotonic() + self.ttl, user)
+        self.cache.move_to_end(user_id)
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+        return user
+
+    # get takes user_id int
+    #  returns discord.User or None if the user doesn't exist
+    async def get(self, user_id: int) -> typing.Optional[discord.User]:
+        found, user = self.cached(user_id)
+        return user if found else await self.fetch(user_id)
+
+    # get_many takes user_ids iterable of int
+    #  resolves every distinct id once, a failed fetch only affects its own id
+    #  returns dict of user_id => discord.User or None if the user doesn't exist or couldn't be fetched
+    async def get_many(self, user_ids: typing.Iterable[int]) -> typing.Dict[int, typing.Optional[discord.User]]:
+        users = dict()
+        missing = list()
+        for user_id in set(user_ids):
+            found, users[user_id] = self.cached(user_id)
+            if not found:
+                missing.append(user_id)
+
+        results = await asyncio.gather(*[self.fetch(user_id) for user_id in missing], return_exceptions=True)
+        for user_id, result in zip(missing, results):
+            if isinstance(result, BaseException):
+                print(f"Failed to fetch user {user_id}", result)
+                result = None
+            users[user_id] = result
+
+        return users